@@ -0,0 +1,290 @@
+"""Pruebas de rendimiento del lanzador con configuraciones sintéticas.
+
+Uso: python benchmarks/run_benchmarks.py [--sizes 10,1000,10000] [--output resultados.json]
+                                         [--baseline benchmarks/baseline.json] [--save-baseline]
+                                         [--baseline-runs 3] [--allow-missing-baseline] [--no-gui]
+
+Mide la carga de la configuración (JSON y caché compilada), la decodificación de iconos (en
+frío y con la caché de miniaturas), el dibujo de la cuadrícula, el guardado y la modificación
+de un solo botón. Las medidas sin Tk (análisis, caché compilada, miniaturas y serialización)
+se toman siempre; las de la interfaz necesitan pantalla y se omiten con --no-gui. En Linux sin
+$DISPLAY arranca un Xvfb propio.
+
+La línea base se graba en cada máquina con --save-baseline (benchmarks/baseline.json no se
+versiona: las cifras de otra máquina no sirven) y guarda el peor de --baseline-runs pases; de
+cada medida se toma el mejor de --repeat tiempos, el menos afectado por otras cargas. Termina
+con código 1 si alguna medida empeora más de la tolerancia, si se midió algo que la línea
+base no tiene (p. ej. la base se grabó con --no-gui) o si no hay línea base (salvo con
+--save-baseline o --allow-missing-baseline).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_config
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def start_virtual_display():
+    """Arranca Xvfb si hace falta. Devuelve el proceso (o None si ya hay pantalla)."""
+    if os.environ.get("DISPLAY") or not sys.platform.startswith("linux"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise SystemExit("No hay $DISPLAY ni Xvfb instalado: no se pueden medir las partes de Tk.")
+    for number in range(99, 199):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        proc = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return proc
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+        proc.kill()
+    raise SystemExit("No se pudo arrancar Xvfb.")
+
+
+def isolate_user_dirs(workdir):
+    """Dirige las cachés y los datos por usuario del lanzador a `workdir`.
+
+    Hay que llamarla antes de crear el AppLauncher: la caché de miniaturas y el historial de uso
+    toman su carpeta predeterminada al construirse.
+    """
+    for var, sub in (("XDG_CACHE_HOME", "cache"), ("LOCALAPPDATA", "cache"),
+                     ("XDG_DATA_HOME", "data"), ("APPDATA", "data")):
+        os.environ[var] = os.path.join(workdir, sub)
+
+
+def timed(fn, repeat):
+    """Mejor tiempo en milisegundos de `repeat` ejecuciones de `fn` (el menos afectado por otras cargas)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def _unique_icons(buttons):
+    return sorted({b["icon_path"] for b in buttons if b["icon_path"]})
+
+
+def bench_core(size, config_path, buttons, workdir, repeat):
+    """Medidas que no necesitan pantalla: se pueden tomar en cualquier máquina."""
+    from config_cache import cache_path_for, load_config
+    from icon_cache import ThumbnailCache, load_thumbnail
+    from program_launcher2 import DEFAULT_ICON_SIZE
+
+    results = {}
+    icons = [p for p in _unique_icons(buttons) if os.path.exists(p)]
+    cache = ThumbnailCache(os.path.join(workdir, f"core_thumbs_{size}"))
+    icon_size = (DEFAULT_ICON_SIZE, DEFAULT_ICON_SIZE)
+
+    def thumbnails():
+        for icon_path in icons:
+            load_thumbnail(icon_path, icon_size, cache)
+
+    results["thumbnail_cold"] = timed(lambda: (cache.clear(), thumbnails()), repeat)
+    results["thumbnail_warm"] = timed(thumbnails, repeat)
+
+    def parse(use_cache):
+        if not use_cache:
+            try:
+                os.remove(cache_path_for(config_path))
+            except OSError:
+                pass
+        return load_config(config_path)
+
+    results["parse_json"] = timed(lambda: parse(False), repeat)
+    results["parse_cached"] = timed(lambda: parse(True), repeat)
+    config = load_config(config_path)
+    results["serialize"] = timed(lambda: json.dumps(config.to_json(), indent=2).encode("utf-8"), repeat)
+    return results
+
+
+def bench_size(size, config_path, buttons, workdir, repeat):
+    import tkinter as tk
+    import program_launcher2
+    from config_cache import cache_path_for
+    from icon_cache import ThumbnailCache
+
+    results = {}
+
+    root = tk.Tk()
+    try:
+        app = program_launcher2.AppLauncher(root)
+        app.icon_cache = ThumbnailCache(os.path.join(workdir, f"thumbs_{size}"))
+        icons = _unique_icons(buttons)
+
+        def decode_all():
+            for icon_path in icons:
+                app._load_and_prepare_icon(icon_path)
+
+        results["icon_decode_cold"] = timed(lambda: (app.icon_cache.clear(), decode_all()), repeat)
+        results["icon_decode_warm"] = timed(decode_all, repeat)
+
+        def load(use_cache):
+            if not use_cache:
+                try:
+                    os.remove(cache_path_for(config_path))
+                except OSError:
+                    pass
+            app._load_config_from_file(config_path)
+            app._cancel_icon_loads(app.buttons_data)  # Las medidas de carga no incluyen los iconos
+
+        results["load_json"] = timed(lambda: load(False), repeat)
+        results["load_cached"] = timed(lambda: load(True), repeat)
+        app.current_config_file = config_path
+
+        if len(app.buttons_data) > app.virtual_view_threshold:
+            app.virtual_view_var.set(True)
+
+        def build_display():
+            app._create_buttons_frame()
+            app.update_buttons_display()
+            root.update_idletasks()
+
+        results["display_build"] = timed(build_display, repeat)
+        results["display_noop"] = timed(lambda: (app.update_buttons_display(), root.update_idletasks()), repeat)
+
+        counter = iter(range(10 ** 9))
+        target = app.buttons_data[len(app.buttons_data) // 2]
+
+        def modify_single():
+            app.buttons_data.update(target, name=f"Modificado {next(counter)}")
+            app.update_buttons_display()
+            root.update_idletasks()
+
+        # Con el guardado automático activo incluye la línea del diario; la compactación diferida no
+        results["modify_single"] = timed(modify_single, repeat)
+        app._cancel_compaction()
+        results["prepare_save"] = timed(app._prepare_data_for_saving, repeat)
+        results["save_config"] = timed(app.save_config, repeat)
+
+        def icons_end_to_end():
+            # Carga completa con la caché de miniaturas caliente, hasta que todos los iconos están puestos
+            load(True)
+            build_display()
+            for button_data in app.buttons_data:
+                app._request_icon(button_data)
+            while app.icon_loader.pending():
+                root.update()
+
+        results["icons_ready_warm"] = timed(icons_end_to_end, max(1, repeat // 2))
+        app.icon_loader.shutdown()
+        if app.config_watcher is not None:
+            app.config_watcher.stop()
+    finally:
+        root.destroy()
+    return results
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    """Devuelve las regresiones (medida, base, actual) que superan la tolerancia y las medidas
+    que no están en la línea base."""
+    regressions, unknown = [], []
+    for key, value in sorted(results.items()):
+        base = baseline.get(key)
+        if base is None:
+            unknown.append(key)
+            continue
+        if value > base * (1 + tolerance) and value - base > floor_ms:
+            regressions.append((key, base, value))
+    return regressions, unknown
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del lanzador")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Número de botones de cada configuración")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por medida (se usa la mejor)")
+    parser.add_argument("--shared", type=float, default=0.5, help="Parte de botones con icono compartido")
+    parser.add_argument("--missing", type=float, default=0.1, help="Parte de botones con icono inexistente")
+    parser.add_argument("--gif", type=float, default=0.05, help="Parte de botones con GIF animado")
+    parser.add_argument("--ico", type=float, default=0.05, help="Parte de botones con ICO grande")
+    parser.add_argument("--output", help="Archivo JSON donde escribir los resultados")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Resultados de referencia")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar estos resultados como referencia")
+    parser.add_argument("--baseline-runs", type=int, default=3,
+                        help="Pases al grabar la línea base (se guarda el peor de cada medida)")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="Terminar con éxito aunque no exista la línea base")
+    parser.add_argument("--no-gui", action="store_true", help="Solo las medidas que no necesitan pantalla")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Empeoramiento relativo permitido")
+    parser.add_argument("--floor-ms", type=float, default=2.0, help="Diferencias menores se ignoran siempre")
+    args = parser.parse_args(argv)
+
+    if not args.save_baseline and not args.allow_missing_baseline and not os.path.exists(args.baseline):
+        print(f"Sin línea base ({args.baseline}); use --save-baseline para crearla "
+              f"o --allow-missing-baseline para medir sin comparar.", file=sys.stderr)
+        return 1
+    display = None if args.no_gui else start_virtual_display()
+    shares = {"shared": args.shared, "missing": args.missing, "gif": args.gif, "ico": args.ico}
+    results = {}
+    # La línea base es el peor de varios pases: el ruido normal de la máquina no debe superarla
+    runs = args.baseline_runs if args.save_baseline else 1
+    try:
+        with tempfile.TemporaryDirectory(prefix="launcher-bench-") as workdir:
+            isolate_user_dirs(workdir)
+            for run in range(runs):
+                for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+                    config_path = os.path.join(workdir, f"config_{size}.json")
+                    buttons = generate_config(config_path, size, **shares)
+                    measured = bench_core(size, config_path, buttons, workdir, args.repeat)
+                    if not args.no_gui:
+                        measured.update(bench_size(size, config_path, buttons, workdir, args.repeat))
+                    for key, value in measured.items():
+                        key = f"{key}[{size}]"
+                        results[key] = max(results.get(key, 0.0), round(value, 3))
+                        print(f"{key}: {value:.2f} ms" + (f" (pase {run + 1}/{runs})" if runs > 1 else ""), flush=True)
+    finally:
+        if display is not None:
+            display.terminate()
+
+    report = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat, "shares": shares,
+                       "gui": not args.no_gui, "runs": runs},
+              "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Sin línea base ({args.baseline}): no se compara.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+    regressions, unknown = compare(results, baseline, args.tolerance, args.floor_ms)
+    for key, base, value in regressions:
+        print(f"REGRESIÓN {key}: {base:.2f} ms -> {value:.2f} ms (+{(value / base - 1) * 100:.0f} %)",
+              file=sys.stderr)
+    if unknown:
+        print(f"Sin línea base para {', '.join(unknown)}: grábela de nuevo con --save-baseline "
+              f"(con pantalla para incluir las medidas de la interfaz).", file=sys.stderr)
+    if regressions or unknown:
+        return 1
+    print(f"Sin regresiones frente a {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""Prueba de resistencia: detecta fugas de widgets, imágenes Tk y memoria.
+
+Uso: python benchmarks/soak_test.py [--cycles 3000] [--buttons 200] [--output evolucion.json]
+
+Repite miles de ciclos guionizados sobre la interfaz real (añadir, modificar con el diálogo de
+edición, eliminar, recargar el archivo cambiado desde fuera, lanzar, cambiar de vista, activar
+o desactivar el atlas de iconos y cambiar de perfil) y toma muestras de la memoria residente,
+del número de imágenes Tk vivas (`image names`) y del número de widgets. Antes de cada muestra
+se vuelve a un estado canónico (los dos perfiles con su número inicial de botones, el principal
+en primer plano, la cuadrícula normal y sin atlas), así que las medidas no dependen del azar de
+los ciclos; de las imágenes se vigilan las que no pertenecen al IconRegistry. En ese estado
+todos los iconos son del registro, de modo que una ejecución sin fugas mantiene constantes los
+widgets y las imágenes fuera del registro: los umbrales son solo margen. Tras un calentamiento
+se fija la referencia; termina con código 1 si al final alguna medida ha crecido más del
+umbral. En Linux sin $DISPLAY arranca un Xvfb propio. Las cachés y el historial de uso del
+lanzador van a una carpeta temporal, nunca a la del usuario.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run_benchmarks import isolate_user_dirs, start_virtual_display
+from synthetic import generate_config
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def resident_bytes():
+    from process_supervisor import _read_proc_usage
+    return _read_proc_usage(os.getpid())[1]
+
+
+class SoakRun:
+    """Los ciclos guionizados sobre un AppLauncher; cada operación reproduce lo que hace la interfaz."""
+
+    OPERATIONS = ("add", "modify", "modify", "delete", "reload", "launch", "toggle_view", "toggle_atlas",
+                  "switch_profile")
+
+    def __init__(self, root, app, config_path, second_config, icons, seed):
+        self.root = root
+        self.app = app
+        self.config_path = config_path
+        self.second_config = second_config
+        self.sizes = {}  # Número de botones de cada configuración al empezar
+        self.icons = icons
+        self.rng = random.Random(seed)
+        self.counter = 0
+        self.true_program = shutil.which("true")  # Un programa que termina al instante
+
+    def settle(self, timeout_s=5.0):
+        """Procesa eventos hasta que no quedan iconos por decodificar."""
+        deadline = time.monotonic() + timeout_s
+        self.root.update()
+        while self.app.icon_loader.pending() and time.monotonic() < deadline:
+            time.sleep(0.001)
+            self.root.update()
+
+    def cycle(self):
+        self.counter += 1
+        operation = self.rng.choice(self.OPERATIONS)
+        getattr(self, operation)()
+        self.settle()
+        return operation
+
+    def _icon(self):
+        return self.rng.choice(self.icons) if self.icons and self.rng.random() < 0.9 else ""
+
+    def add(self):
+        from entries import ButtonEntry
+
+        entry = ButtonEntry(f"Soak {self.counter}", f"/soak/programa_{self.counter}", self._icon())
+        self.app.buttons_data.append(entry)
+        self.app._request_icon(entry)
+        self.app.update_buttons_display()
+
+    def modify(self):
+        # El diálogo real: se rellena, se pulsa "Guardar Cambios" y se destruye
+        if not self.app.buttons_data:
+            return self.add()
+        import tkinter as tk
+
+        before = set(self.root.winfo_children())
+        self.app._open_actual_edit_dialog(self.rng.randrange(len(self.app.buttons_data)))
+        dialog = next(w for w in self.root.winfo_children() if w not in before and isinstance(w, tk.Toplevel))
+        widgets, pending = [], [dialog]
+        while pending:
+            widget = pending.pop(0)
+            widgets.append(widget)
+            pending.extend(widget.winfo_children())
+        entries = [w for w in widgets if isinstance(w, tk.Entry)]
+        for entry, value in zip(entries, (f"Modificado {self.counter}", None, self._icon())):
+            if value is not None:
+                entry.delete(0, tk.END)
+                entry.insert(0, value)
+        next(w for w in widgets if isinstance(w, tk.Button) and w.cget("text") == "Guardar Cambios").invoke()
+
+    def delete(self):
+        # Lo que hace delete_button_dialog tras la confirmación
+        if len(self.app.buttons_data) < 2:
+            return self.add()
+        index = self.rng.randrange(len(self.app.buttons_data))
+        self.app._forget_icon(self.app.buttons_data.pop(index))
+        self.app.update_buttons_display()
+
+    def reload(self):
+        # Otra herramienta reescribe el archivo: se aplica solo la diferencia
+        from config_journal import atomic_write_json
+
+        if self.app.current_config_file != self.config_path:
+            return
+        self.app.flush_autosave()
+        with open(self.config_path, encoding="utf-8") as f:
+            data = json.load(f)
+        buttons = data["buttons"] if isinstance(data, dict) else data
+        if buttons:
+            buttons[self.rng.randrange(len(buttons))]["name"] = f"Externo {self.counter}"
+        atomic_write_json(self.config_path, data)
+        self.app.reload_config_file()
+
+    def launch(self):
+        if self.true_program is None or not self.app.buttons_data:
+            return
+        self.app._launch_program(self.true_program, "true")
+
+    def toggle_view(self):
+        self.app.virtual_view_var.set(not self.app.virtual_view_var.get())
+        self.app.toggle_virtual_view()
+
+    def toggle_atlas(self):
+        # La casilla del menú: con la vista virtual activa rehace el registro de iconos
+        self.app.icon_atlas_var.set(not self.app.icon_atlas_var.get())
+        self.app.toggle_virtual_view()
+
+    def switch_profile(self):
+        target = self.second_config if self.app.current_config_file == self.config_path else self.config_path
+        self.app.add_profile(target, activate=True)
+
+    def normalize(self):
+        """Vuelve al estado de referencia: cada perfil con su tamaño inicial, sin vista virtual
+        ni atlas y con el perfil principal en primer plano."""
+        for path in (self.second_config, self.config_path):
+            if self.app.current_config_file != path:
+                self.app.add_profile(path, activate=True)
+            if self.app.icon_atlas_var.get():
+                self.toggle_atlas()
+            if self.app.virtual_view_var.get():
+                self.toggle_view()
+            size = self.sizes.setdefault(path, len(self.app.buttons_data))
+            while len(self.app.buttons_data) < size:
+                self.add()
+            while len(self.app.buttons_data) > size:
+                self.delete()
+            self.settle()
+
+
+def sample(soak, cycle):
+    soak.normalize()
+    gc.collect()
+    soak.root.update()
+    images = len(soak.root.image_names())
+    return {"cycle": cycle, "rss_bytes": resident_bytes(), "tk_images": images,
+            # Las que no son iconos vivos del registro: aquí se ven las fugas
+            "untracked_images": images - soak.app.icon_registry.stats()["tk_images"],
+            "widgets": count_widgets(soak.root), "time": time.time()}
+
+
+def check(baseline, final, args):
+    """Devuelve las líneas de fallo (medida, referencia, final, umbral)."""
+    failures = []
+    limits = (("untracked_images", args.max_image_growth), ("widgets", args.max_widget_growth),
+              ("rss_bytes", args.max_rss_growth_mb * 1024 * 1024))
+    for key, limit in limits:
+        if baseline[key] is None or final[key] is None:
+            continue
+        if final[key] - baseline[key] > limit:
+            failures.append((key, baseline[key], final[key], limit))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de resistencia del lanzador")
+    parser.add_argument("--cycles", type=int, default=3000, help="Ciclos medidos (tras el calentamiento)")
+    parser.add_argument("--warmup", type=int, default=300, help="Ciclos antes de fijar la referencia")
+    parser.add_argument("--buttons", type=int, default=200, help="Botones de la configuración inicial")
+    parser.add_argument("--sample-every", type=int, default=250, help="Ciclos entre muestras")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--max-image-growth", type=int, default=10, help="Imágenes Tk de más permitidas")
+    parser.add_argument("--max-widget-growth", type=int, default=10, help="Widgets de más permitidos")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=32.0, help="Crecimiento de memoria permitido")
+    parser.add_argument("--output", help="Archivo JSON donde escribir la evolución de las muestras")
+    args = parser.parse_args(argv)
+
+    display = start_virtual_display()
+    try:
+        with tempfile.TemporaryDirectory(prefix="launcher-soak-") as workdir:
+            samples, baseline = run(args, workdir)
+    finally:
+        if display is not None:
+            display.terminate()
+
+    for s in samples:
+        rss = f"{s['rss_bytes'] / 1048576:.1f} MiB" if s["rss_bytes"] is not None else "?"
+        print(f"ciclo {s['cycle']:>6}: memoria {rss:>11}  imágenes Tk {s['tk_images']:>5}"
+              f" (fuera del registro {s['untracked_images']:>4})  widgets {s['widgets']:>6}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"baseline": baseline, "samples": samples}, f, indent=2)
+    failures = check(baseline, samples[-1], args)
+    for key, base, final, limit in failures:
+        print(f"FUGA {key}: {base} -> {final} (crecimiento permitido: {limit:g})", file=sys.stderr)
+    if failures:
+        return 1
+    print(f"Sin fugas tras {args.cycles} ciclos")
+    return 0
+
+
+def run(args, workdir):
+    import tkinter as tk
+    import program_launcher2
+
+    isolate_user_dirs(workdir)  # Antes de crear el AppLauncher: fija ahí sus carpetas
+    config_path = os.path.join(workdir, "soak.json")
+    second_config = os.path.join(workdir, "soak_2.json")
+    buttons = generate_config(config_path, args.buttons, seed=args.seed)
+    generate_config(second_config, max(1, args.buttons // 4), seed=args.seed + 1)
+    icons = sorted({b["icon_path"] for b in buttons if b["icon_path"] and os.path.exists(b["icon_path"])})
+
+    root = tk.Tk()
+    try:
+        app = program_launcher2.AppLauncher(root)
+        app.launch_debouncer.window_s = 0
+        # Sin preguntas: un cambio externo se recarga siempre
+        app._on_config_file_changed = lambda path: app.reload_config_file()
+        app.open_config_file(config_path)
+        soak = SoakRun(root, app, config_path, second_config, icons, args.seed)
+        soak.normalize()  # Abre el segundo perfil y anota el tamaño de los dos
+
+        for _ in range(args.warmup):
+            soak.cycle()
+        baseline = sample(soak, 0)
+        samples = [baseline]
+        for cycle in range(1, args.cycles + 1):
+            soak.cycle()
+            if cycle % args.sample_every == 0 or cycle == args.cycles:
+                samples.append(sample(soak, cycle))
+                print(f"{cycle}/{args.cycles}", file=sys.stderr, flush=True)
+        app.icon_loader.shutdown()
+        app.path_validator.shutdown()
+        if app.config_watcher is not None:
+            app.config_watcher.stop()
+    finally:
+        root.destroy()
+    return samples, baseline
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Generador de configuraciones sintéticas para las pruebas de rendimiento."""
+import json
+import os
+import random
+
+
+def _make_icons(icon_dir, count, kind, rng):
+    from PIL import Image
+
+    os.makedirs(icon_dir, exist_ok=True)
+    paths = []
+    for i in range(count):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+        if kind == "gif":
+            path = os.path.join(icon_dir, f"anim_{i}.gif")
+            frames = [Image.new("RGB", (64, 64), color[:3]), Image.new("RGB", (64, 64), color[::-1][1:])]
+            frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+        elif kind == "ico":
+            path = os.path.join(icon_dir, f"large_{i}.ico")
+            Image.new("RGBA", (256, 256), color).save(path, sizes=[(16, 16), (32, 32), (48, 48), (256, 256)])
+        else:
+            path = os.path.join(icon_dir, f"{kind}_{i}.png")
+            Image.new("RGBA", (48, 48), color).save(path)
+        paths.append(path.replace("\\", "/"))
+    return paths
+
+
+def generate_config(path, entries, shared=0.5, missing=0.1, gif=0.05, ico=0.05, shared_pool=20, seed=1234):
+    """Escribe en `path` una configuración de `entries` botones y devuelve la lista de botones.
+
+    Las proporciones indican qué parte de los botones usa un icono compartido (de un grupo de
+    `shared_pool` archivos), un icono inexistente, un GIF animado o un ICO grande de 256 px; el
+    resto tiene un PNG propio. Los iconos se crean en `<path>.icons/`.
+    """
+    rng = random.Random(seed)
+    icon_dir = path + ".icons"
+    counts = {kind: int(round(entries * share)) for kind, share in
+              (("shared", shared), ("missing", missing), ("gif", gif), ("ico", ico))}
+    counts["unique"] = max(0, entries - sum(counts.values()))
+    pool = _make_icons(icon_dir, min(shared_pool, counts["shared"]), "shared", rng)
+    icons = [pool[i % len(pool)] for i in range(counts["shared"])] if pool else []
+    icons += [f"{icon_dir}/missing_{i}.png" for i in range(counts["missing"])]
+    icons += _make_icons(icon_dir, counts["gif"], "gif", rng)
+    icons += _make_icons(icon_dir, counts["ico"], "ico", rng)
+    icons += _make_icons(icon_dir, counts["unique"], "unique", rng)
+    rng.shuffle(icons)
+    buttons = [{"name": f"Programa {i:05d}", "program_path": f"/opt/synthetic/app{i}/bin/app{i}",
+                "icon_path": icon} for i, icon in enumerate(icons[:entries])]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(buttons, f, indent=2)
+    return buttons
@@ -0,0 +1,295 @@
+import configparser
+import functools
+import os
+import queue
+import re
+import shlex
+import shutil
+import struct
+import sys
+import threading
+
+from entries import ButtonEntry
+from pe_icons import PE_SUFFIXES, is_pe_icon_spec
+
+
+PROGRAM_SUFFIXES = (".exe", ".bat", ".cmd", ".com")
+POSIX_PROGRAM_SUFFIXES = ("", ".sh", ".appimage")  # Solo si tienen el bit de ejecución
+ICON_SUFFIXES = (".ico", ".png", ".gif", ".jpg", ".jpeg")  # En orden de preferencia
+THEME_ICON_DIRS = ("/usr/share/icons/hicolor/48x48/apps", "/usr/share/icons/hicolor/64x64/apps",
+                   "/usr/share/icons/hicolor/128x128/apps", "/usr/share/icons/hicolor/256x256/apps",
+                   "/usr/share/icons/hicolor/32x32/apps", "/usr/share/pixmaps")
+
+_LNK_HEADER = struct.Struct("<I16sIIQQQIiIHH")  # tamaño, CLSID, flags, atributos, 3 fechas, tamaño, icono...
+_HAS_ID_LIST, _HAS_LINK_INFO, _HAS_NAME, _HAS_RELATIVE_PATH = 0x1, 0x2, 0x4, 0x8
+_HAS_WORKING_DIR, _HAS_ARGUMENTS, _HAS_ICON_LOCATION, _IS_UNICODE = 0x10, 0x20, 0x40, 0x80
+NEEDS_ARGUMENTS = "necesita argumentos"  # Lanzador que no se importa: el programa se ejecuta sin argumentos
+
+
+def default_shortcut_dirs():
+    """Carpetas de accesos directos del sistema y del usuario que existen en esta máquina."""
+    if sys.platform.startswith("win"):
+        candidates = [os.path.join(os.environ.get(var, ""), "Microsoft", "Windows", "Start Menu", "Programs")
+                      for var in ("PROGRAMDATA", "APPDATA")]
+        candidates.append(os.path.join(os.path.expanduser("~"), "Desktop"))
+    else:
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        candidates = [os.path.join(data_home, "applications"), "/usr/local/share/applications",
+                      "/usr/share/applications", "/var/lib/flatpak/exports/share/applications"]
+    return [d for d in candidates if os.path.isdir(d)]
+
+
+@functools.lru_cache(maxsize=None)
+def _theme_icon(name):
+    """Busca un icono por nombre en el tema hicolor y en pixmaps (resultado memorizado)."""
+    return next((os.path.join(d, name + ext) for d in THEME_ICON_DIRS for ext in (".png", ".xpm")
+                 if os.path.isfile(os.path.join(d, name + ext))), "")
+
+
+def parse_desktop_file(path):
+    """Devuelve (nombre, programa, icono) de un .desktop de tipo Application, o None.
+
+    Del Exec se conserva el ejecutable (resuelto en el PATH) y se quitan los códigos %f, %u...
+    Si además lleva argumentos (`flatpak run ...`, `sh -c ...`) devuelve NEEDS_ARGUMENTS: el
+    lanzador ejecuta el programa sin argumentos y el botón abriría otra cosa.
+    """
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            parser.read_file(f)
+        section = parser["Desktop Entry"]
+    except (OSError, configparser.Error, KeyError):
+        return None
+    if section.get("Type", "Application") != "Application":
+        return None
+    if section.get("NoDisplay", "").lower() == "true" or section.get("Hidden", "").lower() == "true":
+        return None
+    try:
+        tokens = [t for t in shlex.split(section.get("Exec", "")) if not t.startswith("%")]
+    except ValueError:
+        return None
+    if tokens and os.path.basename(tokens[0]) == "env":
+        tokens = [t for t in tokens[1:] if "=" not in t or t.startswith("/")]
+    if not tokens:
+        return None
+    if len(tokens) > 1:
+        return NEEDS_ARGUMENTS
+    program = tokens[0] if os.path.isabs(tokens[0]) else shutil.which(tokens[0])
+    if not program:
+        return None  # No está instalado
+    icon = section.get("Icon", "")
+    if icon and not os.path.isabs(icon):
+        icon = _theme_icon(icon)
+    return section.get("Name", ""), program, icon
+
+
+def _lnk_string(data, offset, unicode):
+    count = struct.unpack_from("<H", data, offset)[0]
+    if unicode:
+        end = offset + 2 + count * 2
+        return data[offset + 2:end].decode("utf-16-le", "replace"), end
+    end = offset + 2 + count
+    return data[offset + 2:end].decode("mbcs" if sys.platform.startswith("win") else "latin-1", "replace"), end
+
+
+def _c_string(data, offset):
+    end = data.find(b"\0", offset)
+    return data[offset:end if end >= 0 else len(data)].decode("latin-1")
+
+
+def parse_lnk(path):
+    """Devuelve (destino, icono 'archivo,índice' o '') de un acceso directo .lnk de Windows, o None."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(1 << 16)
+        size, _, flags, _, _, _, _, _, icon_index, _, _, _ = _LNK_HEADER.unpack_from(data)
+        if size != 0x4C:
+            return None
+        offset = size
+        if flags & _HAS_ID_LIST:
+            offset += 2 + struct.unpack_from("<H", data, offset)[0]
+        target = ""
+        if flags & _HAS_LINK_INFO:
+            info_size, _, _, _, base_offset, _, suffix_offset = struct.unpack_from("<7I", data, offset)
+            if base_offset:
+                target = _c_string(data, offset + base_offset)
+                if suffix_offset:
+                    target += _c_string(data, offset + suffix_offset)
+            offset += info_size
+        unicode = bool(flags & _IS_UNICODE)
+        strings = {}
+        for flag in (_HAS_NAME, _HAS_RELATIVE_PATH, _HAS_WORKING_DIR, _HAS_ARGUMENTS, _HAS_ICON_LOCATION):
+            if flags & flag:
+                strings[flag], offset = _lnk_string(data, offset, unicode)
+    except (OSError, struct.error):
+        return None
+    if not target and _HAS_RELATIVE_PATH in strings:
+        target = os.path.normpath(os.path.join(os.path.dirname(path), strings[_HAS_RELATIVE_PATH]))
+    if not target:
+        return None  # Accesos a elementos del shell (Panel de control, URLs...)
+    # Las variables de Windows (%SystemRoot%) se expanden también fuera de Windows
+    icon_location = re.sub(r"%([^%]+)%", lambda m: os.environ.get(m.group(1), m.group(0)),
+                           strings.get(_HAS_ICON_LOCATION, ""))
+    if icon_location:
+        # El índice solo tiene sentido dentro de un ejecutable o biblioteca; un .ico va tal cual
+        icon = f"{icon_location},{icon_index}"
+        if not is_pe_icon_spec(icon):
+            icon = icon_location
+    elif target.lower().endswith(PE_SUFFIXES):
+        icon = f"{target},0"
+    else:
+        icon = ""
+    return target, icon
+
+
+def entry_for(dir_entry, ext, images):
+    """ButtonEntry para un archivo del recorrido, None si no es un lanzador o NEEDS_ARGUMENTS.
+
+    `images` asocia el nombre (sin extensión, en minúsculas) de las imágenes de la misma carpeta
+    con su ruta: un programa con una imagen hermana la usa como icono.
+    """
+    path = dir_entry.path
+    stem = os.path.splitext(dir_entry.name)[0]
+    if ext == ".desktop":
+        parsed = parse_desktop_file(path)
+        if parsed is NEEDS_ARGUMENTS:
+            return parsed
+        return ButtonEntry(parsed[0], parsed[1], parsed[2]) if parsed else None
+    if ext == ".lnk":
+        parsed = parse_lnk(path)
+        return ButtonEntry(stem, parsed[0], parsed[1]) if parsed else None
+    if ext in PROGRAM_SUFFIXES:
+        icon = images.get(stem.lower()) or (f"{path},0" if ext == ".exe" else "")
+        return ButtonEntry("", path, icon)
+    if os.name == "posix" and ext in POSIX_PROGRAM_SUFFIXES:
+        try:
+            executable = dir_entry.stat().st_mode & 0o111
+        except OSError:
+            return None
+        if executable:
+            return ButtonEntry("", path, images.get(stem.lower(), ""))
+    return None
+
+
+class BulkImporter:
+    """Busca lanzadores en árboles de carpetas con un recorrido `os.scandir` en paralelo.
+
+    Cada carpeta es una tarea del pool: lista su contenido, encola sus subcarpetas y convierte
+    los ejecutables, .desktop y .lnk en ButtonEntry. Los hallazgos llegan al hilo de Tk por una
+    cola que se vacía cada POLL_MS; `on_found(entries)` recibe cada tanda y `on_done(cancelled)`
+    se llama una vez al terminar. No se siguen enlaces simbólicos a carpetas ni carpetas ocultas.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, root, on_found, on_done, max_workers=8):
+        self.root = root
+        self.on_found = on_found
+        self.on_done = on_done
+        self.max_workers = max_workers
+        self.directories = 0  # Carpetas recorridas
+        self.found = 0        # Lanzadores encontrados (antes de descartar duplicados)
+        self.needs_arguments = 0  # .desktop omitidos porque su Exec lleva argumentos
+        self._executor = None
+        self._results = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._cancelled = threading.Event()
+        self._poll_job = None
+
+    @property
+    def running(self):
+        return self._poll_job is not None
+
+    def start(self, directories):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bulk-import")
+        self._cancelled.clear()
+        self.directories = self.found = self.needs_arguments = 0
+        roots = [d for d in directories if d]
+        if not roots:
+            self.root.after_idle(lambda: self.on_done(False))
+            return
+        with self._lock:
+            self._outstanding = len(roots)
+        for directory in roots:
+            self._executor.submit(self._scan, directory)
+        self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _scan(self, directory):
+        found, subdirs, needs_arguments = [], [], 0
+        try:
+            if not self._cancelled.is_set():
+                found, subdirs, needs_arguments = self._scan_directory(directory)
+        finally:
+            with self._lock:
+                self._outstanding += len(subdirs) - 1
+                done = self._outstanding == 0
+            for subdir in subdirs:
+                self._executor.submit(self._scan, subdir)
+            self._results.put((found, needs_arguments, done))
+
+    def _scan_directory(self, directory):
+        files, subdirs, images = [], [], {}
+        try:
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    if dir_entry.name.startswith("."):
+                        continue
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            subdirs.append(dir_entry.path)
+                            continue
+                        if not dir_entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    ext = os.path.splitext(dir_entry.name)[1].lower()
+                    if ext in ICON_SUFFIXES:
+                        stem = os.path.splitext(dir_entry.name)[0].lower()
+                        current = images.get(stem)
+                        if current is None or ICON_SUFFIXES.index(ext) < ICON_SUFFIXES.index(
+                                os.path.splitext(current)[1].lower()):
+                            images[stem] = dir_entry.path
+                    else:
+                        files.append((dir_entry, ext))
+        except OSError:
+            pass  # Sin permiso o desaparecida durante el recorrido
+        found, needs_arguments = [], 0
+        for dir_entry, ext in files:
+            entry = entry_for(dir_entry, ext, images)
+            if entry is NEEDS_ARGUMENTS:
+                needs_arguments += 1
+            elif entry is not None:
+                found.append(entry)
+        return found, subdirs, needs_arguments
+
+    def _poll(self):
+        batch, finished = [], False
+        while True:
+            try:
+                found, needs_arguments, done = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.directories += 1
+            self.needs_arguments += needs_arguments
+            batch.extend(found)
+            finished = finished or done
+        self.found += len(batch)
+        if batch and not self._cancelled.is_set():
+            self.on_found(batch)
+        if finished:
+            self._poll_job = None
+            self.on_done(self._cancelled.is_set())
+        else:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+
+from config_journal import atomic_write_bytes, file_sha1
+from entries import ButtonEntry, EntryStore, LauncherConfig
+from metrics import metrics
+
+
+# Cabecera: magia, versión, mtime_ns y tamaño del JSON de origen, sha1 del JSON de origen,
+# número de entradas, elementos omitidos, longitud del bloque JSON de grupos/ajustes y crc32 del
+# archivo entero (el resto de la cabecera, la tabla, el texto y el bloque JSON)
+_HEADER = struct.Struct("<4sHqq20sIIII")
+_MAGIC = b"PLCC"
+_VERSION = 3  # 3: los argumentos detrás del ejecutable ya no se normalizan
+# Cada entrada: (desplazamiento, longitud) en caracteres de nombre, programa e icono dentro del
+# bloque de texto UTF-8, que se decodifica de una sola vez
+_ROW = struct.Struct("<IIIIII")
+SUFFIX = ".plcache"
+
+
+def cache_path_for(config_path):
+    return config_path + SUFFIX
+
+
+class CompiledConfig:
+    """Vista sobre el archivo compilado proyectado en memoria.
+
+    Al abrirla se comprueba el crc32 de todo el archivo (unos 0,3 ms por MB); la tabla de
+    entradas y el texto solo se decodifican al materializar las entradas. La caché se ahorra el
+    análisis del JSON, no la creación de los ButtonEntry: `to_config` los construye todos, porque
+    EntryStore guarda objetos. Una caché dañada lanza ValueError.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.src_mtime_ns, self.src_size, self.src_sha1,
+             self.count, self.skipped, extras_len, crc) = _HEADER.unpack_from(self._map)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError("formato de caché desconocido")
+            with memoryview(self._map) as view, view[:_HEADER.size - 4] as head, view[_HEADER.size:] as body:
+                if zlib.crc32(body, zlib.crc32(head)) != crc:
+                    raise ValueError("datos corruptos")
+            self._rows_offset = _HEADER.size
+            self._text_offset = self._rows_offset + self.count * _ROW.size
+            self._extras_offset = len(self._map) - extras_len
+            if self._extras_offset < self._text_offset:
+                raise ValueError("caché truncada")
+            self.extras = json.loads(self._map[self._extras_offset:].decode("utf-8"))
+        except (struct.error, ValueError) as e:
+            self._map.close()
+            raise ValueError(f"caché compilada no válida: {e}") from e
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self):
+        return self.count
+
+    def is_fresh_for(self, config_path):
+        st = os.stat(config_path)
+        if st.st_size != self.src_size:
+            return False
+        if st.st_mtime_ns == self.src_mtime_ns:
+            return True
+        # Mismo tamaño pero otra fecha (p. ej. copiado o sincronizado): decide el contenido
+        return file_sha1(config_path) == self.src_sha1
+
+    def iter_entries(self):
+        text = self._map[self._text_offset:self._extras_offset].decode("utf-8", "surrogatepass")
+        text_len = len(text)
+        from_normalized = ButtonEntry.from_normalized
+        for no, nl, po, pl, io, il in _ROW.iter_unpack(self._map[self._rows_offset:self._text_offset]):
+            if no + nl > text_len or po + pl > text_len or io + il > text_len:
+                raise ValueError("caché compilada no válida: desplazamiento fuera del texto")
+            yield from_normalized(text[no:no + nl], text[po:po + pl], text[io:io + il])
+
+    def to_config(self):
+        store = EntryStore()
+        store.extend(self.iter_entries())
+        return LauncherConfig(store, self.extras.get("groups", []), self.extras.get("settings", {}), self.skipped)
+
+
+def write_compiled(config_path, config, source=None):
+    """Escribe la caché compilada junto a `config_path` (de forma atómica). Devuelve False si no se pudo.
+
+    `source` es (mtime_ns, tamaño, sha1) del JSON del que sale `config`; sin él se toman del
+    archivo actual, lo que solo es correcto si nadie lo ha cambiado desde que se leyó.
+    """
+    if source is None:
+        try:
+            st = os.stat(config_path)
+            source = (st.st_mtime_ns, st.st_size, file_sha1(config_path))
+        except OSError:
+            return False
+    mtime_ns, size, sha1 = source
+    rows = []
+    parts = []
+    position = 0
+    for entry in config.entries:
+        row = []
+        for value in (entry.name, entry.program_path, entry.icon_path):
+            row += (position, len(value))
+            parts.append(value)
+            position += len(value)
+        rows.append(_ROW.pack(*row))
+    text = "".join(parts).encode("utf-8", "surrogatepass")
+    extras = json.dumps({"groups": config.groups, "settings": config.settings}).encode("utf-8")
+    body = b"".join(rows) + text + extras
+    head = _HEADER.pack(_MAGIC, _VERSION, mtime_ns, size, sha1, len(rows), config.skipped, len(extras), 0)[:-4]
+    header = head + struct.pack("<I", zlib.crc32(body, zlib.crc32(head)))
+    try:
+        atomic_write_bytes(cache_path_for(config_path), header + body, durable=False)  # Se regenera si se pierde
+    except OSError:
+        return False
+    return True
+
+
+def _read_source(config_path):
+    """Lee y analiza el JSON; devuelve (LauncherConfig, (mtime_ns, tamaño, sha1) de esos bytes).
+
+    La fecha se toma antes de leer: si el archivo cambia mientras tanto, la caché quedará con una
+    fecha antigua y la próxima carga decidirá por el contenido.
+    """
+    with open(config_path, "rb") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        data = f.read()
+    config = LauncherConfig.from_json(json.loads(data.decode("utf-8")))
+    return config, (mtime_ns, len(data), hashlib.sha1(data).digest())
+
+
+def load_config(config_path, use_cache=True):
+    """Carga la configuración desde la caché compilada si está al día; si no, desde el JSON.
+
+    Al leer el JSON se regenera la caché. Las excepciones de lectura del JSON se propagan.
+    """
+    if use_cache:
+        try:
+            compiled = CompiledConfig(cache_path_for(config_path))
+        except (OSError, ValueError):
+            compiled = None
+        if compiled is not None:
+            try:
+                if compiled.is_fresh_for(config_path):
+                    metrics.inc("config_cache_hits")
+                    return compiled.to_config()
+            except (OSError, ValueError, UnicodeDecodeError):
+                pass
+            finally:
+                compiled.close()
+    metrics.inc("config_cache_misses")
+    config, source = _read_source(config_path)
+    if use_cache:
+        write_compiled(config_path, config, source)
+    return config
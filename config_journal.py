@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+
+from entries import ButtonEntry, clean_settings
+from metrics import metrics
+
+
+SUFFIX = ".journal"
+
+
+def atomic_write_bytes(path, payload, durable=True):
+    """Escribe `payload` en `path` sin dejarlo nunca a medias: archivo temporal y rename.
+
+    Con `durable` se sincronizan (fsync) los datos y la entrada de directorio del rename; sin él
+    solo se garantiza que nunca se vea un archivo a medias. Las excepciones (OSError) se propagan.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+    if durable and hasattr(os, "O_DIRECTORY"):
+        # Persiste también la entrada de directorio del rename
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try: os.fsync(fd)
+            finally: os.close(fd)
+        except OSError:
+            pass
+
+
+def atomic_write_json(path, data):
+    """Escribe `data` como JSON con `atomic_write_bytes` (con fsync).
+
+    Devuelve el sha1 de los bytes escritos. Las excepciones (OSError, TypeError) se propagan.
+    """
+    payload = json.dumps(data, indent=2).encode("utf-8")
+    atomic_write_bytes(path, payload)
+    return hashlib.sha1(payload).hexdigest()
+
+
+def file_sha1(path):
+    """sha1 (bytes) del contenido de `path`, leído por bloques."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+class ConfigJournal:
+    """Diario de cambios de un archivo de configuración (`<config>.journal`, una línea JSON por cambio).
+
+    La primera línea guarda el sha1 del JSON sobre el que se aplican los cambios, así un diario
+    que sobrevive a una compactación (o a una edición externa del JSON) se descarta en lugar de
+    aplicarse dos veces. Cada `record` añade y sincroniza solo su línea; `compact` reescribe el
+    JSON de forma atómica y vacía el diario. Una última línea cortada por un cierre brusco se ignora.
+    """
+
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.path = config_path + SUFFIX
+        self._base = None
+        self._file = None
+        self.pending = 0  # Cambios registrados desde la última compactación
+
+    def replay(self, config, read_only=False):
+        """Aplica al LauncherConfig los cambios pendientes del diario. Devuelve cuántos aplicó.
+
+        Con `read_only` el archivo no se toca (ni se descarta ni se recorta): para procesos que
+        solo leen el diario que escribe otro, como el lanzador sin interfaz.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.read().split(b"\n")
+        except FileNotFoundError:
+            return 0
+        try:
+            header = json.loads(lines[0])
+            base_ok = header.get("base") == file_sha1(self.config_path).hex()
+        except (OSError, ValueError, AttributeError):
+            base_ok = False
+        if not base_ok:
+            if not read_only:
+                self.discard()
+            return 0
+        self._base = header["base"]
+        applied = 0
+        valid_end = len(lines[0]) + 1
+        for line in lines[1:]:
+            if line.strip():
+                try:
+                    _apply(config, json.loads(line))
+                except (ValueError, KeyError, IndexError, TypeError):
+                    # Línea cortada o inválida: se recorta el diario para poder seguir añadiendo
+                    if not read_only:
+                        with open(self.path, "r+b") as f:
+                            f.truncate(valid_end)
+                    break
+                applied += 1
+            valid_end += len(line) + 1
+        self.pending = applied
+        return applied
+
+    def record(self, op):
+        with metrics.timer("journal_append"):
+            self._record((op,))
+
+    def record_many(self, ops):
+        """Como `record`, pero con una sola sincronización para todo el bloque de cambios."""
+        if ops:
+            with metrics.timer("journal_append"):
+                self._record(ops)
+
+    def _record(self, ops):
+        if self._file is None:
+            if self._base is None:
+                self._base = file_sha1(self.config_path).hex()
+            fresh = not os.path.exists(self.path)
+            self._file = open(self.path, "ab")
+            if fresh or self._file.tell() == 0:
+                self._file.write(json.dumps({"base": self._base}).encode("utf-8") + b"\n")
+        self._file.write(b"".join(json.dumps(op, ensure_ascii=False).encode("utf-8") + b"\n" for op in ops))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.pending += len(ops)
+
+    def compact(self, config):
+        """Vuelca el estado completo en el JSON (atómicamente) y empieza un diario vacío."""
+        base = atomic_write_json(self.config_path, config.to_json())
+        self.discard()
+        self._base = base
+
+    def discard(self):
+        self.close()
+        self._base = None
+        self.pending = 0
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def entry_op(event, entry, index):
+    """Traduce un aviso de EntryStore (evento, entrada, índice) a una operación del diario."""
+    if event == "remove":
+        return {"op": "remove", "index": index}
+    return {"op": event, "index": index, "entry": entry.to_dict()}
+
+
+def _apply(config, op):
+    kind = op["op"]
+    entries = config.entries
+    if kind in ("add", "update", "remove"):
+        index = op["index"]
+        if not 0 <= index < len(entries) + (kind == "add"):
+            raise IndexError(index)
+    if kind == "add":
+        entries.insert(index, ButtonEntry.from_dict(op["entry"]))
+    elif kind == "update":
+        data = op["entry"]
+        entries.update(entries[index], name=data["name"], program_path=data["program_path"],
+                       icon_path=data.get("icon_path", ""))
+    elif kind == "remove":
+        entries.pop(index)
+    elif kind == "groups":
+        config.groups = list(op["groups"])
+    elif kind == "settings":
+        config.settings = clean_settings(op["settings"])
+    else:
+        raise ValueError(f"operación desconocida: {kind}")
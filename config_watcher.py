@@ -0,0 +1,176 @@
+import difflib
+import os
+import struct
+import sys
+import tkinter as tk
+
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (seguido del nombre)
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _open_inotify(directory):
+    """Devuelve un descriptor inotify que vigila `directory`, o None si no está disponible."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)  # Símbolos del propio proceso (incluye libc)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    # Se vigila el directorio: el guardado atómico (rename) sustituye el inodo del archivo
+    if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class ConfigWatcher:
+    """Avisa (en el hilo de Tk) cuando el archivo de configuración cambia en disco.
+
+    En Linux usa inotify sobre el directorio con un manejador de archivo de Tk; en el resto,
+    o si inotify falla, consulta mtime/tamaño cada `poll_ms`. Las ráfagas de eventos se agrupan
+    en una sola comprobación y los cambios propios se ignoran llamando a `acknowledge()` tras
+    escribir el archivo.
+    """
+
+    SETTLE_MS = 150  # Espera tras el último evento antes de comprobar el archivo
+
+    def __init__(self, root, path, on_change, poll_ms=1000):
+        self.root = root
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.poll_ms = poll_ms
+        self._name = os.fsencode(os.path.basename(self.path))
+        self._known = _file_signature(self.path)
+        self._check_job = None
+        self._poll_job = None
+        self._fd = None
+        if hasattr(root.tk, "createfilehandler"):
+            self._fd = _open_inotify(os.path.dirname(self.path))
+        if self._fd is not None:
+            root.tk.createfilehandler(self._fd, tk.READABLE, self._on_inotify)
+        else:
+            self._poll_job = root.after(poll_ms, self._poll)
+
+    @property
+    def uses_inotify(self):
+        return self._fd is not None
+
+    def acknowledge(self):
+        """Toma el estado actual del archivo como conocido (p. ej. tras guardarlo nosotros)."""
+        self._known = _file_signature(self.path)
+
+    def stop(self):
+        for job in (self._check_job, self._poll_job):
+            if job is not None:
+                try:
+                    self.root.after_cancel(job)
+                except tk.TclError:
+                    pass
+        self._check_job = self._poll_job = None
+        if self._fd is not None:
+            try:
+                self.root.tk.deletefilehandler(self._fd)
+            except tk.TclError:
+                pass
+            os.close(self._fd)
+            self._fd = None
+
+    def _on_inotify(self, fd, mask):
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            return
+        offset, relevant = 0, False
+        while offset + _EVENT.size <= len(data):
+            _, _, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            relevant = relevant or name == self._name
+            offset += _EVENT.size + length
+        if relevant:
+            if self._check_job is not None:
+                self.root.after_cancel(self._check_job)
+            self._check_job = self.root.after(self.SETTLE_MS, self._check)
+
+    def _poll(self):
+        self._poll_job = self.root.after(self.poll_ms, self._poll)
+        self._check()
+
+    def _check(self):
+        self._check_job = None
+        signature = _file_signature(self.path)
+        if signature is None or signature == self._known:
+            return  # Sin cambios, o borrado a mitad de una sustitución: se espera al siguiente evento
+        self._known = signature
+        self.on_change(self.path)
+
+
+def _entry_key(entry):
+    return (entry.name, entry.program_path, entry.icon_path)
+
+
+def diff_entries(old_entries, new_entries):
+    """Calcula las operaciones para convertir `old_entries` en `new_entries`.
+
+    Devuelve una lista de (operación, índice, entrada nueva) con operación "add", "remove" o
+    "update", en un orden que se puede aplicar tal cual (de atrás hacia delante). Primero se
+    recortan el prefijo y el sufijo comunes, así un cambio puntual cuesta una pasada lineal.
+    """
+    old_keys = [_entry_key(e) for e in old_entries]
+    new_keys = [_entry_key(e) for e in new_entries]
+    start, old_end, new_end = 0, len(old_keys), len(new_keys)
+    while start < old_end and start < new_end and old_keys[start] == new_keys[start]:
+        start += 1
+    while old_end > start and new_end > start and old_keys[old_end - 1] == new_keys[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    matcher = difflib.SequenceMatcher(None, old_keys[start:old_end], new_keys[start:new_end], autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        i1, i2, j1, j2 = i1 + start, i2 + start, j1 + start, j2 + start
+        paired = min(i2 - i1, j2 - j1)
+        for k in range(j2 - j1 - 1, paired - 1, -1):
+            ops.append(("add", i1 + paired, new_entries[j1 + k]))
+        for k in range(i2 - i1 - 1, paired - 1, -1):
+            ops.append(("remove", i1 + k, None))
+        for k in range(paired - 1, -1, -1):
+            ops.append(("update", i1 + k, new_entries[j1 + k]))
+    return ops
+
+
+def apply_diff(store, ops):
+    """Aplica el resultado de `diff_entries` al EntryStore.
+
+    Devuelve (añadidas, eliminadas, modificadas); las entradas modificadas conservan su uid.
+    """
+    added, removed, updated = [], [], []
+    for op, index, new_entry in ops:
+        if op == "add":
+            store.insert(index, new_entry)
+            added.append(new_entry)
+        elif op == "remove":
+            removed.append(store.pop(index))
+        else:
+            entry = store[index]
+            store.update(entry, name=new_entry.name, program_path=new_entry.program_path,
+                         icon_path=new_entry.icon_path)
+            updated.append(entry)
+    return added, removed, updated
@@ -0,0 +1,296 @@
+import itertools
+import json
+import os
+import posixpath
+import re
+
+
+_uids = itertools.count(1)
+# Una línea de órdenes: el ejecutable (entre comillas o hasta su extensión) y los argumentos
+_COMMAND_LINE = re.compile(r'("[^"]*"|.*?\.(?:exe|bat|cmd|com|sh|py|pyw|appimage))(\s+.*)$', re.IGNORECASE | re.DOTALL)
+# Ajustes conocidos: (tipos admitidos, mínimo, máximo). Un valor que no encaja se descarta al
+# cargar y quien lo lee recibe el predeterminado; los ajustes desconocidos se conservan.
+_SETTING_RULES = {
+    "launch_debounce_ms": ((int, float), 0, 10000),
+    "icon_size": ((int,), 16, 256),
+    "autosave": ((bool,), None, None),
+    "usage_order": ((bool,), None, None),
+    "responsive_layout": ((bool,), None, None),
+}
+
+
+def normalize_path(path):
+    """Unifica separadores ('/'), colapsa '.' y '..' y conserva el sufijo ',índice' de los iconos.
+
+    Si la ruta lleva argumentos detrás del ejecutable ('C:\\App\\app.exe /ini C:\\x.ini'), solo se
+    normaliza el ejecutable; los argumentos se conservan tal cual.
+    """
+    if not path:
+        return ""
+    path = path.strip()
+    command = _COMMAND_LINE.fullmatch(path)
+    if command:
+        executable, arguments = command.groups()
+        if executable.startswith('"'):
+            return '"' + normalize_path(executable[1:-1]) + '"' + arguments
+        return normalize_path(executable) + arguments
+    path = path.replace("\\", "/")
+    suffix = ""
+    head, sep, tail = path.rpartition(",")
+    if sep and head and tail.strip().lstrip("-").isdigit():
+        path, suffix = head.rstrip(), "," + tail.strip()
+    return posixpath.normpath(path) + suffix
+
+
+def path_key(path):
+    """Clave de comparación para rutas ya normalizadas (sin distinguir mayúsculas en Windows)."""
+    return os.path.normcase(path) if path else ""
+
+
+def default_name(program_path):
+    command = _COMMAND_LINE.fullmatch(program_path)
+    if command:
+        program_path = command.group(1).strip('"')
+    return os.path.splitext(os.path.basename(program_path))[0]
+
+
+class ButtonEntry:
+    """Un botón del lanzador. Las rutas se guardan ya normalizadas."""
+
+    __slots__ = ("uid", "name", "program_path", "icon_path", "tk_icon_ref")
+
+    def __init__(self, name, program_path, icon_path=""):
+        self.uid = next(_uids)
+        self.program_path = normalize_path(program_path)
+        self.name = name if name else default_name(self.program_path)
+        self.icon_path = normalize_path(icon_path)
+        self.tk_icon_ref = None
+
+    @classmethod
+    def from_dict(cls, item):
+        return cls(item.get("name", ""), item["program_path"], item.get("icon_path", ""))
+
+    @classmethod
+    def from_normalized(cls, name, program_path, icon_path):
+        """Construye una entrada con campos ya normalizados (p. ej. desde la caché compilada)."""
+        entry = cls.__new__(cls)
+        entry.uid = next(_uids)
+        entry.name = name
+        entry.program_path = program_path
+        entry.icon_path = icon_path
+        entry.tk_icon_ref = None
+        return entry
+
+    def to_dict(self):
+        return {"name": self.name, "program_path": self.program_path, "icon_path": self.icon_path}
+
+    def __repr__(self):
+        return f"ButtonEntry({self.name!r}, {self.program_path!r}, {self.icon_path!r})"
+
+
+class EntryStore:
+    """Lista ordenada de ButtonEntry con índices secundarios por nombre, programa e icono.
+
+    Se comporta como una secuencia (len, iteración, índice) y mantiene los índices al día en
+    cada alta, baja o modificación, de modo que las búsquedas por clave (y la posición de una
+    entrada) son O(1). Los `listeners` reciben (evento, entrada, índice) con evento "add",
+    "remove" o "update"; el índice es la posición de la entrada (la que tenía, en el caso de
+    "remove"). `extend` avisa una sola vez con ("extend", lista de entradas, posición de la
+    primera).
+    """
+
+    def __init__(self, entries=()):
+        self._entries = []
+        self._by_uid = {}
+        self._positions = {}  # uid -> posición; None tras insertar o quitar en medio de la lista
+        self._by_name = {}
+        self._by_program = {}
+        self._by_icon = {}
+        self._unindexed = 0  # Entradas del final de la lista aún sin índices secundarios
+        self.listeners = []
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    def index(self, entry):
+        if self._positions is None:
+            self._positions = {e.uid: i for i, e in enumerate(self._entries)}
+        position = self._positions.get(entry.uid)
+        if position is None or self._entries[position] is not entry:
+            raise ValueError(f"{entry!r} no está en la lista")
+        return position
+
+    def get(self, uid):
+        return self._by_uid.get(uid)
+
+    def find_by_name(self, name):
+        self._ensure_indexed()
+        return list(self._by_name.get(name, {}).values())
+
+    def find_by_program(self, program_path):
+        self._ensure_indexed()
+        return list(self._by_program.get(path_key(normalize_path(program_path)), {}).values())
+
+    def users_of_icon(self, icon_path):
+        self._ensure_indexed()
+        return list(self._by_icon.get(path_key(normalize_path(icon_path)), {}).values())
+
+    def append(self, entry):
+        self.insert(len(self._entries), entry)
+
+    def insert(self, index, entry):
+        self._ensure_indexed()
+        index = max(0, min(index, len(self._entries)))
+        if self._positions is not None:
+            if index == len(self._entries):
+                self._positions[entry.uid] = index
+            else:
+                self._positions = None  # Las posiciones siguientes se desplazan: se recalculan al pedirlas
+        self._entries.insert(index, entry)
+        self._by_uid[entry.uid] = entry
+        self._index(entry)
+        self._notify("add", entry, index)
+
+    def extend(self, entries):
+        """Añade entradas en bloque. Los índices secundarios se construyen en la primera búsqueda
+        por clave en lugar de entrada a entrada."""
+        start = len(self._entries)
+        self._entries.extend(entries)
+        added = self._entries[start:]
+        self._by_uid.update((entry.uid, entry) for entry in added)
+        if self._positions is not None:
+            self._positions.update((entry.uid, start + i) for i, entry in enumerate(added))
+        self._unindexed += len(added)
+        if added and self.listeners:
+            self._notify("extend", added, start)
+
+    def pop(self, index=-1):
+        self._ensure_indexed()
+        position = index % len(self._entries) if self._entries else index
+        entry = self._entries.pop(index)
+        del self._by_uid[entry.uid]
+        if self._positions is not None:
+            if position == len(self._entries):
+                self._positions.pop(entry.uid, None)
+            else:
+                self._positions = None
+        self._unindex(entry)
+        if self.listeners:
+            self._notify("remove", entry, position)
+        return entry
+
+    def remove(self, entry):
+        self.pop(self.index(entry))
+
+    def update(self, entry, name=None, program_path=None, icon_path=None):
+        self._ensure_indexed()
+        self._unindex(entry)
+        if name is not None:
+            entry.name = name
+        if program_path is not None:
+            entry.program_path = normalize_path(program_path)
+        if icon_path is not None:
+            entry.icon_path = normalize_path(icon_path)
+        self._index(entry)
+        if self.listeners:
+            self._notify("update", entry, self.index(entry))
+
+    def to_json(self):
+        return [entry.to_dict() for entry in self._entries]
+
+    def _notify(self, event, entry, index):
+        for listener in self.listeners:
+            listener(event, entry, index)
+
+    def _ensure_indexed(self):
+        if self._unindexed:
+            pending, self._unindexed = self._entries[-self._unindexed:], 0
+            for entry in pending:
+                self._index(entry)
+
+    def _index(self, entry):
+        self._by_name.setdefault(entry.name, {})[entry.uid] = entry
+        self._by_program.setdefault(path_key(entry.program_path), {})[entry.uid] = entry
+        if entry.icon_path:
+            self._by_icon.setdefault(path_key(entry.icon_path), {})[entry.uid] = entry
+
+    def _unindex(self, entry):
+        for index, key in ((self._by_name, entry.name),
+                           (self._by_program, path_key(entry.program_path)),
+                           (self._by_icon, path_key(entry.icon_path))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(entry.uid, None)
+                if not bucket:
+                    del index[key]
+
+
+def clean_settings(settings):
+    """Copia de los ajustes sin los valores conocidos de tipo o rango no válido."""
+    if not isinstance(settings, dict):
+        return {}
+    clean = {}
+    for key, value in settings.items():
+        rule = _SETTING_RULES.get(key)
+        if rule is not None:
+            types, low, high = rule
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                continue
+            if low is not None and not low <= value <= high:  # NaN tampoco pasa
+                continue
+        clean[key] = value
+    return clean
+
+
+class LauncherConfig:
+    """Contenido de un archivo de configuración: botones, grupos de lanzamiento y ajustes.
+
+    Los archivos antiguos son una lista de botones; los nuevos un objeto
+    {"buttons": [...], "groups": [...], "settings": {...}}. Al guardar se conserva el formato
+    de lista mientras no haya grupos ni ajustes. Los ajustes se validan con `clean_settings`.
+    """
+
+    __slots__ = ("entries", "groups", "settings", "skipped")
+
+    def __init__(self, entries=None, groups=None, settings=None, skipped=0):
+        self.entries = entries if entries is not None else EntryStore()
+        self.groups = groups if groups is not None else []
+        self.settings = clean_settings(settings) if settings is not None else {}
+        self.skipped = skipped
+
+    @classmethod
+    def from_json(cls, data):
+        if isinstance(data, dict):
+            items = data.get("buttons", [])
+            groups = [g for g in data.get("groups", []) if isinstance(g, dict)]
+            settings = data.get("settings", {})
+        else:
+            items, groups, settings = data, [], {}
+        entries = [ButtonEntry.from_dict(item) for item in items
+                   if isinstance(item, dict) and "program_path" in item]
+        store = EntryStore()
+        store.extend(entries)
+        return cls(store, groups, settings, len(items) - len(entries))
+
+    def to_json(self):
+        buttons = self.entries.to_json()
+        if not self.groups and not self.settings:
+            return buttons
+        return {"buttons": buttons, "groups": self.groups, "settings": self.settings}
+
+
+def read_config(filepath):
+    """Lee un JSON de configuración y devuelve un LauncherConfig.
+
+    Las excepciones de lectura (OSError, json.JSONDecodeError) se propagan al llamador.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return LauncherConfig.from_json(json.load(f))
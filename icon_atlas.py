@@ -0,0 +1,104 @@
+import hashlib
+import tkinter as tk
+
+
+class AtlasRegion:
+    """Sub-región de la hoja de sprites que ocupa un icono."""
+
+    __slots__ = ("atlas", "slot", "x", "y", "size")
+
+    def __init__(self, atlas, slot, x, y, size):
+        self.atlas, self.slot, self.x, self.y, self.size = atlas, slot, x, y, size
+
+    def blit(self, photo):
+        """Copia la región en `photo` (un PhotoImage del tamaño del icono)."""
+        sheet = self.atlas.sheet
+        photo.tk.call(photo, "copy", sheet, "-from", self.x, self.y, self.x + self.size, self.y + self.size,
+                      "-to", 0, 0)
+
+
+class IconAtlas:
+    """Hoja de sprites única donde se empaquetan todos los iconos del mismo tamaño."""
+
+    def __init__(self, size, columns=32):
+        self.size = size
+        self.columns = columns
+        # Sin alto fijo: Tk amplía la hoja verticalmente al copiar más allá del borde
+        self.sheet = tk.PhotoImage(width=size * columns)
+        self._next_slot = 0
+        self._free_slots = []
+
+    def add(self, img):
+        from PIL import ImageTk
+
+        slot = self._free_slots.pop() if self._free_slots else self._next_slot
+        if slot == self._next_slot:
+            self._next_slot += 1
+        row, col = divmod(slot, self.columns)
+        x, y = col * self.size, row * self.size
+        staging = ImageTk.PhotoImage(img)  # Imagen temporal: se libera al salir de la función
+        self.sheet.tk.call(self.sheet, "copy", str(staging), "-to", x, y)
+        return AtlasRegion(self, slot, x, y, self.size)
+
+    def remove(self, region):
+        self._free_slots.append(region.slot)
+
+    def slots_in_use(self):
+        return self._next_slot - len(self._free_slots)
+
+
+class IconRegistry:
+    """Deduplica los iconos decodificados por hash de contenido.
+
+    Las entradas con píxeles idénticos comparten un único PhotoImage (o una única región del
+    atlas si `use_atlas` está activo). Cada `acquire` debe emparejarse con un `release`.
+    """
+
+    def __init__(self, size, use_atlas=False):
+        self.size = size
+        self.use_atlas = use_atlas
+        self.atlas = IconAtlas(size) if use_atlas else None
+        self._by_digest = {}  # digest -> [handle, referencias]
+        self._digest_of = {}  # id(handle) -> digest
+
+    def acquire(self, img):
+        from PIL import ImageTk
+
+        digest = hashlib.blake2b(img.tobytes(), digest_size=16, person=f"{img.width}x{img.height}".encode()).digest()
+        record = self._by_digest.get(digest)
+        if record is not None:
+            record[1] += 1
+            return record[0]
+        handle = self.atlas.add(img) if self.atlas is not None else ImageTk.PhotoImage(img)
+        self._by_digest[digest] = [handle, 1]
+        self._digest_of[id(handle)] = digest
+        return handle
+
+    def acquire_existing(self, handle):
+        self._by_digest[self._digest_of[id(handle)]][1] += 1
+
+    def release(self, handle):
+        if handle is None:
+            return
+        digest = self._digest_of.get(id(handle))
+        record = self._by_digest.get(digest)
+        if record is None or record[0] is not handle:
+            return
+        record[1] -= 1
+        if record[1] <= 0:
+            del self._by_digest[digest], self._digest_of[id(handle)]
+            if self.atlas is not None:
+                self.atlas.remove(handle)
+
+    def stats(self):
+        references = sum(refs for _, refs in self._by_digest.values())
+        unique = len(self._by_digest)
+        icon_bytes = self.size * self.size * 4
+        return {
+            "references": references,
+            "unique_images": unique,
+            "tk_images": 1 if self.atlas is not None else unique,
+            "decoded_bytes": unique * icon_bytes,
+            "bytes_without_dedup": references * icon_bytes,
+            "atlas_slots": self.atlas.slots_in_use() if self.atlas is not None else 0,
+        }
@@ -0,0 +1,201 @@
+import hashlib
+import io
+import os
+import struct
+import threading
+import zlib
+
+from metrics import metrics
+from pe_icons import extract_icon, is_pe_icon_spec, split_icon_spec
+
+
+# Cabecera: magia, versión, ancho, alto, longitud del payload comprimido, crc32 de los píxeles
+_HEADER = struct.Struct("<4sBHHII")
+_MAGIC = b"PLTC"
+_VERSION = 1
+_SUFFIX = ".thumb"
+
+
+def default_cache_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "program_launcher", "icons")
+
+
+class ThumbnailCache:
+    """Caché en disco de miniaturas RGBA ya redimensionadas, con expulsión LRU por tamaño."""
+
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Se calcula la primera vez que se necesita
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.enabled = True
+        except OSError:
+            self.enabled = False
+
+    def key_for(self, icon_path, size):
+        # 'programa.exe,1' se valida con el propio ejecutable; el índice forma parte de la clave
+        try:
+            st = os.stat(split_icon_spec(icon_path)[0])
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(icon_path)}|{st.st_mtime_ns}|{st.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _path_for(self, key):
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
+
+    def get(self, key):
+        """Devuelve (ancho, alto, píxeles RGBA) o None. Las entradas corruptas se eliminan."""
+        if not self.enabled or not key:
+            return None
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        try:
+            magic, version, width, height, length, crc = _HEADER.unpack_from(blob)
+            if magic != _MAGIC or version != _VERSION or len(blob) != _HEADER.size + length:
+                raise ValueError("cabecera inválida")
+            pixels = zlib.decompress(blob[_HEADER.size:])
+            if len(pixels) != width * height * 4 or zlib.crc32(pixels) != crc:
+                raise ValueError("datos corruptos")
+        except (struct.error, ValueError, zlib.error):
+            self._discard(path, len(blob))
+            return None
+        try:
+            os.utime(path)  # Marca de uso para el LRU
+        except OSError:
+            pass
+        return width, height, pixels
+
+    def put(self, key, width, height, pixels):
+        if not self.enabled or not key:
+            return
+        payload = zlib.compress(pixels, 6)
+        blob = _HEADER.pack(_MAGIC, _VERSION, width, height, len(payload), zlib.crc32(pixels)) + payload
+        path = self._path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            with self._lock:
+                # Si la clave ya existía, su archivo anterior deja de contar en el total
+                try:
+                    previous = os.stat(path).st_size
+                except OSError:
+                    previous = 0
+                os.replace(tmp_path, path)
+                if self._total_bytes is not None:
+                    self._total_bytes += len(blob) - previous
+        except OSError:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            return
+        self._evict_if_needed()
+
+    def clear(self):
+        for path, _, _ in self._scan():
+            try: os.remove(path)
+            except OSError: pass
+        with self._lock:
+            self._total_bytes = 0
+
+    def _discard(self, path, size):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def _scan(self):
+        entries = []
+        try:
+            subdirs = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for sub in subdirs:
+            if not sub.is_dir():
+                continue
+            try:
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(_SUFFIX):
+                        st = entry.stat()
+                        entries.append((entry.path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        return entries
+
+    def _evict_if_needed(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, _, size in self._scan())
+            if self._total_bytes <= self.max_bytes:
+                return
+            # Se expulsan las más antiguas hasta quedar al 90% del límite
+            target = self.max_bytes * 9 // 10
+            for path, _, size in sorted(self._scan(), key=lambda e: e[1]):
+                if self._total_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                    self._total_bytes -= size
+                except OSError:
+                    pass
+
+
+def _best_ico_size(sizes, size):
+    """El tamaño embebido más pequeño que cubre `size`; si ninguno llega, el mayor."""
+    covering = [s for s in sizes if s[0] >= size[0] and s[1] >= size[1]]
+    if covering:
+        return min(covering, key=lambda s: s[0] * s[1])
+    return max(sizes, key=lambda s: s[0] * s[1])
+
+
+def _open_for_size(source, size):
+    """Abre la imagen decodificando lo mínimo para obtener `size` píxeles."""
+    from PIL import Image
+
+    img = Image.open(source)
+    if img.format == "ICO" and img.info.get("sizes"):
+        # Solo se decodifica la imagen embebida más cercana; la mayor ya es la que abre PIL
+        best = _best_ico_size(img.info["sizes"], size)
+        return img if best == img.size else img.ico.getimage(best)
+    if img.format == "JPEG":
+        img.draft("RGB", size)  # Decodificación DCT a 1/2, 1/4 u 1/8 sin bajar de `size`
+    elif getattr(img, 'is_animated', False) or (hasattr(img, 'n_frames') and img.n_frames > 1):
+        img.seek(0)
+    return img
+
+
+def load_thumbnail(icon_path, size, cache=None):
+    """Devuelve una imagen PIL RGBA de `size` píxeles, usando la caché si está disponible."""
+    from PIL import Image
+
+    key = cache.key_for(icon_path, size) if cache else None
+    cached = cache.get(key) if key else None
+    if cached:
+        metrics.inc("thumbnail_cache_hits")
+        width, height, pixels = cached
+        return Image.frombytes("RGBA", (width, height), pixels)
+
+    metrics.inc("thumbnail_cache_misses")
+    path, index = split_icon_spec(icon_path)
+    if is_pe_icon_spec(icon_path):
+        img = _open_for_size(io.BytesIO(extract_icon(path, index or 0)), size)
+    else:
+        img = _open_for_size(path, size)
+    img = img.convert("RGBA")
+    if img.size != tuple(size):
+        img = img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+    if key:
+        cache.put(key, img.width, img.height, img.tobytes())
+    return img
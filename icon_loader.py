@@ -0,0 +1,78 @@
+import queue
+import time
+
+
+class AsyncIconLoader:
+    """Decodifica iconos en un pool de hilos y entrega los PhotoImage en el hilo de Tk.
+
+    `prepare(icon_path)` se ejecuta en los hilos de trabajo y debe devolver una imagen PIL
+    (o None); `materialize(img)` la convierte en el hilo principal (por defecto en un PhotoImage)
+    y `on_ready(results)` recibe una lista de (token, resultado).
+    """
+
+    POLL_MS = 15
+    DRAIN_BUDGET_S = 0.008  # Tiempo máximo por tanda para no bloquear la interfaz
+
+    def __init__(self, root, prepare, on_ready, materialize=None, max_workers=4):
+        self.root = root
+        self.prepare = prepare
+        self.on_ready = on_ready
+        self.materialize = materialize
+        self.max_workers = max_workers
+        self._executor = None  # Se crea con la primera petición: sin iconos no hay hilos
+        self._results = queue.SimpleQueue()
+        self._generation = 0
+        self._futures = set()
+        self._poll_job = None
+
+    def request(self, token, icon_path):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="icon-loader")
+        generation = self._generation
+        future = self._executor.submit(self._work, generation, token, icon_path)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        """Descarta todas las cargas pendientes (p. ej. al abrir otra configuración)."""
+        self._generation += 1
+        for future in list(self._futures):
+            future.cancel()
+
+    def pending(self):
+        return bool(self._futures) or not self._results.empty()
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _work(self, generation, token, icon_path):
+        if generation != self._generation:
+            return
+        self._results.put((generation, token, self.prepare(icon_path)))
+
+    def _poll(self):
+        if self.materialize is None:
+            from PIL import ImageTk
+            self.materialize = ImageTk.PhotoImage
+
+        self._poll_job = None
+        ready = []
+        deadline = time.perf_counter() + self.DRAIN_BUDGET_S
+        while time.perf_counter() < deadline:
+            try:
+                generation, token, img = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                continue
+            # Los fallos se entregan como None para que el llamador deje de esperarlos
+            ready.append((token, self.materialize(img) if img is not None else None))
+        if ready:
+            self.on_ready(ready)
+        if self.pending():
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
@@ -0,0 +1,190 @@
+import math
+import time
+
+
+DEFAULT_CONCURRENCY = 3
+DEFAULT_SETTLE_S = 1.5  # Tiempo que un miembro recién lanzado ocupa un hueco de concurrencia
+
+
+def _number(value, default, convert=float):
+    """Convierte un valor leído del JSON; si no es un número finito devuelve `default`."""
+    try:
+        number = convert(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+    return number if math.isfinite(number) else default
+
+
+class GroupMember:
+    """Un botón dentro de un grupo; `after` es la clave del miembro que debe arrancar antes y
+    `delay` la espera.
+
+    Los nombres de botón pueden repetirse, así que el miembro guarda también la ruta del
+    programa (`path`) y se identifica por ella (`key`). Los grupos antiguos sin ruta se
+    identifican por el nombre y solo se resuelven si ningún otro botón se llama igual.
+    """
+
+    __slots__ = ("button", "path", "after", "delay")
+
+    def __init__(self, button, path=None, after=None, delay=0.0):
+        self.button = button
+        self.path = path or None
+        self.after = after or None
+        self.delay = max(0.0, float(delay or 0.0))
+
+    @property
+    def key(self):
+        return self.path or self.button
+
+    def resolve(self, store):
+        """Entrada que lanza este miembro, o None si no existe o su nombre es ambiguo."""
+        if self.path:
+            matches = store.find_by_program(self.path)
+            if matches:
+                return next((e for e in matches if e.name == self.button), matches[0])
+        matches = store.find_by_name(self.button)
+        return matches[0] if len(matches) == 1 else None
+
+    @classmethod
+    def from_dict(cls, data):
+        path, after = data.get("path"), data.get("after")
+        return cls(str(data["button"]), str(path) if path else None, str(after) if after else None,
+                   _number(data.get("delay", 0.0), 0.0))
+
+    def to_dict(self):
+        data = {"button": self.button}
+        if self.path:
+            data["path"] = self.path
+        if self.after:
+            data["after"] = self.after
+        if self.delay:
+            data["delay"] = self.delay
+        return data
+
+
+class LaunchGroup:
+    __slots__ = ("name", "members", "concurrency", "settle")
+
+    def __init__(self, name, members, concurrency=DEFAULT_CONCURRENCY, settle=DEFAULT_SETTLE_S):
+        self.name = name
+        self.members = members
+        self.concurrency = max(1, int(concurrency))
+        self.settle = max(0.0, float(settle))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construye un grupo desde el JSON; los miembros mal formados se descartan y los
+        valores numéricos no válidos se sustituyen por los predeterminados."""
+        raw_members = data.get("members", [])
+        members = [GroupMember.from_dict(m) for m in raw_members if isinstance(m, dict) and "button" in m] \
+            if isinstance(raw_members, list) else []
+        return cls(str(data.get("name", "Grupo")), members,
+                   _number(data.get("concurrency", DEFAULT_CONCURRENCY), DEFAULT_CONCURRENCY, int),
+                   _number(data.get("settle", DEFAULT_SETTLE_S), DEFAULT_SETTLE_S))
+
+    def to_dict(self):
+        data = {"name": self.name, "members": [m.to_dict() for m in self.members],
+                "concurrency": self.concurrency}
+        if self.settle != DEFAULT_SETTLE_S:
+            data["settle"] = self.settle
+        return data
+
+
+def parse_groups(raw_groups):
+    """Grupos de la configuración; se omiten las entradas que no son objetos o no tienen miembros."""
+    groups = [LaunchGroup.from_dict(g) for g in raw_groups if isinstance(g, dict)]
+    return [g for g in groups if g.members]
+
+
+class GroupRun:
+    """Planificador de un arranque de grupo.
+
+    Como máximo `concurrency` miembros pueden estar en su ventana de arranque (`settle`
+    segundos tras lanzarse) a la vez; un miembro con `after` espera a que ese miembro se haya
+    lanzado y a que pase su `delay` (sin `after`, el retraso cuenta desde el inicio del grupo).
+    Las dependencias a miembros que no están en el grupo se ignoran, y si las restantes forman
+    un ciclo se rompe lanzando los miembros bloqueados en su orden.
+    """
+
+    def __init__(self, group, now=None):
+        self.group = group
+        self.started_at = time.monotonic() if now is None else now
+        self.pending = list(group.members)
+        self._keys = {m.key for m in group.members}
+        self._launched = {}  # clave del miembro -> instante de lanzamiento
+        self._in_flight = []  # instantes en que se libera cada hueco
+        self._ignore_after = False
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def _release_time(self, member):
+        if member.after and member.after in self._keys and not self._ignore_after:
+            launched = self._launched.get(member.after)
+            return None if launched is None else launched + member.delay
+        return self.started_at + member.delay
+
+    def ready(self, now):
+        """Devuelve los miembros que pueden lanzarse ya y los marca como lanzados."""
+        self._in_flight = [t for t in self._in_flight if t > now]
+        slots = self.group.concurrency - len(self._in_flight)
+        ready = []
+        for member in list(self.pending):
+            if slots <= 0:
+                break
+            release = self._release_time(member)
+            if release is None or release > now:
+                continue
+            self.pending.remove(member)
+            ready.append(member)
+            slots -= 1
+        if not ready and not self._in_flight and self.pending and \
+                all(self._release_time(m) is None for m in self.pending):
+            self._ignore_after = True
+            return self.ready(now)
+        for member in ready:
+            self._launched.setdefault(member.key, now)
+            self._in_flight.append(now + self.group.settle)
+        return ready
+
+    def next_wakeup(self, now):
+        """Segundos hasta que pueda haber algo nuevo que lanzar (None si el grupo terminó)."""
+        if self.done:
+            return None
+        candidates = [t for t in self._in_flight if t > now]
+        for member in self.pending:
+            release = self._release_time(member)
+            if release is not None and release > now:
+                candidates.append(release)
+        return max(0.0, min(candidates) - now) if candidates else 0.05
+
+
+def run_group_blocking(group, launch):
+    """Ejecuta un grupo en el hilo actual (modo sin interfaz). `launch(miembro)` lanza cada uno."""
+    run = GroupRun(group)
+    while not run.done:
+        now = time.monotonic()
+        for member in run.ready(now):
+            launch(member)
+        wait = run.next_wakeup(time.monotonic())
+        if wait:
+            time.sleep(wait)
+
+
+class Debouncer:
+    """Ignora repeticiones de la misma clave dentro de `window_s` segundos."""
+
+    def __init__(self, window_s=0.8):
+        self.window_s = window_s
+        self._last = {}
+
+    def allow(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        last = self._last.get(key)
+        if last is not None and now - last < self.window_s:
+            return False
+        self._last[key] = now
+        if len(self._last) > 256:
+            self._last = {k: t for k, t in self._last.items() if now - t < self.window_s}
+        return True
@@ -0,0 +1,75 @@
+"""Cliente mínimo del lanzador residente.
+
+Uso: python launcher_client.py launch <nombre> | group <nombre> | list | ps | metrics | reload | show | open <config.json>
+
+No importa Tk ni PIL: se conecta al socket local de la instancia en marcha (la interfaz
+gráfica o `launcher_daemon.py`), envía una orden y muestra la respuesta.
+"""
+import os
+import socket
+import stat
+import sys
+
+
+def socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "program_launcher.sock")
+    return os.path.join(_private_tmp_dir(), "program_launcher.sock")
+
+
+def _private_tmp_dir():
+    """Directorio 0700 del usuario en TMPDIR. Lanza OSError si existe y no es solo suyo."""
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    path = os.path.join(os.environ.get("TMPDIR", "/tmp"), f"program_launcher-{uid}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or (hasattr(os, "getuid") and info.st_uid != uid) or info.st_mode & 0o077:
+        raise OSError(f"{path} no es un directorio privado de este usuario")
+    return path
+
+
+def send_command(command, timeout=5.0):
+    """Envía una orden y devuelve (ok, líneas). Lanza OSError si no hay instancia escuchando."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Sockets Unix no disponibles en esta plataforma")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path())
+        sock.sendall(command.encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    if not lines:
+        return False, ["Respuesta vacía"]
+    status, _, message = lines[0].partition(" ")
+    body = lines[1:]
+    if message:
+        body.insert(0, message)
+    return status == "OK", body
+
+
+def main(argv):
+    if not argv:
+        print(__doc__.strip().splitlines()[2], file=sys.stderr)
+        return 2
+    try:
+        ok, lines = send_command(" ".join(argv))
+    except OSError as e:
+        print(f"No hay ningún lanzador en marcha ({e})", file=sys.stderr)
+        return 1
+    for line in lines:
+        print(line, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,229 @@
+"""Lanzador residente sin interfaz gráfica.
+
+Uso: python launcher_daemon.py <config.json>
+
+Carga la configuración una sola vez y atiende las órdenes de `launcher_client.py`
+(launch <nombre>, group <nombre>, list, ps, reload, metrics) por un socket Unix local. No importa
+Tk ni PIL. Las métricas se registran si PROGRAM_LAUNCHER_METRICS está definida.
+"""
+import os
+import signal
+import socket
+import sys
+import threading
+
+from config_cache import load_config
+from config_journal import ConfigJournal
+from entries import path_key
+from launcher_client import send_command, socket_path
+from process_supervisor import ProcessSupervisor
+from launch_groups import Debouncer, parse_groups, run_group_blocking
+from metrics import metrics
+from quick_search import SearchIndex
+
+
+def resolve_entry(store, search_index, name):
+    """Busca una entrada por nombre exacto, luego sin distinguir mayúsculas y por último difusa."""
+    matches = store.find_by_name(name)
+    if matches:
+        return matches[0]
+    folded = name.casefold()
+    for entry in store:
+        if entry.name.casefold() == folded:
+            return entry
+    hits = search_index.search(name, limit=1)
+    return hits[0] if hits else None
+
+
+def list_lines(store):
+    return [f"{entry.name}\t{entry.program_path}" for entry in store]
+
+
+def process_lines(supervisor):
+    lines = []
+    for record in supervisor.records():
+        state = "vivo" if record.running else f"salió ({record.exit_code})"
+        rss = f"\t{record.rss_bytes // 1024} KiB" if record.running and record.rss_bytes else ""
+        lines.append(f"{record.pid}\t{record.name}\t{state}\t{record.lifetime:.0f} s{rss}")
+    return lines
+
+
+class CommandServer:
+    """Escucha órdenes de una línea en el socket local y las pasa a `handler(verbo, argumento)`.
+
+    El handler devuelve (ok, líneas); se ejecuta en el hilo del servidor.
+    """
+
+    MAX_REQUEST = 64 * 1024
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.path = None
+        self._sock = None
+        self._thread = None
+
+    def start(self, background=True):
+        """Devuelve False si ya hay otra instancia escuchando o la plataforma no lo permite."""
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        try:
+            self.path = socket_path()
+        except OSError:
+            return False
+        try:
+            send_command("ping", timeout=0.5)
+            return False
+        except OSError:
+            pass
+        try:
+            os.unlink(self.path)  # Socket huérfano de una instancia anterior
+        except OSError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.path)
+            os.chmod(self.path, 0o600)
+            sock.listen(8)
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        if background:
+            self._thread = threading.Thread(target=self.serve_forever, name="launcher-server", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        if self._sock is None:
+            return
+        sock, self._sock = self._sock, None
+        sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def serve_forever(self):
+        while self._sock is not None:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    self._handle_connection(conn)
+                except OSError:
+                    pass
+
+    def _handle_connection(self, conn):
+        conn.settimeout(5.0)
+        data = b""
+        while b"\n" not in data and len(data) < self.MAX_REQUEST:
+            chunk = conn.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+        verb, _, argument = data.decode("utf-8", "replace").strip().partition(" ")
+        if verb == "ping":
+            ok, lines = True, ["pong"]
+        else:
+            try:
+                ok, lines = self.handler(verb, argument.strip())
+            except Exception as e:
+                ok, lines = False, [f"Error interno: {e}"]
+        status = "OK" if ok else "ERROR"
+        conn.sendall("\n".join([status] + list(lines)).encode("utf-8") + b"\n")
+
+
+class HeadlessLauncher:
+    def __init__(self, config_file):
+        self.config_file = config_file
+        self.search_index = SearchIndex()
+        self.supervisor = ProcessSupervisor()
+        self.debouncer = Debouncer()
+        self.reload()
+
+    def reload(self):
+        config = load_config(self.config_file)
+        # Cambios de la interfaz aún sin compactar; el diario es suyo, aquí solo se lee
+        ConfigJournal(self.config_file).replay(config, read_only=True)
+        self.store, self.groups = config.entries, parse_groups(config.groups)
+        self.debouncer.window_s = config.settings.get("launch_debounce_ms", 800) / 1000
+        self.search_index.rebuild(self.store)
+        self.search_index.index_pending()  # Sin bucle ocioso que indexe por tandas: se indexa ya
+        return config.skipped
+
+    def _launch(self, entry):
+        if not self.debouncer.allow(path_key(entry.program_path)):
+            return False
+        self.supervisor.launch(entry.program_path, entry.name)
+        return True
+
+    def _launch_member(self, member):
+        entry = member.resolve(self.store)
+        if entry is None:
+            print(f"Botón del grupo no encontrado o con nombre repetido: {member.button}", file=sys.stderr)
+            return
+        try:
+            self._launch(entry)
+        except OSError as e:
+            print(f"No se pudo lanzar {entry.program_path}: {e}", file=sys.stderr)
+
+    def handle(self, verb, argument):
+        if verb == "launch":
+            entry = resolve_entry(self.store, self.search_index, argument)
+            if entry is None:
+                return False, [f"No hay ningún botón llamado '{argument}'"]
+            try:
+                launched = self._launch(entry)
+            except OSError as e:
+                return False, [f"No se pudo lanzar el programa: {entry.program_path}", str(e)]
+            return True, [f"Lanzado: {entry.name}" if launched else f"Ignorado (lanzado hace un momento): {entry.name}"]
+        if verb == "list":
+            return True, list_lines(self.store)
+        if verb == "ps":
+            return True, process_lines(self.supervisor)
+        if verb == "metrics":
+            return True, metrics.prometheus_text().splitlines()
+        if verb == "group":
+            group = next((g for g in self.groups if g.name == argument), None)
+            if group is None:
+                return False, [f"No hay ningún grupo llamado '{argument}'"]
+            threading.Thread(target=run_group_blocking, args=(group, self._launch_member),
+                             name="launch-group", daemon=True).start()
+            return True, [f"Grupo en marcha: {group.name}"]
+        if verb == "reload":
+            try:
+                skipped = self.reload()
+            except (OSError, ValueError) as e:
+                return False, [f"No se pudo recargar {self.config_file}: {e}"]
+            return True, [f"{len(self.store)} botones cargados ({skipped} omitidos)"]
+        return False, [f"Orden desconocida: {verb}"]
+
+
+def main(argv):
+    if len(argv) != 1:
+        print(__doc__.strip().splitlines()[2], file=sys.stderr)
+        return 2
+    try:
+        launcher = HeadlessLauncher(argv[0])
+    except (OSError, ValueError) as e:
+        print(f"No se pudo leer la configuración {argv[0]}: {e}", file=sys.stderr)
+        return 1
+    server = CommandServer(launcher.handle)
+    if not server.start(background=False):
+        print("Ya hay un lanzador en marcha (o la plataforma no admite sockets Unix).", file=sys.stderr)
+        return 1
+    print(f"Escuchando en {server.path} con {len(launcher.store)} botones")
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,22 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Devuelve el módulo `name` sin ejecutarlo hasta el primer acceso a uno de sus atributos.
+
+    Sirve para dependencias que solo hacen falta en algunas acciones (diálogos, PIL...) y que
+    no deben retrasar el arranque. Si el módulo ya estaba importado se devuelve tal cual.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
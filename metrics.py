@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+
+
+# Límites superiores de los cubos de latencia, en milisegundos
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Histograma de latencias con cubos fijos (acumula en ms)."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # El último cubo es +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, ms):
+        index = 0
+        while index < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def percentile(self, fraction):
+        """Estimación (límite superior del cubo, sin pasar del máximo) del percentil `fraction` (0-1)."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(LATENCY_BUCKETS_MS[index], self.max) if index < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "sum_ms": round(self.total, 3),
+                "min_ms": self.min, "max_ms": self.max,
+                "p50_ms": self.percentile(0.5), "p95_ms": self.percentile(0.95),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"], self.counts))}
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class Metrics:
+    """Contadores e histogramas de latencia de las rutas críticas.
+
+    Desactivado (por defecto), `timer()` devuelve un contexto vacío compartido y `inc()` /
+    `observe()` retornan en la primera comparación, así que las sondas apenas cuestan. Es
+    seguro usarlo desde los hilos de trabajo.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name, ms):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def timer(self, name):
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {"time": time.time(), "since": self.started_at,
+                    "counters": dict(self._counters),
+                    "histograms": {name: h.to_dict() for name, h in self._histograms.items()}}
+
+    def export_jsonl(self, path):
+        """Añade una línea con la instantánea actual al archivo JSONL."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def prometheus_text(self, prefix="program_launcher"):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((name, list(h.counts), h.count, h.total) for name, h in self._histograms.items())
+        lines = []
+        for name, value in counters:
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        for name, counts, count, total in histograms:
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS_MS, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum {total / 1000:.6f}")
+            lines.append(f"{metric}_count {count}")
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path):
+        """Escribe el archivo de texto de Prometheus (formato del textfile collector) de forma atómica."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def export(self, path):
+        """Exporta según la extensión: `.prom` en formato Prometheus, cualquier otra como JSONL."""
+        if path.endswith(".prom"):
+            self.export_prometheus(path)
+        else:
+            self.export_jsonl(path)
+
+
+# Registro compartido por todos los módulos; se activa con --metrics o desde la ventana de métricas
+metrics = Metrics(enabled=bool(os.environ.get("PROGRAM_LAUNCHER_METRICS")))
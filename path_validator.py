@@ -0,0 +1,194 @@
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+
+from metrics import metrics
+
+
+def _command_line_exists(command):
+    # Como CreateProcess: el ejecutable va entre comillas o es el primer prefijo que existe
+    if command.startswith('"'):
+        end = command.find('"', 1)
+        candidates = [command[1:end]] if end > 0 else []
+    else:
+        candidates = [command[:i] for i, char in enumerate(command) if char == " "]
+    return any(os.path.isfile(c) or os.path.isfile(c + ".exe") for c in candidates)
+
+
+def probe_path(path):
+    """True si el programa o archivo existe, False si no, None si no se puede saber.
+
+    Las rutas absolutas se comprueban con stat. Los nombres sueltos ("python3", "notepad.exe")
+    se buscan en el PATH, como hace Popen; si no aparecen, o la ruta es relativa, el resultado
+    es desconocido. En Windows una ruta absoluta puede llevar argumentos detrás
+    ("C:/App/app.exe --min"): basta con que exista el ejecutable del principio.
+    """
+    if not os.path.isabs(path):
+        import shutil  # En el hilo de comprobación, no durante el arranque
+        return True if shutil.which(path) else None
+    try:
+        os.stat(path)
+        return True
+    except (OSError, ValueError):
+        pass
+    if os.name == "nt" and " " in path:
+        return _command_line_exists(path)
+    return False
+
+
+class PathValidator:
+    """Comprueba en segundo plano si existen las rutas de programas e iconos.
+
+    Cada ruta se consulta con `probe_path` en hilos propios; el hilo de Tk solo lee el resultado
+    guardado con `status()`, nunca espera a un stat. Si una consulta no responde en `timeout_s`
+    (una unidad de red desconectada) la ruta se da por no disponible sin esperar al hilo, y se
+    arranca otro para que el resto de comprobaciones no se quede atascado detrás. Los resultados
+    valen `ttl_s` segundos; pasado ese tiempo se vuelven a comprobar en segundo plano las rutas
+    que sigue devolviendo `live_paths()` (las demás se olvidan). `on_change(changes)` recibe en
+    el hilo de Tk una lista de (ruta, disponible) con las rutas cuyo estado cambió.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root, on_change, live_paths=None, max_workers=8, timeout_s=2.0, ttl_s=60.0):
+        self.root = root
+        self.on_change = on_change
+        self.live_paths = live_paths
+        self.max_workers = max_workers
+        self.timeout_s = timeout_s
+        self.ttl_s = ttl_s
+        self._status = {}    # ruta -> (True/False/None, instante de la comprobación)
+        self._inflight = {}  # ruta -> instante de envío
+        self._timed_out = set()  # (generación, ruta) en vuelo ya dadas por no disponibles
+        self._requests = queue.SimpleQueue()
+        self._results = queue.SimpleQueue()
+        self._workers = 0
+        self._hung = 0  # Hilos bloqueados en un stat que superó el tiempo límite
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._poll_job = None
+        self._refresh_job = None
+
+    def status(self, path):
+        """True/False según la última comprobación; None si aún no se ha comprobado o no se sabe."""
+        known = self._status.get(path)
+        return None if known is None else known[0]
+
+    def check(self, paths, force=False):
+        """Encola las rutas sin resultado reciente (o todas con `force`) que no estén ya en curso."""
+        now = time.monotonic()
+        submitted = False
+        for path in paths:
+            if not path or path in self._inflight:
+                continue
+            known = self._status.get(path)
+            if not force and known is not None and now - known[1] < self.ttl_s:
+                continue
+            self._inflight[path] = now
+            self._requests.put((self._generation, path))
+            submitted = True
+        if submitted:
+            self._ensure_workers()
+            if self._poll_job is None:
+                self._poll_job = self.root.after(self.POLL_MS, self._poll)
+        if self._refresh_job is None and (self._status or submitted):
+            self._schedule_refresh()
+
+    def clear(self):
+        """Olvida todas las rutas (p. ej. al abrir otra configuración); descarta lo que esté en curso."""
+        self._generation += 1
+        self._status.clear()
+        self._inflight.clear()
+
+    def pending(self):
+        return bool(self._inflight)
+
+    def shutdown(self):
+        self.clear()
+        for job in (self._poll_job, self._refresh_job):
+            if job is not None:
+                try:
+                    self.root.after_cancel(job)
+                except tk.TclError:
+                    pass
+        self._poll_job = self._refresh_job = None
+        with self._lock:
+            workers = self._workers
+        for _ in range(workers):
+            self._requests.put(None)
+
+    def _ensure_workers(self):
+        with self._lock:
+            wanted = min(self.max_workers + self._hung, 2 * self.max_workers)
+            missing = wanted - self._workers
+            self._workers += max(0, missing)
+        for _ in range(missing):
+            # Hilos daemon: un stat colgado en una unidad de red no debe impedir salir del programa
+            threading.Thread(target=self._worker, name="path-validator", daemon=True).start()
+
+    def _worker(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            generation, path = request
+            if generation != self._generation:
+                continue
+            start = time.perf_counter()
+            available = probe_path(path)
+            metrics.observe("path_check", (time.perf_counter() - start) * 1000)
+            self._results.put((generation, path, available))
+        with self._lock:
+            self._workers -= 1
+
+    def _poll(self):
+        self._poll_job = None
+        changes = []
+        now = time.monotonic()
+        while True:
+            try:
+                generation, path, available = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if (generation, path) in self._timed_out:
+                self._timed_out.discard((generation, path))
+                with self._lock:
+                    self._hung -= 1
+            if generation != self._generation:
+                continue
+            self._inflight.pop(path, None)
+            self._store(path, available, now, changes)
+        for path, sent in list(self._inflight.items()):
+            key = (self._generation, path)
+            if key not in self._timed_out and now - sent > self.timeout_s:
+                # El hilo sigue esperando al sistema; su resultado tardío actualizará la ruta
+                self._timed_out.add(key)
+                metrics.inc("path_check_timeouts")
+                with self._lock:
+                    self._hung += 1
+                self._store(path, False, now, changes)
+                self._ensure_workers()
+        if changes:
+            self.on_change(changes)
+        if self._inflight:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def _store(self, path, available, now, changes):
+        previous = self._status.get(path)
+        self._status[path] = (available, now)
+        if previous is None or previous[0] != available:
+            changes.append((path, available))
+
+    def _schedule_refresh(self):
+        self._refresh_job = self.root.after(int(self.ttl_s * 1000), self._refresh)
+
+    def _refresh(self):
+        self._refresh_job = None
+        if self.live_paths is not None:
+            live = set(self.live_paths())
+            for path in [p for p in self._status if p not in live]:
+                del self._status[path]
+        if self._status:
+            self.check(list(self._status))
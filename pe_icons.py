@@ -0,0 +1,176 @@
+import mmap
+import os
+import struct
+
+
+RT_ICON = 3
+RT_GROUP_ICON = 14
+PE_SUFFIXES = (".exe", ".dll", ".cpl", ".scr", ".ocx", ".icl")
+
+_GRP_HEADER = struct.Struct("<HHH")          # reservado, tipo, número de imágenes
+_GRP_ENTRY = struct.Struct("<BBBBHHIH")      # ancho, alto, colores, reservado, planos, bits, bytes, id
+_ICO_ENTRY = struct.Struct("<BBBBHHII")      # igual que el anterior pero con el desplazamiento en el .ico
+_DATA_ENTRY = struct.Struct("<IIII")         # RVA, tamaño, página de códigos, reservado
+_DIR_HEADER = struct.Struct("<IIHHHH")
+_DIR_ENTRY = struct.Struct("<II")
+_SECTION = struct.Struct("<8sIIII")          # nombre, tamaño virtual, RVA, tamaño en disco, posición en disco
+
+
+class PEIconError(ValueError):
+    """El archivo no es un PE válido o no contiene el icono pedido."""
+
+
+def split_icon_spec(icon_path):
+    """Separa 'archivo,índice' en (archivo, índice). Sin sufijo, el índice es None.
+
+    Como en Windows, un índice negativo es el identificador de recurso del grupo de iconos.
+    """
+    head, sep, tail = icon_path.rpartition(",")
+    if sep and head and tail.strip().lstrip("-").isdigit():
+        return head.rstrip(), int(tail)
+    return icon_path, None
+
+
+def is_pe_icon_spec(icon_path):
+    """True si la ruta se refiere a un icono dentro de un ejecutable o biblioteca.
+
+    Decide la extensión; con otra extensión, un índice ('icono.ico,0') solo cuenta si el archivo
+    empieza por la cabecera MZ. Si no, el índice se ignora y el archivo es una imagen normal.
+    """
+    path, index = split_icon_spec(icon_path)
+    if path.lower().endswith(PE_SUFFIXES):
+        return True
+    if index is None:
+        return False
+    try:
+        with open(path, "rb") as f:
+            return f.read(2) == b"MZ"
+    except OSError:
+        return False
+
+
+class _ResourceReader:
+    """Lee el directorio de recursos de un PE proyectado en memoria.
+
+    Solo se tocan las cabeceras, el árbol de recursos y los bytes de los iconos pedidos, así
+    que el sistema operativo no lee del disco el resto del binario.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        try:
+            if view[:2] != b"MZ":
+                raise PEIconError("falta la cabecera MZ")
+            pe_offset = struct.unpack_from("<I", view, 0x3C)[0]
+            if view[pe_offset:pe_offset + 4] != b"PE\0\0":
+                raise PEIconError("falta la firma PE")
+            sections, optional_size = struct.unpack_from("<H12xH", view, pe_offset + 6)
+            optional = pe_offset + 24
+            magic = struct.unpack_from("<H", view, optional)[0]
+            if magic == 0x10B:
+                directories = optional + 96
+            elif magic == 0x20B:
+                directories = optional + 112
+            else:
+                raise PEIconError(f"cabecera opcional desconocida ({magic:#x})")
+            if directories + 3 * 8 > optional + optional_size:
+                raise PEIconError("el PE no tiene directorio de recursos")
+            self.resource_rva = struct.unpack_from("<II", view, directories + 2 * 8)[0]
+            table = optional + optional_size
+            self.sections = [_SECTION.unpack_from(view, table + i * 40) for i in range(sections)]
+        except struct.error as e:
+            raise PEIconError(f"PE truncado: {e}") from e
+        if not self.resource_rva:
+            raise PEIconError("el PE no tiene recursos")
+        self.resource_base = self.offset_of(self.resource_rva)
+
+    def offset_of(self, rva):
+        for _, virtual_size, address, raw_size, raw_pointer in self.sections:
+            if address <= rva < address + max(virtual_size, raw_size):
+                return raw_pointer + (rva - address)
+        raise PEIconError(f"RVA {rva:#x} fuera de las secciones")
+
+    def _entries(self, directory_offset):
+        """Devuelve [(id o None si tiene nombre, desplazamiento, es_subdirectorio)] de un directorio."""
+        _, _, _, _, named, ids = _DIR_HEADER.unpack_from(self.view, self.resource_base + directory_offset)
+        first = self.resource_base + directory_offset + _DIR_HEADER.size
+        entries = []
+        for i in range(named + ids):
+            name, target = _DIR_ENTRY.unpack_from(self.view, first + i * _DIR_ENTRY.size)
+            entries.append((None if name & 0x80000000 else name, target & 0x7FFFFFFF, bool(target & 0x80000000)))
+        return entries
+
+    def _subdirectory(self, directory_offset, wanted):
+        for ident, target, is_dir in self._entries(directory_offset):
+            if ident == wanted and is_dir:
+                return target
+        return None
+
+    def _first_leaf(self, offset, is_dir):
+        # Baja por el primer idioma disponible hasta la entrada de datos
+        while is_dir:
+            entries = self._entries(offset)
+            if not entries:
+                return None
+            _, offset, is_dir = entries[0]
+        rva, size, _, _ = _DATA_ENTRY.unpack_from(self.view, self.resource_base + offset)
+        start = self.offset_of(rva)
+        return self.view[start:start + size]
+
+    def resources(self, resource_type):
+        """Lista [(id o None, desplazamiento, es_subdirectorio)] de los recursos de un tipo, en orden."""
+        directory = self._subdirectory(0, resource_type)
+        return self._entries(directory) if directory is not None else []
+
+    def resource_data(self, resource_type, ident):
+        directory = self._subdirectory(0, resource_type)
+        if directory is None:
+            return None
+        for entry_id, target, is_dir in self._entries(directory):
+            if entry_id == ident:
+                return self._first_leaf(target, is_dir)
+        return None
+
+
+def extract_icon(pe_path, index=0):
+    """Devuelve los bytes de un archivo .ico con el grupo de iconos `index` del ejecutable.
+
+    `index` >= 0 es la posición del grupo en la tabla de recursos (como ExtractIcon); negativo,
+    su identificador de recurso. Lanza OSError si no se puede leer o PEIconError si no hay icono.
+    """
+    with open(pe_path, "rb") as f:
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Archivo vacío
+            raise PEIconError(str(e)) from e
+    with view:
+        try:
+            reader = _ResourceReader(view)
+            groups = reader.resources(RT_GROUP_ICON)
+            if index < 0:
+                chosen = next((g for g in groups if g[0] == -index), None)
+            else:
+                chosen = groups[index] if index < len(groups) else None
+            if chosen is None:
+                raise PEIconError(f"{os.path.basename(pe_path)} no tiene el icono {index}")
+            group = reader._first_leaf(chosen[1], chosen[2])
+            if group is None:
+                raise PEIconError("grupo de iconos vacío")
+            _, kind, count = _GRP_HEADER.unpack_from(group)
+            images = []
+            for i in range(count):
+                width, height, colors, _, planes, bits, _, ident = _GRP_ENTRY.unpack_from(
+                    group, _GRP_HEADER.size + i * _GRP_ENTRY.size)
+                data = reader.resource_data(RT_ICON, ident)
+                if data:
+                    images.append((width, height, colors, planes, bits, data))
+        except struct.error as e:
+            raise PEIconError(f"recursos corruptos: {e}") from e
+    if not images:
+        raise PEIconError("el grupo de iconos no tiene imágenes")
+    offset = _GRP_HEADER.size + len(images) * _ICO_ENTRY.size
+    header = [_GRP_HEADER.pack(0, 1, len(images))]
+    for width, height, colors, planes, bits, data in images:
+        header.append(_ICO_ENTRY.pack(width, height, colors, 0, planes, bits, len(data), offset))
+        offset += len(data)
+    return b"".join(header + [data for *_, data in images])
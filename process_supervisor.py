@@ -0,0 +1,173 @@
+import collections
+import os
+import threading
+import time
+
+from metrics import metrics
+
+
+class ChildRecord:
+    """Un programa lanzado: latencia de arranque, duración, código de salida y recursos."""
+
+    __slots__ = ("pid", "name", "program_path", "popen", "started_at", "_start", "spawn_latency",
+                 "exit_code", "_end", "cpu_seconds", "rss_bytes")
+
+    def __init__(self, name, program_path, popen, spawn_latency):
+        self.pid = popen.pid
+        self.name = name
+        self.program_path = program_path
+        self.popen = popen
+        self.started_at = time.time()
+        self._start = time.monotonic()
+        self.spawn_latency = spawn_latency
+        self.exit_code = None
+        self._end = None
+        self.cpu_seconds = None
+        self.rss_bytes = None
+
+    @property
+    def running(self):
+        return self._end is None
+
+    @property
+    def lifetime(self):
+        return (self._end if self._end is not None else time.monotonic()) - self._start
+
+
+def _read_proc_usage(pid):
+    """Devuelve (segundos de CPU, bytes residentes) desde /proc, o (None, None) si no está disponible."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            statm = f.read().split()
+    except OSError:
+        return None, None
+    # El nombre del proceso va entre paréntesis y puede contener espacios
+    fields = stat[stat.rfind(b")") + 2:].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    return cpu, int(statm[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class ProcessSupervisor:
+    """Registro de los programas lanzados con recogida asíncrona de los que terminan.
+
+    Un hilo de fondo consulta los hijos vivos con `Popen.poll()` (no bloqueante), de modo que
+    en POSIX no quedan procesos zombi y el bucle de Tk nunca espera por ellos.
+    """
+
+    REAP_INTERVAL_S = 0.5
+
+    def __init__(self, history=200, sample_resources=True):
+        self.sample_resources = sample_resources and os.path.isdir("/proc")
+        self._running = {}
+        self._finished = collections.deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._reaper = threading.Thread(target=self._reap_loop, name="process-reaper", daemon=True)
+        self._reaper.start()
+
+    def launch(self, program_path, name=None):
+        """Lanza el programa y lo registra. Propaga las excepciones de Popen."""
+        import subprocess  # Solo al primer lanzamiento, no durante el arranque
+        start = time.perf_counter()
+        popen = subprocess.Popen(program_path)
+        record = ChildRecord(name or os.path.basename(program_path), program_path, popen,
+                             time.perf_counter() - start)
+        metrics.observe("process_spawn", record.spawn_latency * 1000)
+        metrics.inc("launches")
+        with self._lock:
+            self._running[record.pid] = record
+        self._wakeup.set()
+        return record
+
+    def records(self):
+        """Copia de los registros: primero los procesos vivos, luego el historial reciente."""
+        with self._lock:
+            running = list(self._running.values())
+            finished = list(reversed(self._finished))
+        if self.sample_resources:
+            for record in running:
+                record.cpu_seconds, record.rss_bytes = _read_proc_usage(record.pid)
+        return running + finished
+
+    def running_count(self):
+        with self._lock:
+            return len(self._running)
+
+    def terminate(self, record, force=False):
+        if not record.running:
+            return
+        try:
+            record.popen.kill() if force else record.popen.terminate()
+        except OSError:
+            pass
+        self._wakeup.set()
+
+    def reap(self):
+        """Recoge los hijos que hayan terminado y devuelve sus registros."""
+        with self._lock:
+            running = list(self._running.values())
+        done = []
+        for record in running:
+            code = record.popen.poll()
+            if code is None:
+                continue
+            record.exit_code = code
+            record._end = time.monotonic()
+            done.append(record)
+        if done:
+            with self._lock:
+                for record in done:
+                    self._running.pop(record.pid, None)
+                    self._finished.append(record)
+        return done
+
+    def _reap_loop(self):
+        while True:
+            if not self.running_count():
+                self._wakeup.wait()
+            self._wakeup.clear()
+            self.reap()
+            time.sleep(self.REAP_INTERVAL_S)
+
+
+def focus_process_window(pid):
+    """Intenta traer al frente la ventana principal del proceso. Devuelve True si lo consigue."""
+    import shutil
+    import subprocess
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        found = []
+
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def callback(hwnd, _):
+            owner = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+            if owner.value == pid and user32.IsWindowVisible(hwnd):
+                found.append(hwnd)
+                return False
+            return True
+
+        user32.EnumWindows(callback, 0)
+        if found:
+            user32.ShowWindow(found[0], 9)  # SW_RESTORE
+            return bool(user32.SetForegroundWindow(found[0]))
+        return False
+    xdotool = shutil.which("xdotool")
+    if xdotool:
+        result = subprocess.run([xdotool, "search", "--onlyvisible", "--pid", str(pid), "windowactivate"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0
+    wmctrl = shutil.which("wmctrl")
+    if wmctrl:
+        listing = subprocess.run([wmctrl, "-lp"], capture_output=True, text=True).stdout
+        for line in listing.splitlines():
+            parts = line.split(None, 3)
+            if len(parts) >= 3 and parts[2] == str(pid):
+                return subprocess.run([wmctrl, "-ia", parts[0]]).returncode == 0
+    return False
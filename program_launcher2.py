@@ -1,25 +1,120 @@
 
+import time
+_IMPORT_START = time.perf_counter()
+
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
-from PIL import Image, ImageTk
-import subprocess
+import argparse
+import importlib.util
 import json
 import os
+import queue
+import sys
+import threading
+
+from lazy_imports import lazy_import
+# Los diálogos solo se cargan cuando se abre el primero
+filedialog = lazy_import("tkinter.filedialog")
+messagebox = lazy_import("tkinter.messagebox")
+simpledialog = lazy_import("tkinter.simpledialog")
+ttk = lazy_import("tkinter.ttk")
+from icon_cache import ThumbnailCache, load_thumbnail
+from pe_icons import split_icon_spec
+from icon_loader import AsyncIconLoader
+from virtual_grid import VirtualGrid
+from icon_atlas import IconRegistry
+from entries import ButtonEntry, EntryStore, LauncherConfig, normalize_path, path_key
+from config_cache import load_config, write_compiled
+from config_journal import ConfigJournal, atomic_write_json, entry_op
+from config_watcher import ConfigWatcher, apply_diff, diff_entries
+from quick_search import SearchIndex
+from launcher_client import send_command
+from launcher_daemon import CommandServer, list_lines, process_lines, resolve_entry
+from process_supervisor import ProcessSupervisor, focus_process_window
+from launch_groups import Debouncer, GroupMember, GroupRun, LaunchGroup, parse_groups
+from startup_profile import StartupProfile
+from metrics import metrics
+from path_validator import PathValidator
+from usage_history import UsageHistory, prewarm_in_background
+from workspaces import Profile, Workspace, file_signature
+
+
+UNAVAILABLE_BG = "#f4c7c3"  # Fondo de los botones cuyo programa no está accesible
+DEFAULT_ICON_SIZE = 32  # Lado de los iconos en píxeles lógicos (a 96 ppp)
+DEFAULT_COLUMNS = 10
+
+
+def detect_ui_scale(root):
+    """Factor de escala de la pantalla (1.0 a 96 ppp), redondeado a cuartos y nunca menor que 1."""
+    try:
+        dpi = root.winfo_fpixels("1i")
+    except tk.TclError:
+        return 1.0
+    return max(1.0, round(dpi / 96 * 4) / 4)
 
 
 class AppLauncher:
-    def __init__(self, root_window):
+    def __init__(self, root_window, ui_scale=None):
         self.root = root_window
         self.root.title("Lanzador de Aplicaciones")
         self.root.minsize(200, 100) # Ancho mínimo para asegurar visibilidad de la barra de título
 
-        self.buttons_data = []
+        self.search_index = SearchIndex()
+        self._search_index_job = None
+        self.path_validator = PathValidator(self.root, self._on_paths_checked, self._referenced_paths)
+        self.workspace = Workspace()  # Configuraciones abiertas como perfiles (pestañas)
+        self.workspace.activate(self.workspace.add(Profile()))
+        self._set_buttons_data(EntryStore())
         self.current_config_file = None
-        self.max_cols_buttons = 10
+        self.config_journal = None  # Diario de cambios del archivo actual (guardado automático)
+        self._compact_job = None
+        self.config_watcher = None  # Recarga el archivo actual cuando cambia en disco
+        self._unsaved_changes = False
+        self._applying_external_change = False
+        self.launch_groups = []
+        self.config_settings = {}  # Ajustes guardados en el propio archivo de configuración
+        self.launch_debouncer = Debouncer()
+        self.max_cols_buttons = DEFAULT_COLUMNS
+        self._reflow_job = None
+        self.icon_cache = ThumbnailCache()
+        self.process_supervisor = ProcessSupervisor()
+        self.ui_scale = ui_scale or detect_ui_scale(self.root)
+        self.icon_size = DEFAULT_ICON_SIZE
+        self.icon_pixels = self._scaled(self.icon_size)  # Tamaño real de decodificación
+        self.icon_registry = IconRegistry(self.icon_pixels)
+        self.icon_loader = AsyncIconLoader(self.root, self._load_and_prepare_icon, self._on_icons_ready,
+                                           materialize=lambda img: self.icon_registry.acquire(img))
+        self._pending_icon_paths = set()  # Iconos en decodificación; una sola carga por ruta
+        self._button_widgets = {}  # uid -> [botón, firma, (fila, columna)]
+        self._grid_shape = (0, 0)
+        self.virtual_grid = None
+        self.virtual_view_threshold = 500  # A partir de aquí se activa la vista virtual al abrir
+        self.startup_profile = None  # StartupProfile con --profile-startup
+        self.bulk_importer = None  # Se crea en la primera importación (bulk_import no se carga al arrancar)
+        self._import_window = None
+        self.usage_history = UsageHistory()
+        self._usage_save_job = None
+
+        self.virtual_view_var = tk.BooleanVar()
+        self.virtual_view_var.set(False)
+
+        self.icon_atlas_var = tk.BooleanVar()
+        self.icon_atlas_var.set(False)
 
         self.always_on_top_var = tk.BooleanVar()
         self.always_on_top_var.set(False)
 
+        self.autosave_var = tk.BooleanVar()
+        self.autosave_var.set(True)
+
+        self.active_profile_var = tk.IntVar()
+        self.active_profile_var.set(0)
+
+        self.usage_order_var = tk.BooleanVar()
+        self.usage_order_var.set(False)
+
+        self.responsive_var = tk.BooleanVar()
+        self.responsive_var.set(False)
+
         # --- Menú ---
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
@@ -30,14 +125,26 @@ class AppLauncher:
         file_menu.add_command(label="Abrir Configuración...", command=self.open_config)
         file_menu.add_command(label="Guardar Configuración", command=self.save_config)
         file_menu.add_command(label="Guardar Como...", command=self.save_config_as)
+        file_menu.add_checkbutton(label="Guardado Automático", variable=self.autosave_var, command=self.toggle_autosave)
         file_menu.add_separator()
-        file_menu.add_command(label="Salir", command=self.root.quit)
+        file_menu.add_command(label="Salir", command=self.quit)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
 
         edit_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Editar", menu=edit_menu)
         edit_menu.add_command(label="Añadir Botón...", command=self.add_button_dialog)
         edit_menu.add_command(label="Modificar Botón...", command=self.modify_button_dialog)
         edit_menu.add_command(label="Eliminar Botón...", command=self.delete_button_dialog)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Importar desde Carpeta...", command=self.bulk_import_dialog)
+        edit_menu.add_command(label="Importar Accesos del Sistema", command=self.import_system_shortcuts)
+
+        self.groups_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Grupos", menu=self.groups_menu)
+        self._rebuild_groups_menu()
+
+        self.profiles_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Perfiles", menu=self.profiles_menu)
 
         window_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Ventana", menu=window_menu)
@@ -45,71 +152,618 @@ class AppLauncher:
                                     onvalue=True, offvalue=False,
                                     variable=self.always_on_top_var,
                                     command=self.toggle_always_on_top)
+        window_menu.add_checkbutton(label="Vista Virtual (configuraciones grandes)",
+                                    onvalue=True, offvalue=False,
+                                    variable=self.virtual_view_var,
+                                    command=self.toggle_virtual_view)
+        window_menu.add_checkbutton(label="Atlas de Iconos (vista virtual)",
+                                    onvalue=True, offvalue=False,
+                                    variable=self.icon_atlas_var,
+                                    command=self.toggle_virtual_view)
+        window_menu.add_checkbutton(label="Más Usados Primero",
+                                    onvalue=True, offvalue=False,
+                                    variable=self.usage_order_var,
+                                    command=self.toggle_usage_order)
+        window_menu.add_checkbutton(label="Columnas Según el Ancho",
+                                    onvalue=True, offvalue=False,
+                                    variable=self.responsive_var,
+                                    command=self.toggle_responsive_layout)
+        window_menu.add_command(label="Tamaño de Iconos...", command=self.icon_size_dialog)
+        window_menu.add_separator()
+        window_menu.add_command(label="Comprobar Rutas Ahora", command=self.recheck_paths)
+        window_menu.add_command(label="Estadísticas de Iconos...", command=self.show_icon_stats)
+        window_menu.add_command(label="Procesos Lanzados...", command=self.show_process_panel)
+        window_menu.add_command(label="Métricas de Rendimiento...", command=self.show_metrics_panel)
+
+        # --- Búsqueda rápida ---
+        self._create_search_bar()
+
+        # --- Pestañas de perfiles (solo se muestran con más de uno) ---
+        self.profile_bar = tk.Frame(self.root)
 
         # --- Frame para los botones ---
-        self.buttons_frame = tk.Frame(self.root)
-        self.buttons_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self._create_buttons_frame()
 
         self.update_buttons_display()
+        self._rebuild_profile_ui()
+        self.root.bind("<Configure>", self._on_root_configure, add="+")
+        self.root.after(self.PREWARM_DELAY_MS, self.prewarm_frequent_programs)
 
     def toggle_always_on_top(self):
         self.root.attributes('-topmost', self.always_on_top_var.get())
 
-    def _launch_program(self, program_path):
+    def toggle_virtual_view(self):
+        # El atlas solo se usa con la vista virtual: los tk.Button necesitan un PhotoImage propio
+        use_atlas = self.icon_atlas_var.get() and self.virtual_view_var.get()
+        if use_atlas != self.icon_registry.use_atlas:
+            self._reset_icon_registry(use_atlas)
+        self._create_buttons_frame()
+        self.update_buttons_display()
+
+    def _scaled(self, size):
+        return max(1, round(size * self.ui_scale))
+
+    def _reset_icon_registry(self, use_atlas):
+        # Las imágenes del registro anterior se descartan en bloque y se vuelven a pedir
+        self.icon_loader.cancel()
+        self._pending_icon_paths.clear()
+        self.icon_registry = IconRegistry(self.icon_pixels, use_atlas=use_atlas)
+        for button_data in self.buttons_data:
+            button_data.tk_icon_ref = None
+            self._request_icon(button_data)
+        for profile in self.workspace.profiles:
+            if profile is not self.workspace.active and profile.loaded:
+                for button_data in profile.entries:
+                    button_data.tk_icon_ref = None  # Se piden de nuevo al volver a mostrarlo
+
+    def set_icon_size(self, size):
+        """Cambia el tamaño lógico de los iconos; se decodifican de nuevo a size * ui_scale píxeles."""
+        self.icon_size = size
+        pixels = self._scaled(size)
+        if pixels == self.icon_pixels:
+            return
+        self.icon_pixels = pixels
+        self._reset_icon_registry(self.icon_registry.use_atlas)
+        self._create_buttons_frame()
+        self.update_buttons_display()
+
+    def icon_size_dialog(self):
+        value = simpledialog.askinteger("Tamaño de Iconos",
+                                        f"Lado de los iconos en píxeles (escala de pantalla: {self.ui_scale:g}x):",
+                                        parent=self.root, minvalue=16, maxvalue=256, initialvalue=self.icon_size)
+        if value is not None and value != self.icon_size:
+            self.config_settings["icon_size"] = value
+            self.set_icon_size(value)
+            self._journal({"op": "settings", "settings": dict(self.config_settings)})
+
+    def show_icon_stats(self):
+        stats = self.icon_registry.stats()
+        saved = stats['bytes_without_dedup'] - stats['decoded_bytes']
+        messagebox.showinfo("Estadísticas de Iconos",
+                            f"Botones: {len(self.buttons_data)}\n"
+                            f"Referencias a iconos: {stats['references']}\n"
+                            f"Imágenes únicas (por contenido): {stats['unique_images']}\n"
+                            f"Objetos de imagen Tk (iconos): {stats['tk_images']}\n"
+                            f"Objetos de imagen Tk (total): {len(self.root.image_names())}\n"
+                            f"Modo atlas: {'sí' if self.icon_registry.use_atlas else 'no'}"
+                            f" ({stats['atlas_slots']} huecos ocupados)\n"
+                            f"Memoria de píxeles: {stats['decoded_bytes'] / 1024:.1f} KiB"
+                            f" (ahorro por deduplicación: {saved / 1024:.1f} KiB)",
+                            parent=self.root)
+
+    def _set_buttons_data(self, store, search_index=None):
+        self.buttons_data = store
+        store.listeners.append(self._on_entries_changed)
+        if search_index is not None:
+            # Un perfil que vuelve a primer plano conserva su índice y las rutas ya comprobadas
+            self.search_index = search_index
+            self._validate_paths(store)
+            return
+        self.search_index = SearchIndex()  # El anterior puede pertenecer a un perfil en segundo plano
+        self.search_index.rebuild(store)
+        if self._search_index_job is None and len(store):
+            self._search_index_job = self.root.after(50, self._index_search_step)
+        self.path_validator.clear()
+        self._validate_paths(store)
+
+    def _index_search_step(self):
+        # El índice de búsqueda se completa por tandas sin retrasar la primera pintura
+        if self.search_index.index_pending(limit=250):
+            self._search_index_job = self.root.after(1, self._index_search_step)
+        else:
+            self._search_index_job = None
+
+    def _on_entries_changed(self, event, entry, index):
+        if event == "extend":
+            # Alta en bloque (importación): un solo bloque en el diario y una comprobación de rutas
+            self._journal_many([entry_op("add", e, index + i) for i, e in enumerate(entry)])
+            for e in entry:
+                self.search_index.add(e)
+            self._validate_paths(entry)
+        else:
+            self._journal(entry_op(event, entry, index))
+            if event == "add":
+                self.search_index.add(entry)
+            elif event == "remove":
+                self.search_index.remove(entry)
+            else:
+                self.search_index.update(entry)
+            if event != "remove":
+                self._validate_paths((entry,))
+        if getattr(self, 'search_var', None) is not None and self.search_var.get():
+            self._update_search_results()
+
+    # --- Disponibilidad de rutas ---
+    @staticmethod
+    def _paths_of(entries):
+        paths = set()
+        for entry in entries:
+            paths.add(entry.program_path)
+            if entry.icon_path:
+                paths.add(split_icon_spec(entry.icon_path)[0])
+        return paths
+
+    def _referenced_paths(self):
+        # Las rutas que ya no usa ningún botón se olvidan en la siguiente renovación
+        return self._paths_of(self.buttons_data)
+
+    def _validate_paths(self, entries):
+        self.path_validator.check(self._paths_of(entries))
+
+    def recheck_paths(self):
+        self.path_validator.check(self._paths_of(self.buttons_data), force=True)
+
+    def _is_unavailable(self, button_data):
+        # Solo se consulta el resultado guardado: el hilo de Tk nunca hace stat
+        return self.path_validator.status(button_data.program_path) is False
+
+    def _on_paths_checked(self, changes):
+        changed = {path for path, _ in changes}
+        appeared = {path for path, available in changes if available}
+        for button_data in self.buttons_data:
+            if button_data.program_path in changed:
+                self._refresh_button(button_data)
+            if (button_data.icon_path and button_data.tk_icon_ref is None
+                    and split_icon_spec(button_data.icon_path)[0] in appeared):
+                self._request_icon(button_data)
+
+    def _create_search_bar(self):
+        search_frame = tk.Frame(self.root)
+        search_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Label(search_frame, text="Buscar:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.grid(row=0, column=1, sticky=tk.EW)
+        search_frame.grid_columnconfigure(1, weight=1)
+        self.search_results = tk.Listbox(search_frame, height=8, activestyle="none", exportselection=False)
+        self._search_hits = []
+
+        self.search_var.trace_add("write", lambda *args: self._update_search_results())
+        self.search_entry.bind("<Return>", lambda e: self._launch_search_hit())
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+        self.search_entry.bind("<Down>", lambda e: self._move_search_selection(1))
+        self.search_entry.bind("<Up>", lambda e: self._move_search_selection(-1))
+        self.search_results.bind("<Double-Button-1>", lambda e: self._launch_search_hit())
+        self.root.bind("<Control-f>", lambda e: self.search_entry.focus_set())
+
+    def _update_search_results(self):
+        self._search_hits = self.search_index.search(self.search_var.get())
+        self.search_results.delete(0, tk.END)
+        for entry in self._search_hits:
+            self.search_results.insert(tk.END, f"{entry.name}  —  {entry.program_path}")
+        if self._search_hits:
+            self.search_results.configure(height=len(self._search_hits))
+            self.search_results.grid(row=1, column=0, columnspan=2, sticky=tk.EW, pady=(2, 0))
+            self.search_results.selection_set(0)
+        else:
+            self.search_results.grid_remove()
+
+    def _move_search_selection(self, step):
+        if not self._search_hits:
+            return
+        current = self.search_results.curselection()
+        index = min(max((current[0] if current else 0) + step, 0), len(self._search_hits) - 1)
+        self.search_results.selection_clear(0, tk.END)
+        self.search_results.selection_set(index)
+        self.search_results.see(index)
+
+    def _launch_search_hit(self):
+        if not self._search_hits:
+            return
+        current = self.search_results.curselection()
+        entry = self._search_hits[current[0] if current else 0]
+        self.search_var.set("")
+        self._launch_program(entry.program_path, entry.name)
+
+    def _create_buttons_frame(self):
+        if getattr(self, 'buttons_frame', None) is not None:
+            self.buttons_frame.destroy()
+        self.buttons_frame = tk.Frame(self.root)
+        self.buttons_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self._button_widgets.clear()
+        self._grid_shape = (0, 0)
+        self.virtual_grid = None
+        if self.virtual_view_var.get():
+            self.virtual_grid = VirtualGrid(self.buttons_frame, self._describe_button,
+                                            lambda b: self._launch_program(b.program_path, b.name),
+                                            columns=self.max_cols_buttons, cell_size=self.icon_pixels + 12,
+                                            unavailable_fill=UNAVAILABLE_BG)
+            self.virtual_grid.pack(fill=tk.BOTH, expand=True)
+        if self.responsive_var.get():
+            self._schedule_reflow()  # Otro tamaño de celda (vista virtual, tamaño de icono)
+
+    def _spawn_program(self, program_path, name=None):
+        record = self.process_supervisor.launch(program_path, name)
+        self._record_usage(program_path)
+        return record
+
+    # --- Historial de uso ---
+    USAGE_SAVE_DELAY_MS = 5000
+    PREWARM_DELAY_MS = 10000  # Tras el arranque, cuando la interfaz ya está ociosa
+    PREWARM_INTERVAL_MS = 30 * 60 * 1000  # La caché de páginas se va vaciando: se repite
+    PREWARM_COUNT = 10
+
+    def _record_usage(self, program_path):
+        # El historial va en su propio archivo; se escribe con retraso para agrupar lanzamientos
+        self.usage_history.record(program_path)
+        if self._usage_save_job is not None:
+            self.root.after_cancel(self._usage_save_job)
+        self._usage_save_job = self.root.after(self.USAGE_SAVE_DELAY_MS, self.save_usage_history)
+
+    def save_usage_history(self):
+        if self._usage_save_job is not None:
+            try:
+                self.root.after_cancel(self._usage_save_job)
+            except tk.TclError:
+                pass
+            self._usage_save_job = None
+        try:
+            self.usage_history.save()
+        except OSError as e:
+            print(f"Advertencia: No se pudo guardar el historial de uso {self.usage_history.path}: {e}")
+
+    def toggle_usage_order(self):
+        self.config_settings["usage_order"] = self.usage_order_var.get()
+        self._journal({"op": "settings", "settings": dict(self.config_settings)})
+        self.update_buttons_display()
+
+    def _display_entries(self):
+        # El orden por uso solo afecta a la cuadrícula: buttons_data (y el archivo) no se reordena
+        if self.usage_order_var.get():
+            return self.usage_history.ranked(self.buttons_data)
+        return self.buttons_data
+
+    def prewarm_frequent_programs(self):
+        """Carga en la caché de páginas los ejecutables más usados para que arranquen antes."""
+        paths = self.usage_history.top(self.PREWARM_COUNT)
+        if paths:
+            prewarm_in_background(paths)
+        self.root.after(self.PREWARM_INTERVAL_MS, self.prewarm_frequent_programs)
+
+    def _launch_program(self, program_path, name=None):
+        # Un doble clic (o un grupo recién lanzado) no vuelve a arrancar el mismo programa
+        if not self.launch_debouncer.allow(path_key(program_path)):
+            return
+        # El estado guardado solo colorea el botón: si el programa falta, lo dice Popen
         try:
-            subprocess.Popen(program_path)
+            self._spawn_program(program_path, name)
         except FileNotFoundError:
+            metrics.inc("launch_failures")
+            self.path_validator.check([program_path], force=True)
             messagebox.showerror("Error", f"Programa no encontrado: {program_path}", parent=self.root)
         except Exception as e:
+            metrics.inc("launch_failures")
             messagebox.showerror("Error", f"No se pudo lanzar el programa: {program_path}\nDetalles: {e}", parent=self.root)
 
+    def show_metrics_panel(self):
+        panel = tk.Toplevel(self.root)
+        panel.title("Métricas de Rendimiento")
+        panel.transient(self.root)
+        enabled_var = tk.BooleanVar(value=metrics.enabled)
+        columns = ("name", "count", "mean", "p50", "p95", "max")
+        headings = ("Medida", "Cantidad", "Media (ms)", "p50 (ms)", "p95 (ms)", "Máx. (ms)")
+        tree = ttk.Treeview(panel, columns=columns, show="headings", height=14, selectmode="none")
+        for column, heading in zip(columns, headings):
+            tree.heading(column, text=heading)
+            tree.column(column, width=190 if column == "name" else 80, anchor=tk.W if column == "name" else tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+
+        def fmt(value):
+            return "" if value is None else f"{value:.1f}"
+
+        def refresh():
+            if not panel.winfo_exists():
+                return
+            snapshot = metrics.snapshot()
+            tree.delete(*tree.get_children())
+            for name, histogram in sorted(snapshot["histograms"].items()):
+                count = histogram["count"]
+                tree.insert("", tk.END, values=(name, count, fmt(histogram["sum_ms"] / count if count else None),
+                                                fmt(histogram["p50_ms"]), fmt(histogram["p95_ms"]),
+                                                fmt(histogram["max_ms"])))
+            for name, value in sorted(snapshot["counters"].items()):
+                tree.insert("", tk.END, values=(name, value, "", "", "", ""))
+            panel.after(1000, refresh)
+
+        def toggle():
+            metrics.enabled = enabled_var.get()
+
+        def export():
+            filepath = filedialog.asksaveasfilename(
+                title="Exportar Métricas",
+                filetypes=(("JSON Lines", "*.jsonl"), ("Prometheus (textfile)", "*.prom"), ("Todos los archivos", "*.*")),
+                defaultextension=".jsonl", initialfile="lanzador_metricas.jsonl", parent=panel)
+            if not filepath: return
+            try:
+                metrics.export(filepath)
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo exportar: {filepath}\n{e}", parent=panel)
+
+        btn_frame = tk.Frame(panel, pady=5); btn_frame.pack(fill=tk.X, padx=10)
+        tk.Checkbutton(btn_frame, text="Registrar métricas", variable=enabled_var, command=toggle).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="Cerrar", command=panel.destroy, width=10).pack(side=tk.RIGHT, padx=2)
+        tk.Button(btn_frame, text="Exportar...", command=export, width=12).pack(side=tk.RIGHT, padx=2)
+        tk.Button(btn_frame, text="Reiniciar", command=metrics.reset, width=10).pack(side=tk.RIGHT, padx=2)
+        refresh()
+
+    METRICS_EXPORT_MS = 30000
+
+    def start_metrics_export(self, filepath):
+        self.export_metrics(filepath)
+        self.root.after(self.METRICS_EXPORT_MS, self.start_metrics_export, filepath)
+
+    def export_metrics(self, filepath):
+        try:
+            metrics.export(filepath)
+        except OSError as e:
+            print(f"Advertencia: No se pudieron exportar las métricas a {filepath}: {e}")
+
+    def show_process_panel(self):
+        panel = tk.Toplevel(self.root)
+        panel.title("Procesos Lanzados")
+        panel.transient(self.root)
+        columns = ("pid", "name", "state", "latency", "lifetime", "cpu", "rss", "code")
+        headings = ("PID", "Nombre", "Estado", "Arranque (ms)", "Duración (s)", "CPU (s)", "RSS (MiB)", "Código")
+        tree = ttk.Treeview(panel, columns=columns, show="headings", height=12, selectmode="browse")
+        for column, heading in zip(columns, headings):
+            tree.heading(column, text=heading)
+            tree.column(column, width=160 if column == "name" else 85, anchor=tk.W if column == "name" else tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        records_by_item = {}
+
+        def selected_record():
+            selection = tree.selection()
+            return records_by_item.get(selection[0]) if selection else None
+
+        def refresh():
+            if not panel.winfo_exists():
+                return
+            selection = tree.selection()
+            tree.delete(*tree.get_children())
+            records_by_item.clear()
+            for record in self.process_supervisor.records():
+                item = tree.insert("", tk.END, iid=f"{record.pid}-{record.started_at}", values=(
+                    record.pid, record.name,
+                    "En ejecución" if record.running else "Terminado",
+                    f"{record.spawn_latency * 1000:.1f}",
+                    f"{record.lifetime:.0f}",
+                    "" if record.cpu_seconds is None or not record.running else f"{record.cpu_seconds:.1f}",
+                    "" if record.rss_bytes is None or not record.running else f"{record.rss_bytes / 1048576:.1f}",
+                    "" if record.exit_code is None else record.exit_code))
+                records_by_item[item] = record
+            if selection and tree.exists(selection[0]):
+                tree.selection_set(selection[0])
+            panel.after(1000, refresh)
+
+        def terminate(force=False):
+            record = selected_record()
+            if record is not None and record.running:
+                self.process_supervisor.terminate(record, force=force)
+
+        def focus():
+            record = selected_record()
+            if record is not None and record.running and not focus_process_window(record.pid):
+                messagebox.showinfo("Enfocar", "No se encontró la ventana del proceso.", parent=panel)
+
+        btn_frame = tk.Frame(panel, pady=5); btn_frame.pack(fill=tk.X)
+        tk.Button(btn_frame, text="Cerrar", command=panel.destroy, width=10).pack(side=tk.RIGHT, padx=5)
+        tk.Button(btn_frame, text="Forzar Cierre", command=lambda: terminate(force=True), width=12).pack(side=tk.RIGHT, padx=5)
+        tk.Button(btn_frame, text="Terminar", command=terminate, width=10).pack(side=tk.RIGHT, padx=5)
+        tk.Button(btn_frame, text="Enfocar", command=focus, width=10).pack(side=tk.RIGHT, padx=5)
+        refresh()
+
     def _load_and_prepare_icon(self, icon_path):
-        if not icon_path or not os.path.exists(icon_path):
+        # Se ejecuta en los hilos del AsyncIconLoader: devuelve una imagen PIL, no un PhotoImage
+        if not icon_path or not os.path.exists(split_icon_spec(icon_path)[0]):
+            metrics.inc("icon_missing")
             return None
+        pixels = self.icon_pixels
         try:
-            img = Image.open(icon_path)
-            if getattr(img, 'is_animated', False) or (hasattr(img, 'n_frames') and img.n_frames > 1):
-                img.seek(0)
-            img = img.resize((32, 32), Image.LANCZOS)
-            return ImageTk.PhotoImage(img)
+            with metrics.timer("icon_decode"):
+                return load_thumbnail(icon_path, (pixels, pixels), self.icon_cache)
         except Exception as e:
+            metrics.inc("icon_failures")
             print(f"Advertencia: No se pudo cargar o procesar el icono: {icon_path}\n{e}")
             return None
 
+    def _request_icon(self, button_data):
+        # Las entradas que comparten icon_path esperan una única decodificación
+        self._forget_icon(button_data)
+        icon_path = button_data.icon_path
+        if icon_path and self.path_validator.status(split_icon_spec(icon_path)[0]) is False:
+            return  # Se pedirá cuando la ruta vuelva a estar disponible
+        if icon_path and icon_path not in self._pending_icon_paths:
+            self._pending_icon_paths.add(icon_path)
+            self.icon_loader.request(icon_path, icon_path)
+
+    def _forget_icon(self, button_data):
+        self.icon_registry.release(button_data.tk_icon_ref)
+        button_data.tk_icon_ref = None
+
+    def _cancel_icon_loads(self, old_buttons_data):
+        self.icon_loader.cancel()
+        self._pending_icon_paths.clear()
+        for button_data in old_buttons_data:
+            self._forget_icon(button_data)
+
+    def _on_icons_ready(self, results):
+        for icon_path, tk_icon in results:
+            self._pending_icon_paths.discard(icon_path)
+            if tk_icon is None:
+                continue
+            assigned = False
+            for button_data in self.buttons_data.users_of_icon(icon_path):
+                if button_data.tk_icon_ref is not None:
+                    continue
+                if assigned:
+                    self.icon_registry.acquire_existing(tk_icon)
+                button_data.tk_icon_ref = tk_icon
+                assigned = True
+                self._refresh_button(button_data)
+            if not assigned:
+                self.icon_registry.release(tk_icon)
+
+    def _button_signature(self, button_data):
+        return (button_data.name, button_data.tk_icon_ref, self._is_unavailable(button_data))
+
+    def _configure_button(self, button, button_data):
+        if not hasattr(button, 'default_bg'):
+            button.default_bg = button.cget("bg")
+        button.config(bg=UNAVAILABLE_BG if self._is_unavailable(button_data) else button.default_bg)
+        tk_icon = button_data.tk_icon_ref
+        if tk_icon:
+            button.config(image=tk_icon, text="", width=self.icon_pixels, height=self.icon_pixels)
+            button.image = tk_icon
+        else:
+            button_text = button_data.name[0].upper() if button_data.name else "?"
+            button.config(image="", text=button_text, width=4, height=2, font=("Arial", 10, "bold"))
+            button.image = None
+
+    def _describe_button(self, button_data):
+        return (button_data.tk_icon_ref, (button_data.name[0].upper() if button_data.name else "?"),
+                self._is_unavailable(button_data))
+
+    def _refresh_button(self, button_data):
+        # Reconfigura un único botón ya existente sin recorrer la cuadrícula
+        if self.virtual_grid is not None:
+            self.virtual_grid.refresh_item(button_data)
+            return
+        slot = self._button_widgets.get(button_data.uid)
+        if slot is None:
+            return
+        signature = self._button_signature(button_data)
+        if slot[1] != signature:
+            self._configure_button(slot[0], button_data)
+            slot[1] = signature
+
     def update_buttons_display(self):
-        for widget in self.buttons_frame.winfo_children():
-            widget.destroy()
+        with metrics.timer("grid_update"):
+            self._reconcile_buttons()
+
+    def _reconcile_buttons(self):
+        # Reconciliación por uid: se reutilizan los botones existentes, solo se reconfiguran
+        # los que cambiaron y solo se recolocan los que cambiaron de posición.
+        entries = self._display_entries()
+        if self.virtual_grid is not None:
+            self.virtual_grid.set_items(entries)
+            self.root.minsize(200, 100)
+            self._fit_window_to_content()
+            return
 
+        live_uids = set()
+        for i, button_data in enumerate(entries):
+            uid = button_data.uid
+            live_uids.add(uid)
+            slot = self._button_widgets.get(uid)
+            if slot is None:
+                button = tk.Button(self.buttons_frame,
+                                   command=lambda b=button_data: self._launch_program(b.program_path, b.name))
+                slot = self._button_widgets[uid] = [button, None, None]
+            self._refresh_button(button_data)
+            position = divmod(i, self.max_cols_buttons)
+            if slot[2] != position:
+                slot[0].grid(row=position[0], column=position[1], padx=3, pady=3, sticky="nsew")
+                slot[2] = position
+
+        for uid in [uid for uid in self._button_widgets if uid not in live_uids]:
+            self._button_widgets.pop(uid)[0].destroy()
+
+        self._update_grid_weights()
         if not self.buttons_data:
-            self.root.geometry("")
+            self._fit_window_to_content()
             self.root.minsize(200, 100) # Asegurar minsize si está vacío
             return
-        
         self.root.minsize(0,0) # Resetear minsize para que se ajuste al contenido
+        self._fit_window_to_content()
 
-        row, col = 0, 0
-        for i, button_data in enumerate(self.buttons_data):
-            tk_icon = button_data.get('tk_icon_ref')
-            if tk_icon:
-                button = tk.Button(self.buttons_frame, image=tk_icon, width=32, height=32,
-                                   command=lambda p=button_data['program_path']: self._launch_program(p))
-                button.image = tk_icon
-            else:
-                button_text = button_data['name'][0].upper() if button_data['name'] else "?"
-                button = tk.Button(self.buttons_frame, text=button_text, width=4, height=2,
-                                   font=("Arial", 10, "bold"),
-                                   command=lambda p=button_data['program_path']: self._launch_program(p))
-            
-            button.grid(row=row, column=col, padx=3, pady=3, sticky="nsew")
-            self.buttons_frame.grid_columnconfigure(col, weight=1)
-            col += 1
-            if col >= self.max_cols_buttons:
-                self.buttons_frame.grid_rowconfigure(row, weight=1)
-                col = 0
-                row += 1
-        if self.buttons_data:
-            self.buttons_frame.grid_rowconfigure(row, weight=1)
-        self.root.geometry("")
+    def _fit_window_to_content(self):
+        # Con columnas según el ancho manda el tamaño que elige el usuario, no el del contenido
+        if not self.responsive_var.get():
+            self.root.geometry("")
+
+    # --- Diseño adaptable ---
+    REFLOW_MS = 16  # Como mucho una recolocación por fotograma al arrastrar el borde
+
+    def toggle_responsive_layout(self):
+        self.config_settings["responsive_layout"] = self.responsive_var.get()
+        self._journal({"op": "settings", "settings": dict(self.config_settings)})
+        self._apply_responsive_layout()
+
+    def _apply_responsive_layout(self):
+        if self.responsive_var.get():
+            # Se fija el tamaño actual para que la ventana deje de ajustarse al contenido
+            if self.root.winfo_ismapped():
+                self.root.geometry(f"{self.root.winfo_width()}x{self.root.winfo_height()}")
+            self._schedule_reflow()
+        else:
+            if self._reflow_job is not None:
+                self.root.after_cancel(self._reflow_job)
+                self._reflow_job = None
+            self._set_columns(DEFAULT_COLUMNS)
+
+    def _on_root_configure(self, event):
+        # <Configure> llega por cada widget hijo; solo interesa el de la ventana principal
+        if event.widget is self.root and self.responsive_var.get():
+            self._schedule_reflow()
+
+    def _schedule_reflow(self):
+        if self._reflow_job is None:
+            self._reflow_job = self.root.after(self.REFLOW_MS, self._reflow)
+
+    def _reflow(self):
+        self._reflow_job = None
+        with metrics.timer("reflow"):
+            self._set_columns(self._columns_for_width())
+
+    def _set_columns(self, columns):
+        # Solo se recolocan los botones existentes (ver _reconcile_buttons); nunca se recrean
+        if columns == self.max_cols_buttons:
+            return
+        self.max_cols_buttons = columns
+        if self.virtual_grid is not None:
+            self.virtual_grid.columns = columns
+        self.update_buttons_display()
+
+    def _columns_for_width(self):
+        if self.virtual_grid is not None:
+            width, cell = self.virtual_grid.canvas.winfo_width(), self.virtual_grid.cell_size
+        else:
+            width = self.buttons_frame.winfo_width()
+            widgets = [slot[0] for slot, _ in zip(self._button_widgets.values(), range(32))]
+            # Ancho pedido por los botones (icono o letra) más el padx de la rejilla
+            cell = max((w.winfo_reqwidth() for w in widgets), default=self.icon_pixels + 10) + 6
+        return max(1, width // max(1, cell))
+
+    def _update_grid_weights(self):
+        count = len(self.buttons_data)
+        rows = (count + self.max_cols_buttons - 1) // self.max_cols_buttons
+        cols = min(count, self.max_cols_buttons)
+        old_rows, old_cols = self._grid_shape
+        for row in range(min(old_rows, rows), max(old_rows, rows)):
+            self.buttons_frame.grid_rowconfigure(row, weight=1 if row < rows else 0)
+        for col in range(min(old_cols, cols), max(old_cols, cols)):
+            self.buttons_frame.grid_columnconfigure(col, weight=1 if col < cols else 0)
+        self._grid_shape = (rows, cols)
 
     def add_button_dialog(self):
         name = simpledialog.askstring("Nombre del Botón", "Introduce un nombre para el botón (ej: Navegador):", parent=self.root)
@@ -123,34 +777,114 @@ class AppLauncher:
 
         icon_path = filedialog.askopenfilename(
             title="Seleccionar Icono (PNG, GIF, JPG, ICO)",
-            filetypes=(("Imágenes", "*.png *.gif *.jpg *.jpeg *.ico"), ("Todos los archivos", "*.*")),
+            filetypes=(("Imágenes", "*.png *.gif *.jpg *.jpeg *.ico *.exe *.dll"), ("Todos los archivos", "*.*")),
             parent=self.root)
 
-        tk_icon_ref = self._load_and_prepare_icon(icon_path)
-        new_button_data = {
-            "name": name if name else os.path.splitext(os.path.basename(program_path))[0],
-            "program_path": program_path,
-            "icon_path": icon_path if icon_path else "",
-            "tk_icon_ref": tk_icon_ref
-        }
+        duplicates = self.buttons_data.find_by_program(program_path)
+        if duplicates and not messagebox.askyesno(
+                "Programa Duplicado",
+                f"Ya existe un botón para este programa ('{duplicates[0].name}').\n¿Añadirlo de todos modos?",
+                parent=self.root):
+            return
+
+        new_button_data = ButtonEntry(name, program_path, icon_path if icon_path else "")
         self.buttons_data.append(new_button_data)
+        self._request_icon(new_button_data)
         self.update_buttons_display()
 
     def new_config(self):
-        if self.buttons_data:
+        if self._autosave_active():
+            self.flush_autosave()
+        elif self.buttons_data:
              if messagebox.askyesno("Guardar Cambios", "¿Desea guardar la configuración actual antes de crear una nueva?", parent=self.root):
                 if self.current_config_file: self.save_config()
                 else: self.save_config_as()
-        self.buttons_data = []
-        self.current_config_file = None
+        self._cancel_icon_loads(self.buttons_data)
+        self._set_config_journal(None)
+        self._set_buttons_data(EntryStore())
+        self._apply_config_extras(LauncherConfig())
+        self.current_config_file = self.workspace.active.path = None
         self.root.title("Lanzador de Aplicaciones - Nueva Configuración")
         self.update_buttons_display()
         self.root.minsize(200, 100) # Asegurar minsize para configs vacías
+        self._rebuild_profile_ui()
+
+    # --- Importación en bloque ---
+    def bulk_import_dialog(self):
+        directory = filedialog.askdirectory(title="Importar Lanzadores de una Carpeta", mustexist=True,
+                                            parent=self.root)
+        if directory:
+            self.bulk_import([directory])
+
+    def import_system_shortcuts(self):
+        from bulk_import import default_shortcut_dirs
+
+        directories = default_shortcut_dirs()
+        if not directories:
+            messagebox.showinfo("Importar", "No se encontraron carpetas de accesos directos en este sistema.",
+                                parent=self.root)
+            return
+        self.bulk_import(directories)
+
+    def bulk_import(self, directories):
+        """Recorre las carpetas en segundo plano y añade por tandas los lanzadores que aún no existen."""
+        if self.bulk_importer is None:
+            from bulk_import import BulkImporter
+            self.bulk_importer = BulkImporter(self.root, self._on_bulk_found, self._on_bulk_done)
+        if self.bulk_importer.running:
+            messagebox.showinfo("Importar", "Ya hay una importación en curso.", parent=self.root)
+            return
+        self._bulk_added = self._bulk_skipped = 0
+        win = self._import_window = tk.Toplevel(self.root)
+        win.title("Importando Lanzadores")
+        win.transient(self.root)
+        win.resizable(False, False)
+        tk.Label(win, text="\n".join(directories), justify=tk.LEFT).pack(padx=10, pady=(10, 5), anchor=tk.W)
+        self._import_status = tk.StringVar(win, "Buscando...")
+        tk.Label(win, textvariable=self._import_status, justify=tk.LEFT).pack(padx=10, anchor=tk.W)
+        self._import_button = tk.Button(win, text="Cancelar", width=10, command=self.bulk_importer.cancel)
+        self._import_button.pack(pady=10)
+        win.protocol("WM_DELETE_WINDOW", lambda: (self.bulk_importer.cancel(), win.destroy()))
+        self.bulk_importer.start(directories)
+
+    def _on_bulk_found(self, entries):
+        fresh, seen = [], set()
+        for entry in entries:
+            key = path_key(entry.program_path)
+            if key in seen or self.buttons_data.find_by_program(entry.program_path):
+                self._bulk_skipped += 1
+                continue
+            seen.add(key)
+            fresh.append(entry)
+        if fresh:
+            self.buttons_data.extend(fresh)  # Un único aviso "extend" para toda la tanda
+            for entry in fresh:
+                self._request_icon(entry)
+            if len(self.buttons_data) > self.virtual_view_threshold and not self.virtual_view_var.get():
+                self.virtual_view_var.set(True)
+                self._create_buttons_frame()
+            self.update_buttons_display()
+        self._bulk_added += len(fresh)
+        self._update_import_status("Buscando...")
+
+    def _on_bulk_done(self, cancelled):
+        self._update_import_status("Cancelado." if cancelled else "Terminado.")
+        if self._import_window is not None and self._import_window.winfo_exists():
+            self._import_button.config(text="Cerrar", command=self._import_window.destroy)
+        self._import_window = None
+
+    def _update_import_status(self, state):
+        if self._import_window is None or not self._import_window.winfo_exists():
+            return
+        importer = self.bulk_importer
+        self._import_status.set(f"{state}\nCarpetas recorridas: {importer.directories}\n"
+                                f"Añadidos: {self._bulk_added}\nYa existentes: {self._bulk_skipped}\n"
+                                f"Omitidos (necesitan argumentos): {importer.needs_arguments}")
 
     def _load_config_from_file(self, filepath):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                config_data_from_file = json.load(f)
+            with metrics.timer("config_load"):
+                config = load_config(filepath)
         except FileNotFoundError:
             messagebox.showerror("Error", f"Archivo de configuración no encontrado: {filepath}", parent=self.root); return False
         except json.JSONDecodeError:
@@ -158,43 +892,527 @@ class AppLauncher:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo leer el archivo: {filepath}\n{e}", parent=self.root); return False
 
-        temp_buttons_data = []
-        for item in config_data_from_file:
-            if not isinstance(item, dict) or "program_path" not in item:
-                messagebox.showwarning("Formato Incorrecto", "Elemento con formato incorrecto en config omitido.", parent=self.root); continue
-            tk_icon_ref = self._load_and_prepare_icon(item.get("icon_path"))
-            temp_buttons_data.append({
-                "name": item.get("name", os.path.splitext(os.path.basename(item["program_path"]))[0]),
-                "program_path": item["program_path"],
-                "icon_path": item.get("icon_path", ""),
-                "tk_icon_ref": tk_icon_ref
-            })
-        self.buttons_data = temp_buttons_data
+        if config.skipped:
+            messagebox.showwarning("Formato Incorrecto", f"{config.skipped} elemento(s) con formato incorrecto en config omitido(s).", parent=self.root)
+        # Cambios de la sesión anterior que no llegaron a compactarse en el JSON
+        journal = ConfigJournal(filepath)
+        try:
+            recovered = journal.replay(config)
+        except OSError as e:
+            print(f"Advertencia: No se pudo leer el diario de cambios {journal.path}: {e}")
+            recovered = 0
+        if self.startup_profile is not None:
+            self.startup_profile.mark("config parse")
+        self._set_config_journal(journal)
+        # Los iconos se cargan en segundo plano; la cuadrícula se dibuja ya con las letras
+        self._cancel_icon_loads(self.buttons_data)
+        self._set_buttons_data(config.entries)
+        self._apply_config_extras(config)
+        for button_data in self.buttons_data:
+            self._request_icon(button_data)
+        if recovered:
+            self._schedule_compaction(0)
         return True
 
     def open_config(self):
-        if self.buttons_data:
-             if messagebox.askyesno("Guardar Cambios", "¿Desea guardar la configuración actual antes de abrir otra?", parent=self.root):
-                if self.current_config_file: self.save_config()
-                else: self.save_config_as()
         filepath = filedialog.askopenfilename(
             title="Abrir Configuración",
             filetypes=(("Archivos JSON", "*.json"), ("Todos los archivos", "*.*")),
             defaultextension=".json", parent=self.root)
         if not filepath: return
+        self.open_config_file(filepath)
+
+    def open_config_file(self, filepath):
+        existing = self.workspace.find(filepath)
+        if existing is not None and existing is not self.workspace.active:
+            self.switch_profile(existing)  # Ya está abierto en otro perfil: un solo diario por archivo
+            return
+        # También desde la línea de órdenes y la orden remota "open": nada se pierde sin preguntar
+        if self._autosave_active():
+            self.flush_autosave()
+        elif self._unsaved_changes and self.buttons_data:
+            if messagebox.askyesno("Guardar Cambios", "¿Desea guardar la configuración actual antes de abrir otra?", parent=self.root):
+                if self.current_config_file: self.save_config()
+                else: self.save_config_as()
         if self._load_config_from_file(filepath):
-            self.current_config_file = filepath
+            self.current_config_file = self.workspace.active.path = filepath
             self.root.title(f"Lanzador de Aplicaciones - {os.path.basename(filepath)}")
+            if len(self.buttons_data) > self.virtual_view_threshold and not self.virtual_view_var.get():
+                self.virtual_view_var.set(True)
+                self._create_buttons_frame()
             self.update_buttons_display()
+            self._rebuild_profile_ui()
+
+    # --- Perfiles ---
+    def open_in_new_profile(self):
+        filepath = filedialog.askopenfilename(
+            title="Abrir Configuración en un Perfil Nuevo",
+            filetypes=(("Archivos JSON", "*.json"), ("Todos los archivos", "*.*")),
+            defaultextension=".json", parent=self.root)
+        if filepath:
+            self.add_profile(filepath, activate=True)
+
+    def add_profile(self, filepath, activate=False):
+        """Abre `filepath` como perfil. Sin `activate` no se lee hasta que se muestre por primera vez."""
+        profile = self.workspace.find(filepath)
+        if profile is None:
+            profile = self.workspace.add(Profile(filepath))
+        if activate:
+            self.switch_profile(profile)
+        else:
+            self._rebuild_profile_ui()
+        return profile
+
+    def switch_profile(self, profile):
+        if profile is self.workspace.active:
+            self._rebuild_profile_ui()
+            return
+        self._park_active_profile()
+        self._activate_profile(profile)
+
+    def close_profile(self):
+        if len(self.workspace.profiles) == 1:
+            self.new_config()  # Siempre queda un perfil
+            return
+        if self._autosave_active():
+            self.flush_autosave()
+        elif self._unsaved_changes and self.buttons_data:
+            if messagebox.askyesno("Guardar Cambios", "¿Desea guardar la configuración antes de cerrarla?", parent=self.root):
+                if self.current_config_file: self.save_config()
+                else: self.save_config_as()
+        closing = self.workspace.active
+        self._cancel_icon_loads(self.buttons_data)
+        self._detach_buttons_data()
+        self._set_config_journal(None)
+        self.workspace.remove(closing)
+        self._activate_profile(self.workspace.most_recent())
+
+    def _detach_buttons_data(self):
+        if self._on_entries_changed in self.buttons_data.listeners:
+            self.buttons_data.listeners.remove(self._on_entries_changed)
+        # Marcador vacío hasta que se active otro perfil: nada de lo que se cancele ahí es suyo
+        self.buttons_data = EntryStore()
+
+    def _park_active_profile(self):
+        """Pasa el perfil visible a segundo plano conservando sus entradas e iconos."""
+        profile = self.workspace.active
+        if self._autosave_active():
+            self.flush_autosave()
+        if self.bulk_importer is not None:
+            self.bulk_importer.cancel()
+        self.icon_loader.cancel()
+        self._pending_icon_paths.clear()
+        profile.path = self.current_config_file
+        profile.entries = self.buttons_data
+        profile.search_index = self.search_index
+        profile.groups = [g.to_dict() for g in self.launch_groups]
+        profile.settings = dict(self.config_settings)
+        profile.unsaved = self._unsaved_changes
+        self._detach_buttons_data()
+        self._set_config_journal(None)
+        profile.signature = file_signature(profile.path)
+
+    def _activate_profile(self, profile):
+        self.workspace.activate(profile)
+        was_loaded = profile.loaded
+        if not was_loaded:
+            # Primera vez que se muestra: se lee ahora (con su diario), como al abrirlo
+            self.current_config_file = None
+            if profile.path is None or not self._load_config_from_file(profile.path):
+                if profile.path is not None:
+                    self.workspace.remove(profile)
+                    fallback = self.workspace.most_recent() or self.workspace.add(Profile())
+                    self._activate_profile(fallback)
+                    return
+                self._set_buttons_data(EntryStore())
+                self._apply_config_extras(LauncherConfig())
+        else:
+            self._set_buttons_data(profile.entries, profile.search_index)
+            self._set_config_journal(ConfigJournal(profile.path) if profile.path else None)
+            self._apply_config_extras(LauncherConfig(profile.entries, profile.groups, profile.settings))
+            self._unsaved_changes = profile.unsaved
+            for button_data in self.buttons_data:
+                if button_data.tk_icon_ref is None:
+                    self._request_icon(button_data)  # Los expulsados se sirven de la caché de miniaturas
+        self.current_config_file = profile.path
+        self.root.title(f"Lanzador de Aplicaciones - {profile.title}")
+        if len(self.buttons_data) > self.virtual_view_threshold and not self.virtual_view_var.get():
+            self.virtual_view_var.set(True)
+            self._create_buttons_frame()
+        self.update_buttons_display()
+        self._evict_background_icons()
+        self._rebuild_profile_ui()
+        if was_loaded and profile.signature != file_signature(profile.path):
+            self._on_config_file_changed(profile.path)  # Cambió en disco mientras no se veía
+
+    def _evict_background_icons(self):
+        for profile in self.workspace.to_evict(self.icon_pixels * self.icon_pixels * 4):
+            for button_data in profile.entries:
+                self._forget_icon(button_data)
+            metrics.inc("profile_icon_evictions")
+
+    def _rebuild_profile_ui(self):
+        profiles = self.workspace.profiles
+        active = self.workspace.active
+        self.active_profile_var.set(profiles.index(active) if active in profiles else -1)
+        self.profiles_menu.delete(0, tk.END)
+        for child in self.profile_bar.winfo_children():
+            child.destroy()
+        for i, profile in enumerate(profiles):
+            self.profiles_menu.add_radiobutton(label=profile.title, variable=self.active_profile_var, value=i,
+                                               command=lambda p=profile: self.switch_profile(p))
+            tk.Radiobutton(self.profile_bar, text=profile.title, variable=self.active_profile_var, value=i,
+                           indicatoron=False, padx=8, command=lambda p=profile: self.switch_profile(p)
+                           ).pack(side=tk.LEFT, padx=(0, 2))
+        self.profiles_menu.add_separator()
+        self.profiles_menu.add_command(label="Abrir en Perfil Nuevo...", command=self.open_in_new_profile)
+        self.profiles_menu.add_command(label="Cerrar Perfil", command=self.close_profile)
+        if len(profiles) > 1:
+            if not self.profile_bar.winfo_manager():
+                self.profile_bar.pack(fill=tk.X, padx=10, pady=(5, 0), before=self.buttons_frame)
+        else:
+            self.profile_bar.pack_forget()
+
+    # --- Órdenes remotas (launcher_client.py) ---
+    def start_command_server(self):
+        self._remote_commands = queue.SimpleQueue()
+        self.command_server = CommandServer(self._handle_remote_command)
+        if self.command_server.start():
+            self.root.after(50, self._process_remote_commands)
+
+    def stop_command_server(self):
+        if getattr(self, 'command_server', None) is not None:
+            self.command_server.stop()
+
+    def _handle_remote_command(self, verb, argument):
+        # Hilo del servidor: la orden se ejecuta en el hilo de Tk y aquí solo se espera el resultado
+        done, result = threading.Event(), []
+        self._remote_commands.put((verb, argument, result, done))
+        if not done.wait(5.0):
+            return False, ["La interfaz no respondió a tiempo"]
+        return result[0]
+
+    def _process_remote_commands(self):
+        while True:
+            try:
+                verb, argument, result, done = self._remote_commands.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result.append(self._run_remote_command(verb, argument))
+            except Exception as e:
+                result.append((False, [f"Error interno: {e}"]))
+            done.set()
+        self.root.after(50, self._process_remote_commands)
+
+    def _run_remote_command(self, verb, argument):
+        if verb == "metrics":
+            return True, metrics.prometheus_text().splitlines()
+        if verb == "launch":
+            entry = resolve_entry(self.buttons_data, self.search_index, argument)
+            if entry is None:
+                return False, [f"No hay ningún botón llamado '{argument}'"]
+            try:
+                self._spawn_program(entry.program_path, entry.name)
+            except OSError as e:
+                return False, [f"No se pudo lanzar el programa: {entry.program_path}", str(e)]
+            return True, [f"Lanzado: {entry.name}"]
+        if verb == "list":
+            return True, list_lines(self.buttons_data)
+        if verb == "ps":
+            return True, process_lines(self.process_supervisor)
+        if verb == "group":
+            group = self._find_group(argument)
+            if group is None:
+                return False, [f"No hay ningún grupo llamado '{argument}'"]
+            self.run_group(group)
+            return True, [f"Grupo en marcha: {group.name}"]
+        if verb == "reload":
+            if not self.current_config_file:
+                return False, ["No hay ninguna configuración abierta"]
+            if not self.reload_config_file():
+                return False, [f"No se pudo recargar {self.current_config_file}"]
+            return True, [f"{len(self.buttons_data)} botones cargados"]
+        if verb == "open":
+            self.open_config_file(argument)
+            return self.current_config_file == argument, [f"Configuración actual: {self.current_config_file}"]
+        if verb == "show":
+            self.root.deiconify(); self.root.lift(); self.root.focus_force()
+            return True, []
+        return False, [f"Orden desconocida: {verb}"]
+
+    def _apply_config_extras(self, config):
+        self.launch_groups = parse_groups(config.groups)
+        self.config_settings = dict(config.settings)
+        self.launch_debouncer.window_s = self.config_settings.get("launch_debounce_ms", 800) / 1000
+        self.autosave_var.set(self.config_settings.get("autosave", True))
+        self.set_icon_size(self.config_settings.get("icon_size", DEFAULT_ICON_SIZE))
+        self.usage_order_var.set(self.config_settings.get("usage_order", False))
+        responsive = self.config_settings.get("responsive_layout", False)
+        if responsive != self.responsive_var.get():
+            self.responsive_var.set(responsive)
+            self._apply_responsive_layout()
+        self._rebuild_groups_menu()
+
+    def _current_config(self):
+        return LauncherConfig(self.buttons_data, [g.to_dict() for g in self.launch_groups], self.config_settings)
 
     def _prepare_data_for_saving(self):
-        return [{"name": b["name"], "program_path": b["program_path"], "icon_path": b["icon_path"]} for b in self.buttons_data]
+        return self._current_config().to_json()
+
+    # --- Grupos de lanzamiento ---
+    def _rebuild_groups_menu(self):
+        self.groups_menu.delete(0, tk.END)
+        for group in self.launch_groups:
+            self.groups_menu.add_command(label=f"Lanzar '{group.name}' ({len(group.members)})",
+                                         command=lambda g=group: self.run_group(g))
+        if self.launch_groups:
+            self.groups_menu.add_separator()
+        self.groups_menu.add_command(label="Nuevo Grupo...", command=self.new_group_dialog)
+        self.groups_menu.add_command(label="Eliminar Grupo...", command=self.delete_group_dialog)
+        self.groups_menu.add_command(label="Intervalo Anti Doble Clic...", command=self.debounce_dialog)
+
+    def _find_group(self, name):
+        for group in self.launch_groups:
+            if group.name == name:
+                return group
+        return None
+
+    def run_group(self, group):
+        if not self.launch_debouncer.allow(("grupo", group.name)):
+            return
+        self._tick_group_run(GroupRun(group), [])
+
+    def _tick_group_run(self, run, missing):
+        for member in run.ready(time.monotonic()):
+            entry = member.resolve(self.buttons_data)
+            if entry is not None:
+                self._launch_program(entry.program_path, entry.name)
+            else:
+                missing.append(member.button)
+        wait = run.next_wakeup(time.monotonic())
+        if wait is not None:
+            self.root.after(max(1, int(wait * 1000)), self._tick_group_run, run, missing)
+        elif missing:
+            messagebox.showwarning("Grupo", f"Botones del grupo '{run.group.name}' no encontrados o con nombre repetido:\n"
+                                   + "\n".join(missing), parent=self.root)
+
+    def new_group_dialog(self):
+        if not self.buttons_data: messagebox.showinfo("Grupos", "No hay botones para agrupar.", parent=self.root); return
+        group_win = tk.Toplevel(self.root)
+        group_win.title("Nuevo Grupo")
+        group_win.transient(self.root); group_win.grab_set()
+
+        name_var = tk.StringVar(value="Espacio de trabajo")
+        concurrency_var = tk.IntVar(value=3)
+        sequential_var = tk.BooleanVar(value=False)
+        delay_var = tk.DoubleVar(value=1.0)
+
+        form = tk.Frame(group_win, padx=10, pady=10); form.pack(fill=tk.BOTH, expand=True)
+        tk.Label(form, text="Nombre:").grid(row=0, column=0, sticky=tk.W, pady=2)
+        name_e = tk.Entry(form, textvariable=name_var, width=40); name_e.grid(row=0, column=1, sticky=tk.EW, pady=2)
+        tk.Label(form, text="Botones:").grid(row=1, column=0, sticky=tk.NW, pady=2)
+        members_list = tk.Listbox(form, selectmode=tk.MULTIPLE, height=min(12, len(self.buttons_data)), exportselection=False)
+        for entry in self.buttons_data:
+            members_list.insert(tk.END, entry.name)
+        members_list.grid(row=1, column=1, sticky=tk.NSEW, pady=2)
+        tk.Label(form, text="Simultáneos:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        tk.Spinbox(form, from_=1, to=20, textvariable=concurrency_var, width=5).grid(row=2, column=1, sticky=tk.W, pady=2)
+        tk.Checkbutton(form, text="En orden (cada uno tras el anterior)", variable=sequential_var).grid(row=3, column=1, sticky=tk.W)
+        tk.Label(form, text="Retraso (s):").grid(row=4, column=0, sticky=tk.W, pady=2)
+        tk.Spinbox(form, from_=0, to=60, increment=0.5, textvariable=delay_var, width=5).grid(row=4, column=1, sticky=tk.W, pady=2)
+
+        def on_save():
+            name = name_var.get().strip()
+            selected = members_list.curselection()
+            if not name or not selected:
+                messagebox.showerror("Error", "Indique un nombre y al menos un botón.", parent=group_win); return
+            try:
+                concurrency, delay = concurrency_var.get(), delay_var.get()
+            except tk.TclError:
+                messagebox.showerror("Error", "Valores numéricos no válidos.", parent=group_win); return
+            members, previous = [], None
+            for idx in selected:
+                entry = self.buttons_data[idx]
+                if sequential_var.get() and previous is not None:
+                    member = GroupMember(entry.name, entry.program_path, after=previous.key, delay=delay)
+                else:
+                    member = GroupMember(entry.name, entry.program_path)
+                members.append(member)
+                previous = member
+            self.launch_groups = [g for g in self.launch_groups if g.name != name]
+            self.launch_groups.append(LaunchGroup(name, members, concurrency))
+            self._journal_groups()
+            self._rebuild_groups_menu(); group_win.destroy()
+
+        btn_frame = tk.Frame(group_win, pady=5); btn_frame.pack(fill=tk.X)
+        tk.Button(btn_frame, text="Guardar Grupo", command=on_save, width=15).pack(side=tk.RIGHT, padx=5)
+        tk.Button(btn_frame, text="Cancelar", command=group_win.destroy, width=10).pack(side=tk.RIGHT, padx=5)
+        name_e.focus_set()
+
+    def delete_group_dialog(self):
+        if not self.launch_groups: messagebox.showinfo("Grupos", "No hay grupos para eliminar.", parent=self.root); return
+        prompt = "Introduce el número del grupo a eliminar:\n\n" + "\n".join(
+            f"{i+1}. {g.name}" for i, g in enumerate(self.launch_groups))
+        num = simpledialog.askinteger("Eliminar Grupo", prompt, parent=self.root, minvalue=1, maxvalue=len(self.launch_groups))
+        if num is not None:
+            del self.launch_groups[num - 1]; self._journal_groups(); self._rebuild_groups_menu()
+
+    def debounce_dialog(self):
+        current = int(self.launch_debouncer.window_s * 1000)
+        value = simpledialog.askinteger("Anti Doble Clic", "Milisegundos durante los que se ignora un segundo lanzamiento del mismo programa:",
+                                        parent=self.root, minvalue=0, maxvalue=10000, initialvalue=current)
+        if value is not None:
+            self.config_settings["launch_debounce_ms"] = value
+            self.launch_debouncer.window_s = value / 1000
+            self._journal({"op": "settings", "settings": dict(self.config_settings)})
+
+    # --- Recarga en caliente ---
+    def _on_config_file_changed(self, filepath):
+        if self._unsaved_changes and not messagebox.askyesno(
+                "Configuración Modificada",
+                f"{os.path.basename(filepath)} ha cambiado en disco.\n"
+                "¿Recargarlo y descartar los cambios sin guardar?", parent=self.root):
+            return
+        self.reload_config_file()
+
+    def reload_config_file(self):
+        """Vuelve a leer el archivo actual y aplica solo las diferencias.
+
+        Las entradas sin cambios conservan sus widgets e iconos ya decodificados.
+        Devuelve False si el archivo no se pudo leer.
+        """
+        filepath = self.current_config_file
+        try:
+            config = load_config(filepath)
+        except (OSError, ValueError) as e:
+            # Puede ser una escritura a medias de otra herramienta: se espera al siguiente cambio
+            print(f"Advertencia: No se pudo recargar {filepath}: {e}")
+            return False
+        ops = diff_entries(list(self.buttons_data), list(config.entries))
+        previous_icons = {self.buttons_data[index].uid: self.buttons_data[index].icon_path
+                          for op, index, _ in ops if op == "update"}
+        self._applying_external_change = True
+        try:
+            added, removed, updated = apply_diff(self.buttons_data, ops)
+            if config.groups != [g.to_dict() for g in self.launch_groups] or config.settings != self.config_settings:
+                self._apply_config_extras(config)
+        finally:
+            self._applying_external_change = False
+        if self.config_journal is not None:
+            self.config_journal.discard()  # Sus cambios se referían al contenido anterior
+        self._acknowledge_own_write()
+        for button_data in removed:
+            self._forget_icon(button_data)
+        for button_data in updated:
+            if button_data.icon_path != previous_icons[button_data.uid]:
+                self._request_icon(button_data)
+        for button_data in added:
+            self._request_icon(button_data)
+        if ops:
+            self.update_buttons_display()
+        return True
+
+    # --- Guardado automático: diario de cambios y compactación diferida ---
+    COMPACT_DELAY_MS = 2000
+
+    def _autosave_active(self):
+        return self.autosave_var.get() and self.config_journal is not None
+
+    def _cancel_compaction(self):
+        if self._compact_job is not None:
+            try:
+                self.root.after_cancel(self._compact_job)
+            except tk.TclError:
+                pass  # La ventana ya se destruyó
+            self._compact_job = None
+
+    def _set_config_journal(self, journal):
+        # El diario y el vigilante siguen siempre al archivo asociado a la configuración actual
+        self._cancel_compaction()
+        if self.config_journal is not None:
+            self.config_journal.close()
+        self.config_journal = journal
+        path = journal.config_path if journal is not None else None
+        if self.config_watcher is not None and self.config_watcher.path != os.path.abspath(path or ""):
+            self.config_watcher.stop()
+            self.config_watcher = None
+        if path is not None and self.config_watcher is None:
+            self.config_watcher = ConfigWatcher(self.root, path, self._on_config_file_changed)
+        self._acknowledge_own_write()
+
+    def _acknowledge_own_write(self):
+        self._unsaved_changes = False
+        if self.config_watcher is not None:
+            self.config_watcher.acknowledge()
+
+    def _journal(self, op):
+        self._journal_many((op,))
+
+    def _journal_many(self, ops):
+        # Cada cambio cuesta una línea en el diario (un bloque, una sola sincronización); el JSON
+        # completo se reescribe con retraso
+        if not ops or self._applying_external_change:
+            return
+        self._unsaved_changes = True
+        if not self._autosave_active():
+            return
+        try:
+            self.config_journal.record_many(ops)
+        except OSError as e:
+            print(f"Advertencia: No se pudo escribir en el diario de cambios: {e}")
+        self._schedule_compaction()
+
+    def _journal_groups(self):
+        self._journal({"op": "groups", "groups": [g.to_dict() for g in self.launch_groups]})
+
+    def _schedule_compaction(self, delay_ms=None):
+        self._cancel_compaction()
+        self._compact_job = self.root.after(self.COMPACT_DELAY_MS if delay_ms is None else delay_ms,
+                                            self._compact_config)
+
+    def _compact_config(self):
+        self._compact_job = None
+        if self.config_journal is None:
+            return
+        try:
+            with metrics.timer("config_save"):
+                self.config_journal.compact(self._current_config())
+            self._acknowledge_own_write()
+            write_compiled(self.config_journal.config_path, self._current_config())
+        except Exception as e:
+            message = f"No se pudo guardar: {self.config_journal.config_path}\n{e}\n\nLos cambios siguen registrados en el diario."
+            try:
+                messagebox.showerror("Error al Guardar", message, parent=self.root)
+            except tk.TclError:
+                print(message)
+
+    def flush_autosave(self):
+        """Compacta ya los cambios pendientes del diario (al cambiar de archivo o al salir)."""
+        if self.config_journal is not None and (self._compact_job is not None or self.config_journal.pending):
+            self._cancel_compaction()
+            self._compact_config()
+
+    def quit(self):
+        self.flush_autosave()
+        self.save_usage_history()
+        self.root.quit()
+
+    def toggle_autosave(self):
+        enabled = self.autosave_var.get()
+        self.config_settings["autosave"] = enabled
+        if self.config_journal is None:
+            return
+        if enabled:
+            self._journal({"op": "settings", "settings": dict(self.config_settings)})
+        else:
+            # Se guarda una última vez (con el propio ajuste); a partir de aquí solo se guarda a mano
+            self.save_config()
 
     def save_config(self):
         if self.current_config_file:
             try:
-                with open(self.current_config_file, 'w', encoding='utf-8') as f:
-                    json.dump(self._prepare_data_for_saving(), f, indent=2)
+                self._write_config_file(self.current_config_file)
             except Exception as e:
                 messagebox.showerror("Error al Guardar", f"No se pudo guardar: {self.current_config_file}\n{e}", parent=self.root)
         else: self.save_config_as()
@@ -205,16 +1423,30 @@ class AppLauncher:
             filetypes=(("Archivos JSON", "*.json"), ("Todos los archivos", "*.*")),
             defaultextension=".json", initialfile="lanzador_config.json", parent=self.root)
         if not filepath: return
+        if self._autosave_active():
+            self.flush_autosave()  # Lo pendiente pertenece al archivo anterior
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self._prepare_data_for_saving(), f, indent=2)
+            self._write_config_file(filepath)
             self.current_config_file = filepath
             self.root.title(f"Lanzador de Aplicaciones - {os.path.basename(filepath)}")
+            self.workspace.active.path = filepath
+            self._rebuild_profile_ui()
         except Exception as e:
             messagebox.showerror("Error al Guardar", f"No se pudo guardar en {filepath}:\n{e}", parent=self.root)
 
+    def _write_config_file(self, filepath):
+        # Escritura atómica: un cierre a mitad nunca deja el JSON a medias
+        with metrics.timer("config_save"):
+            atomic_write_json(filepath, self._prepare_data_for_saving())
+        write_compiled(filepath, self._current_config())
+        self._cancel_compaction()
+        if self.config_journal is None or self.config_journal.config_path != filepath:
+            self._set_config_journal(ConfigJournal(filepath))
+        self.config_journal.discard()
+        self._acknowledge_own_write()
+
     def _get_button_list_for_dialog(self):
-        return "\n".join([f"{i+1}. {data['name']}" for i, data in enumerate(self.buttons_data)])
+        return "\n".join([f"{i+1}. {data.name}" for i, data in enumerate(self.buttons_data)])
 
     def _select_file_for_entry(self, entry_var, title_suffix, file_type_pattern, dialog_parent):
         filetypes_map = {
@@ -233,9 +1465,9 @@ class AppLauncher:
         edit_win.title("Modificar Botón")
         edit_win.transient(self.root); edit_win.grab_set(); edit_win.resizable(False, False)
 
-        name_var = tk.StringVar(value=original_data['name'])
-        prog_var = tk.StringVar(value=original_data['program_path'])
-        icon_var = tk.StringVar(value=original_data['icon_path'])
+        name_var = tk.StringVar(value=original_data.name)
+        prog_var = tk.StringVar(value=original_data.program_path)
+        icon_var = tk.StringVar(value=original_data.icon_path)
 
         form = tk.Frame(edit_win, padx=10, pady=10); form.pack(fill=tk.BOTH, expand=True)
         tk.Label(form, text="Nombre:").grid(row=0, column=0, sticky=tk.W, pady=2)
@@ -245,7 +1477,7 @@ class AppLauncher:
         tk.Button(form, text="...", command=lambda: self._select_file_for_entry(prog_var, "Ejecutables", "*.exe", edit_win)).grid(row=1, column=2, padx=(5,0))
         tk.Label(form, text="Icono:").grid(row=2, column=0, sticky=tk.W, pady=2)
         icon_e = tk.Entry(form, textvariable=icon_var, width=40); icon_e.grid(row=2, column=1, sticky=tk.EW, pady=2)
-        tk.Button(form, text="...", command=lambda: self._select_file_for_entry(icon_var, "Imágenes", "*.png *.gif *.jpg *.jpeg *.ico", edit_win)).grid(row=2, column=2, padx=(5,0))
+        tk.Button(form, text="...", command=lambda: self._select_file_for_entry(icon_var, "Imágenes", "*.png *.gif *.jpg *.jpeg *.ico *.exe *.dll", edit_win)).grid(row=2, column=2, padx=(5,0))
 
         btn_frame = tk.Frame(edit_win, pady=5); btn_frame.pack(fill=tk.X)
         def on_save():
@@ -253,13 +1485,13 @@ class AppLauncher:
             if not new_name or not new_prog:
                 messagebox.showerror("Error", "Nombre y programa no pueden estar vacíos.", parent=edit_win); return
             
-            self.buttons_data[button_index]['name'] = new_name
-            self.buttons_data[button_index]['program_path'] = new_prog
-            if self.buttons_data[button_index]['icon_path'] != new_icon or \
-               (new_icon and not self.buttons_data[button_index]['tk_icon_ref']) or \
-               (not new_icon and self.buttons_data[button_index]['tk_icon_ref']):
-                self.buttons_data[button_index]['icon_path'] = new_icon
-                self.buttons_data[button_index]['tk_icon_ref'] = self._load_and_prepare_icon(new_icon)
+            new_icon = normalize_path(new_icon)
+            reload_icon = original_data.icon_path != new_icon or \
+               (new_icon and not original_data.tk_icon_ref) or \
+               (not new_icon and original_data.tk_icon_ref)
+            self.buttons_data.update(original_data, name=new_name, program_path=new_prog, icon_path=new_icon)
+            if reload_icon:
+                self._request_icon(original_data)
             self.update_buttons_display(); edit_win.destroy()
 
         tk.Button(btn_frame, text="Guardar Cambios", command=on_save, width=15).pack(side=tk.RIGHT, padx=5)
@@ -282,28 +1514,100 @@ class AppLauncher:
         num = simpledialog.askinteger("Eliminar Botón", prompt, parent=self.root, minvalue=1, maxvalue=len(self.buttons_data))
         if num is not None:
             idx = num - 1
-            name = self.buttons_data[idx]['name']
+            name = self.buttons_data[idx].name
             if messagebox.askyesno("Confirmar", f"¿Eliminar el botón '{name}'?", parent=self.root):
-                del self.buttons_data[idx]; self.update_buttons_display()
+                self._forget_icon(self.buttons_data.pop(idx)); self.update_buttons_display()
 
 def check_and_install_pillow():
+    # Solo se comprueba que esté instalado: PIL se importa con el primer icono que se decodifique
+    if importlib.util.find_spec("PIL") is not None:
+        return True
+    print("Pillow (PIL) no instalado.")
     try:
-        from PIL import Image, ImageTk; return True
-    except ImportError:
-        print("Pillow (PIL) no instalado.")
-        try:
-            import pip; print("Intentando instalar Pillow...")
-            if hasattr(pip, 'main'): pip.main(['install', 'Pillow'])
-            else: from pip._internal.cli.main import main as pip_main; pip_main(['install', 'Pillow'])
-            print("\nPillow debería estar instalado. REINICIE la aplicación.");
-            temp_root = tk.Tk(); temp_root.withdraw()
-            messagebox.showinfo("Instalación", "Pillow instalado. Reinicie la aplicación.", parent=temp_root)
-            temp_root.destroy(); return False
-        except ImportError: print("pip no disponible."); messagebox.showerror("Error", "Pillow necesario. pip no disponible."); return False
-        except Exception as e: print(f"Error instalando Pillow: {e}"); messagebox.showerror("Error", f"Pillow necesario. Error: {e}"); return False
+        import pip; print("Intentando instalar Pillow...")
+        if hasattr(pip, 'main'): pip.main(['install', 'Pillow'])
+        else: from pip._internal.cli.main import main as pip_main; pip_main(['install', 'Pillow'])
+        print("\nPillow debería estar instalado. REINICIE la aplicación.");
+        temp_root = tk.Tk(); temp_root.withdraw()
+        messagebox.showinfo("Instalación", "Pillow instalado. Reinicie la aplicación.", parent=temp_root)
+        temp_root.destroy(); return False
+    except ImportError: print("pip no disponible."); messagebox.showerror("Error", "Pillow necesario. pip no disponible."); return False
+    except Exception as e: print(f"Error instalando Pillow: {e}"); messagebox.showerror("Error", f"Pillow necesario. Error: {e}"); return False
+
+def report_startup_profile(app, profile, started=None):
+    """Espera (sin bloquear) a que terminen de decodificarse los iconos e imprime la tabla."""
+    started = time.perf_counter() if started is None else started
+    if app.icon_loader.pending():
+        app.root.after(10, report_startup_profile, app, profile, started)
+        return
+    # La decodificación empieza al leer la configuración y se solapa con la primera pintura
+    parsed_at = next((at for phase, _, at in profile.phases if phase == "config parse"), None)
+    if parsed_at is not None:
+        profile.record("icon decode", time.perf_counter() - profile.start - parsed_at)
+    else:
+        profile.record("icon decode", 0.0)
+    app.startup_profile = None
+    profile.report()
+
+def hand_off_to_running_instance(config_file):
+    """Si ya hay un lanzador en marcha, le pasa la orden y devuelve True.
+
+    Cualquier respuesta cuenta como entregada (los errores de la orden se muestran); solo si
+    no se puede conectar se devuelve False y se arranca una instancia nueva.
+    """
+    try:
+        if config_file:
+            ok, lines = send_command(f"open {os.path.abspath(config_file)}")
+        else:
+            ok, lines = send_command("show")
+    except OSError:
+        return False
+    if not ok:
+        for line in lines:
+            print(line, file=sys.stderr)
+    return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lanzador de Aplicaciones")
+    parser.add_argument("config", nargs="*",
+                        help="Configuraciones JSON a abrir al iniciar (las siguientes a la primera, como perfiles)")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="No delegar en un lanzador que ya esté en marcha")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Mostrar el tiempo de cada fase del arranque")
+    parser.add_argument("--scale", type=float,
+                        help="Factor de escala de la pantalla (por defecto se deduce de los ppp)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Registrar métricas de rendimiento desde el arranque")
+    parser.add_argument("--metrics-export", metavar="ARCHIVO",
+                        help="Exportar las métricas periódicamente (.prom: Prometheus; otro: JSONL)")
+    args = parser.parse_args()
+    if args.metrics or args.metrics_export: metrics.enabled = True
+    profile = StartupProfile(_IMPORT_START) if args.profile_startup else None
+    if profile: profile.mark("imports")
+    if not args.new_instance and hand_off_to_running_instance(args.config[0] if args.config else None): exit()
     if not check_and_install_pillow(): exit()
     main_root_window = tk.Tk()
-    app = AppLauncher(main_root_window)
-    main_root_window.mainloop()
+    app = AppLauncher(main_root_window, ui_scale=args.scale)
+    app.startup_profile = profile
+    if profile: profile.mark("Tk init")
+    if args.config: app.open_config_file(os.path.abspath(args.config[0]))
+    for extra_config in args.config[1:]:
+        app.add_profile(os.path.abspath(extra_config))  # Se leen al mostrarlos por primera vez
+    if profile:
+        profile.mark("grid build")
+        main_root_window.update()
+        profile.mark("first paint")
+        report_startup_profile(app, profile)
+    app.start_command_server()
+    if args.metrics_export: app.start_metrics_export(args.metrics_export)
+    try:
+        main_root_window.mainloop()
+    finally:
+        app.flush_autosave()
+        app.save_usage_history()
+        app.stop_command_server()
+        app.path_validator.shutdown()
+        if app.bulk_importer is not None:
+            app.bulk_importer.shutdown()
+        if args.metrics_export: app.export_metrics(args.metrics_export)
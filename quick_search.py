@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import operator
+
+
+_EMPTY = frozenset()
+_SEPARATORS = str.maketrans({"/": " ", "\\": " ", "_": " ", "-": " ", ".": " ", ",": " "})
+_PATH_SCAN_LIMIT = 2000  # Máximo de candidatos solo-por-ruta que se puntúan por consulta
+
+
+def _fold(text):
+    return " ".join(text.lower().translate(_SEPARATORS).split())
+
+
+def _trigrams(text):
+    # Cada palabra empieza con un espacio, así " pr" identifica el inicio de "program"
+    padded = " " + text
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _word_prefixes(text):
+    prefixes = set()
+    for word in text.split():
+        prefixes.add(word[:1])
+        prefixes.add(word[:2])
+    return prefixes
+
+
+def _is_subsequence(needle, haystack):
+    it = iter(haystack)
+    return all(ch in it for ch in needle)
+
+
+def _score(query, query_grams, name, path, name_grams, path_grams):
+    value = 0.0
+    if query_grams:
+        value += 10.0 * max(len(query_grams & name_grams), 0.5 * len(query_grams & path_grams)) / len(query_grams)
+    if name.startswith(query):
+        value += 20.0
+    elif query in name:
+        value += 12.0
+    elif query in path:
+        value += 4.0
+    elif _is_subsequence(query, name):
+        value += 6.0
+    return value - 0.01 * len(name)
+
+
+def _rarest_union(index, grams, count=3):
+    postings = sorted((p for p in (index.get(gram) for gram in grams) if p), key=len)
+    if not postings:
+        return _EMPTY
+    # Se toleran erratas: basta con compartir alguno de los trigramas más raros
+    return set().union(*postings[:count])
+
+
+class SearchIndex:
+    """Índice de búsqueda difusa por nombre y ruta del programa.
+
+    Mantiene listas invertidas de trigramas y de prefijos de palabra de 1-2 caracteres (por
+    nombre y por ruta) que se actualizan entrada a entrada, de modo que cada pulsación solo
+    puntúa los candidatos que comparten los trigramas menos frecuentes de la consulta. Las
+    coincidencias en la ruta solo completan los resultados cuando el nombre no da bastantes.
+
+    `rebuild` no indexa en el acto: deja las entradas pendientes para que se indexen por
+    tandas con `index_pending` (en tiempo ocioso). Mientras tanto la búsqueda recorre las
+    pendientes una a una, sin indexarlas, y solo encuentra en ellas subcadenas o subsecuencias.
+    """
+
+    def __init__(self, entries=()):
+        # uid -> (entrada, nombre, ruta, trigramas de nombre y de ruta, prefijos de nombre y de ruta)
+        self._docs = {}
+        self._name_grams = {}
+        self._path_grams = {}
+        self._name_prefixes = {}
+        self._path_prefixes = {}
+        self._pending = {}  # uid -> entrada aún sin indexar
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self._docs) + len(self._pending)
+
+    def rebuild(self, entries):
+        self._docs.clear()
+        self._name_grams.clear()
+        self._path_grams.clear()
+        self._name_prefixes.clear()
+        self._path_prefixes.clear()
+        self._pending = {entry.uid: entry for entry in entries}
+
+    def index_pending(self, limit=None):
+        """Indexa hasta `limit` entradas pendientes (todas si es None). Devuelve cuántas quedan."""
+        pending = self._pending
+        count = len(pending) if limit is None else min(limit, len(pending))
+        for uid in list(itertools.islice(pending, count)):
+            self._add(pending.pop(uid))
+        return len(pending)
+
+    def add(self, entry):
+        if self._pending:
+            self._pending[entry.uid] = entry
+        else:
+            self._add(entry)
+
+    def _add(self, entry):
+        name, path = _fold(entry.name), _fold(entry.program_path)
+        name_grams, path_grams = _trigrams(name), _trigrams(path)
+        name_prefixes, path_prefixes = _word_prefixes(name), _word_prefixes(path)
+        self._docs[entry.uid] = (entry, name, path, name_grams, path_grams, name_prefixes, path_prefixes)
+        for index, keys in ((self._name_grams, name_grams), (self._path_grams, path_grams),
+                            (self._name_prefixes, name_prefixes), (self._path_prefixes, path_prefixes)):
+            for key in keys:
+                index.setdefault(key, set()).add(entry.uid)
+
+    def remove(self, entry):
+        if self._pending.pop(entry.uid, None) is not None:
+            return
+        doc = self._docs.pop(entry.uid, None)
+        if doc is None:
+            return
+        for index, keys in ((self._name_grams, doc[3]), (self._path_grams, doc[4]),
+                            (self._name_prefixes, doc[5]), (self._path_prefixes, doc[6])):
+            for key in keys:
+                postings = index.get(key)
+                if postings is not None:
+                    postings.discard(entry.uid)
+                    if not postings:
+                        del index[key]
+
+    def update(self, entry):
+        if entry.uid in self._pending:
+            return  # Se indexará con sus valores actuales
+        self.remove(entry)
+        self.add(entry)
+
+    def search(self, query, limit=8):
+        query = _fold(query)
+        if not query:
+            return []
+        docs = self._docs
+        query_grams = _trigrams(query) if len(query) >= 3 else None
+
+        def score(uid):
+            _, name, path, name_grams, path_grams, _, _ = docs[uid]
+            return _score(query, query_grams, name, path, name_grams, path_grams)
+
+        # Primero las coincidencias en el nombre; la ruta solo completa si faltan resultados
+        if query_grams is None:
+            name_candidates = self._name_prefixes.get(query, _EMPTY)
+            path_candidates = self._path_prefixes.get(query, _EMPTY)
+        else:
+            name_candidates = _rarest_union(self._name_grams, query_grams)
+            path_candidates = _rarest_union(self._path_grams, query_grams)
+        best = heapq.nlargest(limit, name_candidates, key=score)
+        if len(best) < limit:
+            best += heapq.nlargest(limit - len(best), itertools.islice(
+                (uid for uid in path_candidates if uid not in name_candidates), _PATH_SCAN_LIMIT), key=score)
+        if not self._pending:
+            return [docs[uid][0] for uid in best]
+        hits = [(score(uid), docs[uid][0]) for uid in best] + self._scan_pending(query, query_grams, limit)
+        return [entry for _, entry in heapq.nlargest(limit, hits, key=operator.itemgetter(0))]
+
+    def _scan_pending(self, query, query_grams, limit):
+        """Puntúa las entradas aún sin indexar que contienen la consulta (o la tienen como subsecuencia)."""
+        hits = []
+        compact = query.replace(" ", "")
+        for entry in self._pending.values():
+            name, path = _fold(entry.name), _fold(entry.program_path)
+            if query in name or query in path or _is_subsequence(compact, name.replace(" ", "")):
+                grams = (_trigrams(name), _trigrams(path)) if query_grams else (_EMPTY, _EMPTY)
+                hits.append((_score(query, query_grams, name, path, *grams), entry))
+        return heapq.nlargest(limit, hits, key=operator.itemgetter(0))
@@ -0,0 +1,31 @@
+import sys
+import time
+
+
+class StartupProfile:
+    """Mide las fases del arranque (--profile-startup) y las imprime como tabla.
+
+    `mark(fase)` cierra la fase que termina en ese instante; `record(fase, segundos)` añade una
+    fase medida aparte (p. ej. trabajo en segundo plano que se solapa con las demás).
+    """
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []  # (fase, duración, instante desde el inicio)
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, now - self.start))
+        self._last = now
+
+    def record(self, phase, seconds, at=None):
+        at = time.perf_counter() if at is None else at
+        self.phases.append((phase, seconds, at - self.start))
+
+    def report(self, file=None):
+        file = file or sys.stderr
+        width = max([len(phase) for phase, _, _ in self.phases] + [4])
+        print(f"{'Fase':<{width}}  {'ms':>9}  {'desde inicio':>12}", file=file)
+        for phase, seconds, at in self.phases:
+            print(f"{phase:<{width}}  {seconds * 1000:>9.1f}  {at * 1000:>12.1f}", file=file)
@@ -0,0 +1,165 @@
+"""Pruebas del diario de cambios y de la caché compilada sobre archivos reales."""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_cache import CompiledConfig, cache_path_for, load_config, write_compiled
+from config_journal import ConfigJournal, entry_op, file_sha1
+from entries import ButtonEntry, read_config
+
+
+BUTTONS = [
+    {"name": "Editor", "program_path": "C:/Programas/editor.exe", "icon_path": "C:/Iconos/editor.ico"},
+    {"name": "Visor", "program_path": "/usr/bin/visor", "icon_path": ""},
+    {"name": "Ñandú", "program_path": "C:/Programas/ñandú.exe", "icon_path": "C:/Programas/ñandú.exe,2"},
+]
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "lanzador.json"
+    path.write_text(json.dumps(BUTTONS), encoding="utf-8")
+    return str(path)
+
+
+def _names(config):
+    return [entry.name for entry in config.entries]
+
+
+def _record_changes(journal, config):
+    """Añade, modifica y elimina botones y cambia los ajustes, registrando cada paso."""
+    entries = config.entries
+    entries.listeners.append(lambda event, entry, index: journal.record(entry_op(event, entry, index)))
+    entries.insert(1, ButtonEntry("Nuevo", "/opt/nuevo"))
+    entries.update(entries[0], name="Editor 2")
+    entries.pop(3)
+    config.settings = {"icon_size": 48}
+    journal.record({"op": "settings", "settings": config.settings})
+
+
+def test_replay_applies_recorded_ops(config_path):
+    config = read_config(config_path)
+    journal = ConfigJournal(config_path)
+    _record_changes(journal, config)
+    journal.close()
+
+    replayed = read_config(config_path)
+    assert ConfigJournal(config_path).replay(replayed) == 4
+    assert _names(replayed) == ["Editor 2", "Nuevo", "Visor"] == _names(config)
+    assert replayed.settings == {"icon_size": 48}
+
+
+def test_torn_last_line_is_truncated(config_path):
+    journal = ConfigJournal(config_path)
+    journal.record(entry_op("add", ButtonEntry("Uno", "/opt/uno"), 3))
+    journal.close()
+    intact = os.path.getsize(journal.path)
+    with open(journal.path, "ab") as f:
+        f.write(b'{"op": "add", "index": 4, "entry": {"na')  # Cierre brusco a mitad de línea
+
+    config = read_config(config_path)
+    journal = ConfigJournal(config_path)
+    assert journal.replay(config) == 1
+    assert os.path.getsize(journal.path) == intact
+    journal.record(entry_op("add", ButtonEntry("Dos", "/opt/dos"), 4))  # Se sigue añadiendo tras el recorte
+    journal.close()
+
+    config = read_config(config_path)
+    assert ConfigJournal(config_path).replay(config) == 2
+    assert _names(config)[3:] == ["Uno", "Dos"]
+
+
+def test_base_mismatch_discards_journal(config_path):
+    journal = ConfigJournal(config_path)
+    journal.record(entry_op("remove", None, 0))
+    journal.close()
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(BUTTONS[:2], f)  # Editado fuera: el diario ya no corresponde a este JSON
+
+    config = read_config(config_path)
+    assert ConfigJournal(config_path).replay(config) == 0
+    assert _names(config) == ["Editor", "Visor"]
+    assert not os.path.exists(journal.path)
+
+
+def test_read_only_replay_leaves_journal_untouched(config_path):
+    journal = ConfigJournal(config_path)
+    journal.record(entry_op("remove", None, 0))
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b'{"op": "rem')
+    with open(journal.path, "rb") as f:
+        before = f.read()
+
+    config = read_config(config_path)
+    assert ConfigJournal(config_path).replay(config, read_only=True) == 1
+    assert _names(config) == ["Visor", "Ñandú"]
+    with open(config_path, "a", encoding="utf-8") as f:
+        f.write("\n")  # Otra base: tampoco se descarta
+    assert ConfigJournal(config_path).replay(read_config(config_path), read_only=True) == 0
+    with open(journal.path, "rb") as f:
+        assert f.read() == before
+
+
+def test_compact_writes_json_and_restarts_journal(config_path):
+    config = read_config(config_path)
+    journal = ConfigJournal(config_path)
+    _record_changes(journal, config)
+    journal.compact(config)
+    assert not os.path.exists(journal.path) and journal.pending == 0
+    compacted = read_config(config_path)
+    assert _names(compacted) == ["Editor 2", "Nuevo", "Visor"]
+    assert compacted.settings == {"icon_size": 48}
+
+    journal.record(entry_op("remove", None, 1))  # El diario nuevo parte del JSON compactado
+    journal.close()
+    with open(journal.path, encoding="utf-8") as f:
+        assert json.loads(f.readline()) == {"base": file_sha1(config_path).hex()}
+    assert ConfigJournal(config_path).replay(compacted) == 1
+    assert _names(compacted) == ["Editor 2", "Visor"]
+
+
+def test_compiled_cache_round_trip(config_path):
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({"buttons": BUTTONS + [{"name": "sin programa"}], "groups": [{"name": "g", "members": []}],
+                   "settings": {"autosave": False}}, f)
+    source = load_config(config_path)
+    assert os.path.exists(cache_path_for(config_path))
+    compiled = CompiledConfig(cache_path_for(config_path))
+    try:
+        assert compiled.is_fresh_for(config_path)
+        cached = compiled.to_config()
+    finally:
+        compiled.close()
+    assert [e.to_dict() for e in cached.entries] == [e.to_dict() for e in source.entries]
+    assert (cached.groups, cached.settings, cached.skipped) == (source.groups, source.settings, 1)
+
+
+def test_compiled_cache_invalidation(config_path):
+    load_config(config_path)
+    cache = cache_path_for(config_path)
+    st = os.stat(config_path)
+    with open(config_path, "rb") as f:
+        data = f.read()
+    with open(config_path, "wb") as f:
+        f.write(data.replace(b"Visor", b"Vizor"))  # Mismo tamaño, otra fecha: decide el sha1
+    os.utime(config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    compiled = CompiledConfig(cache)
+    try:
+        assert not compiled.is_fresh_for(config_path)
+    finally:
+        compiled.close()
+    assert _names(load_config(config_path)) == ["Editor", "Vizor", "Ñandú"]
+
+    with open(cache, "r+b") as f:
+        f.seek(-3, os.SEEK_END)
+        f.write(b"!")
+    with pytest.raises(ValueError):
+        CompiledConfig(cache)
+    assert _names(load_config(config_path)) == ["Editor", "Vizor", "Ñandú"]  # Se vuelve al JSON
+    assert write_compiled(config_path, read_config(config_path))
+    CompiledConfig(cache).close()
@@ -0,0 +1,69 @@
+"""Pruebas de diff_entries/apply_diff con configuraciones leídas y escritas en disco."""
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_watcher import apply_diff, diff_entries
+from entries import read_config
+
+
+def _button(i, tag=""):
+    return {"name": f"Programa {i}{tag}", "program_path": f"C:/Programas/p{i}.exe", "icon_path": ""}
+
+
+def _write(path, buttons):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(buttons, f)
+    return read_config(path).entries
+
+
+def _rows(store):
+    return [e.to_dict() for e in store]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_apply_diff_reproduces_the_new_file(tmp_path, seed):
+    rng = random.Random(seed)
+    old_buttons = [_button(i) for i in range(rng.randint(0, 40))]
+    new_buttons = list(old_buttons)
+    for _ in range(rng.randint(1, 8)):
+        action = rng.choice(("add", "remove", "edit", "move"))
+        if action == "add" or not new_buttons:
+            new_buttons.insert(rng.randint(0, len(new_buttons)), _button(100 + rng.randint(0, 999), "+"))
+        elif action == "remove":
+            new_buttons.pop(rng.randrange(len(new_buttons)))
+        elif action == "edit":
+            i = rng.randrange(len(new_buttons))
+            new_buttons[i] = dict(new_buttons[i], icon_path=f"C:/Iconos/{seed}.ico")
+        else:
+            new_buttons.insert(rng.randint(0, len(new_buttons) - 1), new_buttons.pop(rng.randrange(len(new_buttons))))
+    store = _write(str(tmp_path / "antes.json"), old_buttons)
+    new_entries = _write(str(tmp_path / "despues.json"), new_buttons)
+
+    apply_diff(store, diff_entries(store, new_entries))
+    assert _rows(store) == new_buttons
+
+
+def test_single_edit_is_one_update_that_keeps_the_uid(tmp_path):
+    buttons = [_button(i) for i in range(500)]
+    store = _write(str(tmp_path / "antes.json"), buttons)
+    uid = store[250].uid
+    buttons[250] = dict(buttons[250], name="Renombrado")
+    ops = diff_entries(store, _write(str(tmp_path / "despues.json"), buttons))
+    assert [(op, index) for op, index, _ in ops] == [("update", 250)]
+
+    added, removed, updated = apply_diff(store, ops)
+    assert (added, removed) == ([], [])
+    assert updated == [store[250]] and store[250].uid == uid
+    assert store.find_by_name("Renombrado") == [store[250]]
+
+
+def test_identical_files_need_no_ops(tmp_path):
+    buttons = [_button(i) for i in range(50)]
+    old = _write(str(tmp_path / "a.json"), buttons)
+    assert diff_entries(old, _write(str(tmp_path / "b.json"), buttons)) == []
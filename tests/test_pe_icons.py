@@ -0,0 +1,184 @@
+"""Pruebas del lector de iconos de ejecutables con PE32 y PE32+ generados al vuelo."""
+import io
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from icon_cache import ThumbnailCache, load_thumbnail
+from pe_icons import RT_GROUP_ICON, RT_ICON, PEIconError, extract_icon, is_pe_icon_spec, split_icon_spec
+
+
+SECTION_RVA = 0x1000
+SECTION_RAW = 0x400
+# Dos grupos: (id del recurso de grupo, color, tamaños). Los colores distinguen qué grupo se extrajo.
+GROUPS = ((101, (200, 30, 30, 255), (16, 32, 48)), (205, (30, 30, 200, 255), (32,)))
+
+
+def _png(size, color):
+    out = io.BytesIO()
+    Image.new("RGBA", (size, size), color).save(out, "PNG")
+    return out.getvalue()
+
+
+def _resource_section(resources):
+    """Árbol de recursos tipo -> id -> idioma (0x409) -> datos, con los datos al final."""
+    types = sorted(resources)
+    dirs, leaves = [], []  # (posición, bytes) y (posición de la entrada de datos, bytes)
+    position = 16 + 8 * len(types)
+    root_entries, type_dirs = [], []
+    for rtype in types:
+        ids = sorted(resources[rtype])
+        root_entries.append((rtype, position))
+        type_dirs.append((position, ids, rtype))
+        position += 16 + 8 * len(ids)
+    lang_dirs = []
+    for offset, ids, rtype in type_dirs:
+        entries = []
+        for ident in ids:
+            entries.append((ident, position))
+            lang_dirs.append((position, resources[rtype][ident]))
+            position += 16 + 8
+        dirs.append((offset, struct.pack("<IIHHHH", 0, 0, 0, 0, 0, len(entries))
+                     + b"".join(struct.pack("<II", i, o | 0x80000000) for i, o in entries)))
+    dirs.insert(0, (0, struct.pack("<IIHHHH", 0, 0, 0, 0, 0, len(root_entries))
+                    + b"".join(struct.pack("<II", t, o | 0x80000000) for t, o in root_entries)))
+    data_entries = position
+    position += 16 * len(lang_dirs)
+    for i, (offset, data) in enumerate(lang_dirs):
+        dirs.append((offset, struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1) + struct.pack("<II", 0x409, data_entries + i * 16)))
+        leaves.append((data_entries + i * 16, position, data))
+        position += (len(data) + 3) & ~3
+    blob = bytearray(position)
+    for offset, raw in dirs:
+        blob[offset:offset + len(raw)] = raw
+    for entry, start, data in leaves:
+        blob[entry:entry + 16] = struct.pack("<IIII", SECTION_RVA + start, len(data), 0, 0)
+        blob[start:start + len(data)] = data
+    return bytes(blob)
+
+
+def build_pe(resources, pe32_plus=False):
+    """PE mínimo (una sección .rsrc) con los recursos {tipo: {id: bytes}}."""
+    section = _resource_section(resources)
+    pe_offset = 0x40
+    optional_size = (112 if pe32_plus else 96) + 16 * 8
+    optional = bytearray(optional_size)
+    struct.pack_into("<H", optional, 0, 0x20B if pe32_plus else 0x10B)
+    struct.pack_into("<I", optional, optional_size - 16 * 8 - 4, 16)  # NumberOfRvaAndSizes
+    struct.pack_into("<II", optional, optional_size - 16 * 8 + 2 * 8, SECTION_RVA, len(section))
+    coff = struct.pack("<HHIIIHH", 0x8664 if pe32_plus else 0x14C, 1, 0, 0, 0, optional_size, 0x0102)
+    table = struct.pack("<8sIIIIIIHHI", b".rsrc", len(section), SECTION_RVA, len(section), SECTION_RAW,
+                        0, 0, 0, 0, 0x40000040)
+    head = bytearray(SECTION_RAW)
+    head[:2] = b"MZ"
+    struct.pack_into("<I", head, 0x3C, pe_offset)
+    header = b"PE\0\0" + coff + bytes(optional) + table
+    head[pe_offset:pe_offset + len(header)] = header
+    return bytes(head) + section
+
+
+def icon_resources():
+    resources = {RT_ICON: {}, RT_GROUP_ICON: {}}
+    next_id = 1
+    for group_id, color, sizes in GROUPS:
+        group = struct.pack("<HHH", 0, 1, len(sizes))
+        for size in sizes:
+            data = _png(size, color)
+            resources[RT_ICON][next_id] = data
+            group += struct.pack("<BBBBHHIH", size, size, 0, 0, 1, 32, len(data), next_id)
+            next_id += 1
+        resources[RT_GROUP_ICON][group_id] = group
+    return resources
+
+
+@pytest.fixture(params=[False, True], ids=["pe32", "pe32+"])
+def pe_file(request, tmp_path):
+    path = tmp_path / "programa.exe"
+    path.write_bytes(build_pe(icon_resources(), pe32_plus=request.param))
+    return str(path)
+
+
+def _open_ico(data):
+    img = Image.open(io.BytesIO(data))
+    assert img.format == "ICO"
+    return img
+
+
+def test_index_selects_group_by_position(pe_file):
+    first = _open_ico(extract_icon(pe_file, 0))
+    assert set(first.info["sizes"]) == {(16, 16), (32, 32), (48, 48)}
+    assert first.convert("RGBA").getpixel((0, 0)) == GROUPS[0][1]
+    second = _open_ico(extract_icon(pe_file, 1))
+    assert second.info["sizes"] == {(32, 32)}
+    assert second.convert("RGBA").getpixel((0, 0)) == GROUPS[1][1]
+
+
+def test_negative_index_is_resource_id(pe_file):
+    img = _open_ico(extract_icon(pe_file, -205))
+    assert img.convert("RGBA").getpixel((0, 0)) == GROUPS[1][1]
+    assert _open_ico(extract_icon(pe_file, -101)).convert("RGBA").getpixel((0, 0)) == GROUPS[0][1]
+
+
+@pytest.mark.parametrize("index", [2, 50, -1, -999])
+def test_missing_index_raises(pe_file, index):
+    with pytest.raises(PEIconError):
+        extract_icon(pe_file, index)
+
+
+def test_pe_without_icons_raises(tmp_path):
+    path = tmp_path / "sin_iconos.dll"
+    path.write_bytes(build_pe({16: {1: b"version"}}))
+    with pytest.raises(PEIconError):
+        extract_icon(str(path), 0)
+
+
+@pytest.mark.parametrize("content", [b"", b"garbage" * 100, b"MZ" + bytes(0x3E), b"MZ" + bytes(200)],
+                         ids=["vacio", "basura", "solo-mz", "sin-firma-pe"])
+def test_garbage_raises(tmp_path, content):
+    path = tmp_path / "roto.exe"
+    path.write_bytes(content)
+    with pytest.raises(PEIconError):
+        extract_icon(str(path), 0)
+
+
+@pytest.mark.parametrize("cut", [1, 0x3E, 0x50, 0x100, SECTION_RAW, SECTION_RAW + 20, SECTION_RAW + 60])
+def test_truncated_raises(tmp_path, cut):
+    path = tmp_path / "truncado.exe"
+    path.write_bytes(build_pe(icon_resources())[:cut])
+    with pytest.raises(PEIconError):
+        extract_icon(str(path), 0)
+
+
+def test_split_icon_spec(tmp_path):
+    assert split_icon_spec("C:/Programas/app.exe,-3") == ("C:/Programas/app.exe", -3)
+    assert split_icon_spec("/opt/a,b/icono.png") == ("/opt/a,b/icono.png", None)
+    assert is_pe_icon_spec("/opt/app.dll") and not is_pe_icon_spec("/opt/icono.png")
+    binary = tmp_path / "app.bin"
+    binary.write_bytes(build_pe(icon_resources()))
+    assert is_pe_icon_spec(f"{binary},2")  # Sin extensión de PE decide la cabecera MZ
+    assert not is_pe_icon_spec("/opt/no-existe.bin,2")
+
+
+def test_indexed_image_is_decoded_as_image(tmp_path):
+    icon = tmp_path / "app.ico"
+    Image.new("RGBA", (48, 48), GROUPS[1][1]).save(icon, sizes=[(48, 48)])
+    assert not is_pe_icon_spec(f"{icon},0")
+    img = load_thumbnail(f"{icon},0", (32, 32), ThumbnailCache(str(tmp_path / "miniaturas")))
+    assert img.size == (32, 32) and img.getpixel((16, 16)) == GROUPS[1][1]
+
+
+@pytest.mark.parametrize("size", [32, 24])
+def test_load_thumbnail_round_trip(pe_file, tmp_path, size):
+    cache = ThumbnailCache(str(tmp_path / "miniaturas"))
+    for spec, color in ((f"{pe_file},0", GROUPS[0][1]), (f"{pe_file},-205", GROUPS[1][1])):
+        img = load_thumbnail(spec, (size, size), cache)
+        assert img.mode == "RGBA" and img.size == (size, size)
+        assert img.getpixel((size // 2, size // 2)) == color
+        cached = load_thumbnail(spec, (size, size), cache)  # Ahora desde la caché de miniaturas
+        assert cached.tobytes() == img.tobytes()
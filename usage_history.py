@@ -0,0 +1,116 @@
+import json
+import math
+import os
+import threading
+import time
+
+from config_journal import atomic_write_json
+from entries import path_key
+from metrics import metrics
+
+
+def default_history_path():
+    base = os.environ.get("APPDATA") or os.environ.get("XDG_DATA_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "program_launcher", "usage.json")
+
+
+class UsageHistory:
+    """Frecuencia de uso de cada programa, con decaimiento exponencial en el tiempo.
+
+    Por programa se guardan solo (puntuación, instante de la última actualización): cada
+    lanzamiento suma 1 a la puntuación decaída, que se reduce a la mitad cada `half_life_days`.
+    Se guarda en su propio archivo (compartido por todas las configuraciones), así que registrar
+    un lanzamiento nunca reescribe la configuración. Solo se conservan los `max_programs` más usados.
+    """
+
+    def __init__(self, path=None, half_life_days=7.0, max_programs=500):
+        self.path = path or default_history_path()
+        self.half_life_s = half_life_days * 86400
+        self.max_programs = max_programs
+        self._scores = {}  # clave de ruta -> [puntuación, instante, ruta]
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for path, (score, stamp) in data.get("programs", {}).items():
+                self._scores[path_key(path)] = [float(score), float(stamp), path]
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass  # Sin historial o ilegible: se empieza de cero
+
+    def _decayed(self, record, now):
+        return record[0] * math.exp2(-(now - record[1]) / self.half_life_s)
+
+    def record(self, program_path, now=None):
+        now = time.time() if now is None else now
+        key = path_key(program_path)
+        record = self._scores.get(key)
+        score = self._decayed(record, now) if record else 0.0
+        self._scores[key] = [score + 1.0, now, program_path]
+        self.dirty = True
+
+    def score(self, program_path, now=None):
+        record = self._scores.get(path_key(program_path))
+        return self._decayed(record, time.time() if now is None else now) if record else 0.0
+
+    def ranked(self, entries, now=None):
+        """Las entradas ordenadas de más a menos usadas; a igualdad, en su orden original."""
+        now = time.time() if now is None else now
+        scores = {key: self._decayed(record, now) for key, record in self._scores.items()}
+        return sorted(entries, key=lambda e: -scores.get(path_key(e.program_path), 0.0))
+
+    def top(self, count, now=None):
+        """Rutas de los `count` programas más usados."""
+        now = time.time() if now is None else now
+        best = sorted(self._scores.values(), key=lambda r: -self._decayed(r, now))[:count]
+        return [record[2] for record in best]
+
+    def save(self):
+        """Escribe el historial de forma atómica si ha cambiado. Las OSError se propagan."""
+        if not self.dirty:
+            return
+        now = time.time()
+        kept = sorted(self._scores.values(), key=lambda r: -self._decayed(r, now))[:self.max_programs]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        atomic_write_json(self.path, {"version": 1, "half_life_days": self.half_life_s / 86400,
+                                      "programs": {r[2]: [round(r[0], 4), r[1]] for r in kept}})
+        self.dirty = False
+
+
+def prewarm_file(path, max_bytes=256 * 1024 * 1024):
+    """Pide al sistema que cargue el archivo en la caché de páginas. Devuelve True si lo intentó.
+
+    Con posix_fadvise(WILLNEED) el núcleo lee por adelantado sin bloquear; donde no existe
+    (Windows, macOS) se lee el archivo por bloques y se descartan los datos.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return False
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            remaining = max_bytes
+            while remaining > 0:
+                chunk = os.read(fd, min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    metrics.inc("prewarmed_files")
+    return True
+
+
+def prewarm_in_background(paths):
+    """Calienta los archivos en un hilo de baja prioridad (daemon) para no bloquear la interfaz."""
+    def run():
+        for path in paths:
+            if os.path.isfile(path):
+                prewarm_file(path)
+    thread = threading.Thread(target=run, name="prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,118 @@
+import tkinter as tk
+
+
+class VirtualGrid(tk.Frame):
+    """Cuadrícula sobre un Canvas que solo dibuja las filas visibles.
+
+    Mantiene un conjunto de celdas (rectángulo + imagen + texto) del tamaño del área visible
+    y las recicla al desplazarse, de modo que la memoria y el coste de redibujado no dependen
+    del número de elementos. Los clics se resuelven calculando la celda bajo el puntero.
+    `describe(item)` devuelve (imagen o None, texto, no disponible) y `on_activate(item)` se llama
+    al pulsar; las celdas de elementos no disponibles se rellenan con `unavailable_fill`.
+    La imagen puede ser un PhotoImage o una región de atlas (con `blit(photo)` y `size`); en ese
+    caso cada celda copia la región en su propio PhotoImage, así que el número de imágenes Tk
+    depende del área visible y no del número de elementos.
+    """
+
+    def __init__(self, master, describe, on_activate, columns=10, cell_size=44, max_visible_rows=12,
+                 unavailable_fill="#f4c7c3"):
+        super().__init__(master)
+        self.describe = describe
+        self.on_activate = on_activate
+        self.columns = columns
+        self.cell_size = cell_size
+        self.max_visible_rows = max_visible_rows
+        self.unavailable_fill = unavailable_fill
+        self.items = []
+        self._cells = []  # [rect_id, image_id, text_id, índice mostrado, firma, PhotoImage propio]
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, yscrollincrement=cell_size)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    def set_items(self, items):
+        self.items = items
+        rows = (len(items) + self.columns - 1) // self.columns
+        width = self.columns * self.cell_size
+        self.canvas.configure(scrollregion=(0, 0, width, rows * self.cell_size),
+                              width=width, height=max(1, min(rows, self.max_visible_rows)) * self.cell_size)
+        for cell in self._cells:
+            cell[4] = None  # Fuerza a redibujar todas las celdas visibles
+        self.redraw()
+
+    def refresh_item(self, item):
+        for cell in self._cells:
+            if cell[3] is not None and cell[3] < len(self.items) and self.items[cell[3]] is item:
+                cell[4] = None
+                self._draw_cell(cell, cell[3])
+
+    def redraw(self):
+        visible_rows = self.canvas.winfo_height() // self.cell_size + 2
+        needed = visible_rows * self.columns
+        while len(self._cells) < needed:
+            self._cells.append(self._create_cell())
+        first_row = int(self.canvas.canvasy(0) // self.cell_size)
+        first_index = first_row * self.columns
+        for offset, cell in enumerate(self._cells):
+            index = first_index + offset
+            if offset < needed and index < len(self.items):
+                self._draw_cell(cell, index)
+            elif cell[3] is not None:
+                for item_id in cell[:3]:
+                    self.canvas.itemconfigure(item_id, state=tk.HIDDEN)
+                cell[3] = cell[4] = None
+
+    def _create_cell(self):
+        rect = self.canvas.create_rectangle(0, 0, 0, 0, outline="#a0a0a0", fill="#f0f0f0",
+                                            activefill="#dcdcdc", state=tk.HIDDEN)
+        image = self.canvas.create_image(0, 0, state=tk.HIDDEN)
+        text = self.canvas.create_text(0, 0, font=("Arial", 10, "bold"), state=tk.HIDDEN)
+        return [rect, image, text, None, None, None]
+
+    def _draw_cell(self, cell, index):
+        rect, image, text, shown_index, shown_signature, cell_photo = cell
+        tk_icon, label, unavailable = self.describe(self.items[index])
+        signature = (tk_icon, label, unavailable)
+        if shown_index == index and shown_signature == signature:
+            return
+        row, col = divmod(index, self.columns)
+        x0, y0 = col * self.cell_size, row * self.cell_size
+        cx, cy = x0 + self.cell_size // 2, y0 + self.cell_size // 2
+        self.canvas.coords(rect, x0 + 2, y0 + 2, x0 + self.cell_size - 2, y0 + self.cell_size - 2)
+        self.canvas.itemconfigure(rect, state=tk.NORMAL, fill=self.unavailable_fill if unavailable else "#f0f0f0")
+        if tk_icon is not None and hasattr(tk_icon, "blit"):
+            if cell_photo is None:
+                cell_photo = cell[5] = tk.PhotoImage(width=tk_icon.size, height=tk_icon.size)
+            tk_icon.blit(cell_photo)
+            tk_icon = cell_photo
+        if tk_icon:
+            self.canvas.coords(image, cx, cy)
+            self.canvas.itemconfigure(image, image=tk_icon, state=tk.DISABLED)
+            self.canvas.itemconfigure(text, state=tk.HIDDEN)
+        else:
+            self.canvas.coords(text, cx, cy)
+            self.canvas.itemconfigure(text, text=label, state=tk.DISABLED)
+            self.canvas.itemconfigure(image, image="", state=tk.HIDDEN)
+        cell[3], cell[4] = index, signature
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.redraw()
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+    def _on_click(self, event):
+        col = int(self.canvas.canvasx(event.x) // self.cell_size)
+        row = int(self.canvas.canvasy(event.y) // self.cell_size)
+        index = row * self.columns + col
+        if 0 <= col < self.columns and 0 <= index < len(self.items):
+            self.on_activate(self.items[index])
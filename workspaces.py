@@ -0,0 +1,98 @@
+import os
+import time
+
+from entries import path_key
+
+
+class Profile:
+    """Una configuración abierta (una pestaña).
+
+    Mientras el perfil está en segundo plano guarda aquí el estado de la interfaz: sus entradas
+    (con los iconos ya decodificados, hasta que se expulsan), el índice de búsqueda, los grupos y
+    los ajustes. `entries` es None hasta que el perfil se muestra por primera vez.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = None
+        self.search_index = None
+        self.groups = []
+        self.settings = {}
+        self.unsaved = False
+        self.signature = None  # (mtime_ns, tamaño) del archivo al pasar a segundo plano
+        self.last_active = 0.0
+
+    @property
+    def loaded(self):
+        return self.entries is not None
+
+    @property
+    def title(self):
+        return os.path.basename(self.path) if self.path else "Nueva Configuración"
+
+    def icon_handles(self):
+        """Iconos distintos que retiene el perfil (un mismo PhotoImage compartido cuenta una vez)."""
+        if self.entries is None:
+            return {}
+        return {id(e.tk_icon_ref): e.tk_icon_ref for e in self.entries if e.tk_icon_ref is not None}
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Workspace:
+    """Perfiles abiertos, en el orden de las pestañas, con expulsión LRU de iconos.
+
+    Los perfiles en segundo plano conservan sus entradas; sus iconos decodificados se mantienen
+    mientras el total (estimado a `bytes_per_icon` cada uno) quepa en `icon_budget_bytes`,
+    empezando por los usados más recientemente.
+    """
+
+    def __init__(self, icon_budget_bytes=32 * 1024 * 1024):
+        self.icon_budget_bytes = icon_budget_bytes
+        self.profiles = []
+        self.active = None
+
+    def add(self, profile):
+        self.profiles.append(profile)
+        return profile
+
+    def remove(self, profile):
+        self.profiles.remove(profile)
+        if self.active is profile:
+            self.active = None
+
+    def find(self, path):
+        key = path_key(os.path.abspath(path))
+        for profile in self.profiles:
+            if profile.path and path_key(os.path.abspath(profile.path)) == key:
+                return profile
+        return None
+
+    def activate(self, profile):
+        self.active = profile
+        profile.last_active = time.monotonic()
+
+    def most_recent(self, exclude=None):
+        candidates = [p for p in self.profiles if p is not exclude]
+        return max(candidates, key=lambda p: p.last_active) if candidates else None
+
+    def to_evict(self, bytes_per_icon):
+        """Perfiles en segundo plano cuyos iconos no caben en el presupuesto (los menos recientes)."""
+        background = sorted((p for p in self.profiles if p is not self.active and p.loaded),
+                            key=lambda p: p.last_active, reverse=True)
+        used, evict = 0, []
+        for profile in background:
+            cost = len(profile.icon_handles()) * bytes_per_icon
+            if not cost:
+                continue
+            if evict or used + cost > self.icon_budget_bytes:
+                evict.append(profile)
+            else:
+                used += cost
+        return evict